@@ -0,0 +1,194 @@
+"""Startup benchmark: time-to-first-import and time-to-window.
+
+Each measurement runs in a fresh interpreter so module caches do not hide
+regressions. Results are printed (and optionally written) as JSON:
+
+    python benchmarks/bench_startup.py --runs 5 --output startup.json
+    python benchmarks/bench_startup.py --budget core_import=150 --budget time_to_window=1500
+
+A budget that is exceeded by the median makes the script exit with status 1,
+and loading yt-dlp during startup is always reported as a regression. So is
+a probe that crashes: its stderr is kept in the report. Only a probe that
+needs an optional dependency missing here (the GUI toolkit, a display) is
+reported as skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+PYTHONPATH = os.pathsep.join([str(ROOT / "shared"), str(ROOT / "desktop-multiplatform" / "src")])
+
+# Each probe prints a dict with elapsed milliseconds and whether yt-dlp got imported
+PROBES = {
+    "core_import": """
+import sys, time
+t = time.perf_counter()
+import ytdlp_core
+from ytdlp_core.application.use_cases import DownloadVideoUseCase, GetVideoInfoUseCase
+from ytdlp_core.infrastructure.yt_dlp_impl import YtDlpDownloader, YtDlpVideoInfoExtractor
+ms = (time.perf_counter() - t) * 1000
+print({"ms": ms, "yt_dlp_loaded": "yt_dlp" in sys.modules})
+""",
+    "desktop_import": """
+import sys, time
+t = time.perf_counter()
+import ytdlp_desktop.data.services
+ms = (time.perf_counter() - t) * 1000
+print({"ms": ms, "yt_dlp_loaded": "yt_dlp" in sys.modules})
+""",
+    "time_to_window": """
+import sys, time
+t = time.perf_counter()
+from ytdlp_desktop.__main__ import create_app
+app = create_app()
+app.update()
+while not app.winfo_viewable():
+    app.update()
+ms = (time.perf_counter() - t) * 1000
+loaded = "yt_dlp" in sys.modules
+app.destroy()
+print({"ms": ms, "yt_dlp_loaded": loaded})
+""",
+    "yt_dlp_import": """
+import time
+t = time.perf_counter()
+import yt_dlp
+print({"ms": (time.perf_counter() - t) * 1000, "yt_dlp_loaded": True})
+""",
+}
+
+# yt_dlp_import is the reference cost that lazy loading avoids, not a regression
+EXPECTS_YT_DLP = {"yt_dlp_import"}
+
+# Missing these means the probe cannot run on this machine, not that startup broke
+OPTIONAL_MODULES = {"customtkinter", "tkinter", "_tkinter", "PIL"}
+_MISSING_MODULE = re.compile(r"ModuleNotFoundError: No module named '([\w.]+)'")
+_NO_DISPLAY = re.compile(r"TclError: (no display name|couldn't connect to display)")
+
+STDERR_TAIL = 4000
+
+
+class ProbeError(Exception):
+    """A probe exited with an error; `skipped` is set when an optional dependency is missing."""
+
+    def __init__(self, message: str, stderr: str = "", skipped: Optional[str] = None):
+        super().__init__(message)
+        self.stderr = stderr
+        self.skipped = skipped
+
+
+def _unavailable(stderr: str) -> Optional[str]:
+    """Why a failed probe could not run here, if that is the reason it failed."""
+    missing = _MISSING_MODULE.findall(stderr)
+    if missing and missing[-1].split(".")[0] in OPTIONAL_MODULES:
+        return f"optional dependency {missing[-1]!r} is not installed"
+    display = _NO_DISPLAY.search(stderr)
+    if display:
+        return f"no display ({display.group(1)})"
+    return None
+
+
+def run_probe(code: str) -> dict[str, Any]:
+    """Run one probe in a fresh interpreter; raises ProbeError if it fails."""
+    env = dict(os.environ, PYTHONPATH=PYTHONPATH + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, env=env, timeout=120
+        )
+    except subprocess.TimeoutExpired as e:
+        raise ProbeError(f"timed out after {e.timeout}s", stderr=str(e.stderr or ""))
+    if proc.returncode != 0:
+        raise ProbeError(f"exit status {proc.returncode}", proc.stderr, _unavailable(proc.stderr))
+    try:
+        # The last line is a Python dict literal printed by the probe
+        return ast.literal_eval(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError, SyntaxError) as e:
+        raise ProbeError(f"unreadable output {proc.stdout[-200:]!r}", proc.stderr) from e
+
+
+def run(runs: int) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for name, code in PROBES.items():
+        samples = []
+        loaded = False
+        try:
+            for _ in range(runs):
+                sample = run_probe(code)
+                samples.append(sample["ms"])
+                loaded = loaded or sample["yt_dlp_loaded"]
+        except ProbeError as e:
+            if e.skipped:
+                results[name] = {"skipped": True, "reason": e.skipped}
+            else:
+                results[name] = {
+                    "failed": True,
+                    "error": str(e),
+                    "runs": len(samples),
+                    "stderr": e.stderr[-STDERR_TAIL:],
+                }
+            continue
+        results[name] = {
+            "median_ms": round(statistics.median(samples), 2),
+            "min_ms": round(min(samples), 2),
+            "max_ms": round(max(samples), 2),
+            "runs": len(samples),
+            "yt_dlp_loaded": loaded,
+        }
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument(
+        "--budget",
+        action="append",
+        default=[],
+        metavar="NAME=MS",
+        help="fail if the median of NAME exceeds MS milliseconds",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.runs)
+    report = {
+        "benchmark": "startup",
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "results": results,
+    }
+
+    failures = []
+    for name, result in results.items():
+        if result.get("failed"):
+            failures.append(f"{name}: probe failed ({result['error']})")
+        if result.get("yt_dlp_loaded") and name not in EXPECTS_YT_DLP:
+            failures.append(f"{name}: yt-dlp imported during startup")
+    for budget in args.budget:
+        name, _, limit = budget.partition("=")
+        result = results.get(name, {})
+        if "median_ms" in result and result["median_ms"] > float(limit):
+            failures.append(f"{name}: {result['median_ms']}ms > {limit}ms budget")
+    report["failures"] = failures
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
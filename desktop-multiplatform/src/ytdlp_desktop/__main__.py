@@ -2,16 +2,15 @@
 
 from __future__ import annotations
 
-import sys
 import threading
-from pathlib import Path
 
 import customtkinter as ctk
 
 from ytdlp_desktop.ui.main_window import MainWindow
 from ytdlp_desktop.config.config_store import DesktopConfigStore
 from ytdlp_desktop.platform.desktop_platform import DesktopPlatformService
-from ytdlp_desktop.di.container import Container
+from ytdlp_desktop.di.container import app_container
+from ytdlp_desktop.utils.logger import setup_logging
 
 
 def setup_directories():
@@ -21,27 +20,45 @@ def setup_directories():
     return data_dir
 
 
-def main():
-    """Application entry point."""
-    # Setup
+def start_engine_warmup() -> None:
+    """Warm up yt-dlp on a background thread if enabled in config."""
+    config = app_container.config_manager
+    if not config.get("prewarm_engine", False):
+        return
+    use_case = app_container.services.warm_up_engine_use_case
+    probe_url = config.get("prewarm_probe_url") or None
+    threading.Thread(
+        target=use_case.execute, args=(probe_url,), name="engine-warmup", daemon=True
+    ).start()
+
+
+def create_app() -> MainWindow:
+    """Wire services and build the main window (without entering the loop)."""
     data_dir = setup_directories()
     config_path = data_dir / "config.json"
+    # The full activity history lives here; the window only keeps the tail
+    setup_logging(data_dir / "app.log")
 
-    # Initialize DI container
-    container = Container()
-    container.config_store.override(DesktopConfigStore(config_path))
-    container.platform_service.override(DesktopPlatformService())
-    container.wire(modules=["ytdlp_desktop.ui.main_window"])
+    # Initialize services
+    services = app_container.services
+    services.override(config=DesktopConfigStore(config_path), platform=DesktopPlatformService())
 
     # CustomTkinter setup
     ctk.set_appearance_mode("dark")
     ctk.set_default_color_theme("blue")
 
-    # Create and run app
-    app = MainWindow(container)
+    app = MainWindow(app_container.config_manager, services)
     app.protocol("WM_DELETE_WINDOW", app.on_closing)
+    return app
+
+
+def main():
+    """Application entry point."""
+    app = create_app()
+    # Start after the first frame so warm-up never delays the window
+    app.after_idle(start_engine_warmup)
     app.mainloop()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
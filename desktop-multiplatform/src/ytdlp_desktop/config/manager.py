@@ -33,6 +33,15 @@ class ConfigManager:
         "subtitle_langs": [],
         "embed_subtitles": False,
         "embed_thumbnail": False,
+        "prewarm_engine": False,
+        "prewarm_probe_url": "",
+        "log_max_lines": 1000,
+        "log_level": "INFO",
+        "max_concurrent_downloads": 2,
+        "prefetch_metadata": True,
+        "thumbnail_cache_mb": 64,
+        "proxies": [],
+        "proxy_strategy": "least_loaded",
     }
 
     def __init__(self, store: IConfigStore):
@@ -69,9 +78,19 @@ class ConfigManager:
             "subtitle_langs": config.subtitle_langs,
             "embed_subtitles": config.embed_subtitles,
             "embed_thumbnail": config.embed_thumbnail,
+            "prewarm_engine": config.prewarm_engine,
+            "prewarm_probe_url": config.prewarm_probe_url,
+            "log_max_lines": config.log_max_lines,
+            "log_level": config.log_level,
+            "max_concurrent_downloads": config.max_concurrent_downloads,
+            "prefetch_metadata": config.prefetch_metadata,
+            "thumbnail_cache_mb": config.thumbnail_cache_mb,
+            "proxies": config.proxies,
+            "proxy_strategy": config.proxy_strategy,
         }
-        for key, value in data.items():
-            self._store.set(key, value)
+        with self._store.batch():
+            for key, value in data.items():
+                self._store.set(key, value)
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get single config value."""
@@ -83,6 +102,7 @@ class ConfigManager:
 
     def reset_to_defaults(self) -> AppConfig:
         """Reset all config to defaults."""
-        for key, value in self.DEFAULTS.items():
-            self._store.set(key, value)
+        with self._store.batch():
+            for key, value in self.DEFAULTS.items():
+                self._store.set(key, value)
         return AppConfig(**self.DEFAULTS)
\ No newline at end of file
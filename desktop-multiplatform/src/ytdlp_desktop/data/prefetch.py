@@ -0,0 +1,81 @@
+"""Background video info fetching ahead of the "Get Info" click."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from ytdlp_core.application.use_cases import GetVideoInfoUseCase
+from ytdlp_core.core.models import VideoInfo
+from ytdlp_core.infrastructure.thumbnails import ThumbnailService, thumbnail_candidates
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataPrefetcher:
+    """Fetch video info off the UI thread, at most one fetch per URL.
+
+    Results land in the use case's cache, so a later `request` for the same
+    URL returns at once. Requesting a new URL cancels fetches that have not
+    started yet; one already inside yt-dlp cannot be interrupted, so it runs
+    to completion (still filling the cache) and callers drop the result by
+    checking `is_current`. With a ThumbnailService, the video's thumbnail is
+    fetched into its cache as soon as the info arrives.
+    """
+
+    def __init__(
+        self,
+        use_case: GetVideoInfoUseCase,
+        workers: int = 2,
+        thumbnails: Optional[ThumbnailService] = None,
+    ):
+        self.use_case = use_case
+        self.thumbnails = thumbnails
+        # Two workers: a slow superseded extraction does not delay the next URL
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prefetch")
+        self._inflight: Dict[str, Future] = {}
+        self._latest: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def request(self, url: str) -> Future:
+        """Future for `url`'s VideoInfo, joining an in-flight fetch if there is one."""
+        with self._lock:
+            self._latest = url
+            future = self._inflight.get(url)
+            if future is not None:
+                return future
+            superseded = list(self._inflight.values())
+            future = self._executor.submit(self._fetch, url)
+            self._inflight[url] = future
+        # Outside the lock: cancel() runs the done callbacks, and _forget takes it
+        for other in superseded:
+            other.cancel()
+        future.add_done_callback(lambda f: self._forget(url, f))
+        return future
+
+    def is_current(self, url: str) -> bool:
+        """Whether `url` is still the most recently requested one."""
+        return self._latest == url
+
+    def close(self) -> None:
+        with self._lock:
+            futures = list(self._inflight.values())
+        for future in futures:
+            future.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _fetch(self, url: str) -> VideoInfo:
+        logger.debug("Prefetching info for %s", url)
+        info = self.use_case.execute(url)
+        if self.thumbnails is not None:
+            self.thumbnails.submit(thumbnail_candidates(info.thumbnails, info.thumbnail))
+        return info
+
+    def _forget(self, url: str, future: Future) -> None:
+        # Done futures leave the table: a failed fetch is retried on the next
+        # request, a successful one is answered from the cache
+        with self._lock:
+            if self._inflight.get(url) is future:
+                del self._inflight[url]
@@ -2,20 +2,17 @@
 
 from __future__ import annotations
 
-import json
 import logging
-import os
 import sys
-from pathlib import Path
-from typing import Any
-
-import customtkinter as ctk
 
+from ytdlp_core.application.job_queue import JobQueue
+from ytdlp_core.application.profiles import DownloadProfileProvider
 from ytdlp_core.application.use_cases import (
     DownloadVideoUseCase,
     GetDefaultOptionsUseCase,
     GetVideoInfoUseCase,
     SaveDefaultOptionsUseCase,
+    WarmUpEngineUseCase,
 )
 from ytdlp_core.core.models import DownloadOptions, DownloadProgress, DownloadResult, MediaType, VideoInfo
 from ytdlp_core.domain.ports import (
@@ -27,9 +24,15 @@ from ytdlp_core.domain.ports import (
     IVideoInfoExtractor,
 )
 from ytdlp_core.domain.exceptions import CancellationError, DownloadError, ExtractionError
+from ytdlp_core.infrastructure.metrics import MetricsRegistry
 from ytdlp_core.infrastructure.platform import DesktopPlatformService, FFmpegLocator, JsonConfigStore, MemoryCacheStore
+from ytdlp_core.infrastructure.proxy_pool import ProxyPool
+from ytdlp_core.infrastructure.session_pool import YoutubeDLSessionPool
+from ytdlp_core.infrastructure.thumbnails import ThumbnailDiskCache, ThumbnailService
 from ytdlp_core.infrastructure.yt_dlp_impl import YtDlpDownloader, YtDlpVideoInfoExtractor
 
+from ytdlp_desktop.data.prefetch import MetadataPrefetcher
+
 
 class DesktopServiceContainer:
     """Dependency injection container for desktop app."""
@@ -41,11 +44,31 @@ class DesktopServiceContainer:
         self._downloader: IDownloader | None = None
         self._ffmpeg: IFFmpegLocator | None = None
         self._platform: IPlatformService | None = None
+        self._session_pool: YoutubeDLSessionPool | None = None
+        self._metrics: MetricsRegistry | None = None
+        self._profiles: DownloadProfileProvider | None = None
+        self._job_queue: JobQueue | None = None
+        self._prefetcher: MetadataPrefetcher | None = None
+        self._thumbnails: ThumbnailService | None = None
+        self._proxy_pool: ProxyPool | None = None
+        self._proxy_pool_loaded = False
 
         self._get_video_info_use_case: GetVideoInfoUseCase | None = None
         self._download_video_use_case: DownloadVideoUseCase | None = None
         self._get_default_options_use_case: GetDefaultOptionsUseCase | None = None
         self._save_default_options_use_case: SaveDefaultOptionsUseCase | None = None
+        self._warm_up_engine_use_case: WarmUpEngineUseCase | None = None
+
+    def override(
+        self,
+        config: IConfigStore | None = None,
+        platform: IPlatformService | None = None,
+    ) -> None:
+        """Replace base services before anything depending on them is built."""
+        if config is not None:
+            self._config = config
+        if platform is not None:
+            self._platform = platform
 
     @property
     def config(self) -> IConfigStore:
@@ -60,21 +83,77 @@ class DesktopServiceContainer:
             self._cache = MemoryCacheStore()
         return self._cache
 
+    @property
+    def session_pool(self) -> YoutubeDLSessionPool:
+        if self._session_pool is None:
+            self._session_pool = YoutubeDLSessionPool()
+        return self._session_pool
+
+    @property
+    def metrics(self) -> MetricsRegistry:
+        if self._metrics is None:
+            self._metrics = MetricsRegistry()
+        return self._metrics
+
+    @property
+    def profiles(self) -> DownloadProfileProvider:
+        if self._profiles is None:
+            self._profiles = DownloadProfileProvider(self.config)
+        return self._profiles
+
     @property
     def extractor(self) -> IVideoInfoExtractor:
         if self._extractor is None:
             self._extractor = YtDlpVideoInfoExtractor(
                 timeout=self.config.get("timeout", 30),
                 proxy=self.config.get("proxy") or None,
+                session_pool=self.session_pool,
+                proxy_pool=self.proxy_pool,
             )
         return self._extractor
 
     @property
     def downloader(self) -> IDownloader:
         if self._downloader is None:
-            self._downloader = YtDlpDownloader()
+            self._downloader = YtDlpDownloader(
+                session_pool=self.session_pool,
+                metrics=self.metrics,
+                thumbnails=self.thumbnails,
+                proxy_pool=self.proxy_pool,
+            )
         return self._downloader
 
+    @property
+    def proxy_pool(self) -> ProxyPool | None:
+        """Proxies from the ``proxies`` setting, health-checked in the background; None if unset."""
+        if not self._proxy_pool_loaded:
+            self._proxy_pool = ProxyPool.from_config(
+                self.config.get("proxies"),
+                self.config.get("proxy_strategy"),
+                timeout=self.config.get("timeout", 30),
+                metrics=self.metrics,
+            )
+            if self._proxy_pool is not None:
+                self._proxy_pool.start()
+            self._proxy_pool_loaded = True
+        return self._proxy_pool
+
+    @property
+    def thumbnails(self) -> ThumbnailService:
+        """Thumbnail images for previews and embedding, cached in the data dir."""
+        if self._thumbnails is None:
+            cache = ThumbnailDiskCache(
+                self.platform.get_data_dir() / "thumbnails",
+                max_bytes=int(self.config.get("thumbnail_cache_mb", 64)) * 1024 * 1024,
+            )
+            self._thumbnails = ThumbnailService(
+                cache,
+                timeout=self.config.get("timeout", 30),
+                proxy=self.config.get("proxy") or None,
+                metrics=self.metrics,
+            )
+        return self._thumbnails
+
     @property
     def ffmpeg(self) -> IFFmpegLocator:
         if self._ffmpeg is None:
@@ -93,6 +172,7 @@ class DesktopServiceContainer:
             self._get_video_info_use_case = GetVideoInfoUseCase(
                 extractor=self.extractor,
                 cache=self.cache,
+                metrics=self.metrics,
             )
         return self._get_video_info_use_case
 
@@ -104,9 +184,68 @@ class DesktopServiceContainer:
                 ffmpeg_locator=self.ffmpeg,
                 config=self.config,
                 platform=self.platform,
+                profiles=self.profiles,
+                metrics=self.metrics,
+                cache=self.cache,
             )
         return self._download_video_use_case
 
+    def new_download_use_case(self) -> DownloadVideoUseCase:
+        """A use case with its own downloader (one per queue worker), sharing everything else."""
+        return DownloadVideoUseCase(
+            downloader=YtDlpDownloader(
+                session_pool=self.session_pool,
+                metrics=self.metrics,
+                thumbnails=self.thumbnails,
+                proxy_pool=self.proxy_pool,
+            ),
+            ffmpeg_locator=self.ffmpeg,
+            config=self.config,
+            platform=self.platform,
+            profiles=self.profiles,
+            metrics=self.metrics,
+            cache=self.cache,
+        )
+
+    @property
+    def job_queue(self) -> JobQueue:
+        """Download queue, started on first use."""
+        if self._job_queue is None:
+            self._job_queue = JobQueue(
+                self.new_download_use_case,
+                info=self.get_video_info_use_case,
+                workers=int(self.config.get("max_concurrent_downloads", 2)),
+                merge_audio=self.ffmpeg.find_ffmpeg() is not None,
+                progress_interval=0.1,
+            )
+            self._job_queue.start()
+        return self._job_queue
+
+    @property
+    def prefetcher(self) -> MetadataPrefetcher:
+        """Background video info fetches, sharing the info use case's cache."""
+        if self._prefetcher is None:
+            self._prefetcher = MetadataPrefetcher(self.get_video_info_use_case, thumbnails=self.thumbnails)
+        return self._prefetcher
+
+    def close(self) -> None:
+        """Cancel running downloads and release pooled sessions."""
+        if self._prefetcher is not None:
+            self._prefetcher.close()
+            self._prefetcher = None
+        if self._thumbnails is not None:
+            self._thumbnails.close()
+            self._thumbnails = None
+        if self._job_queue is not None:
+            self._job_queue.close()
+            self._job_queue = None
+        if self._proxy_pool is not None:
+            self._proxy_pool.close()
+            self._proxy_pool = None
+            self._proxy_pool_loaded = False
+        if self._session_pool is not None:
+            self._session_pool.close()
+
     @property
     def get_default_options_use_case(self) -> GetDefaultOptionsUseCase:
         if self._get_default_options_use_case is None:
@@ -123,6 +262,12 @@ class DesktopServiceContainer:
             )
         return self._save_default_options_use_case
 
+    @property
+    def warm_up_engine_use_case(self) -> WarmUpEngineUseCase:
+        if self._warm_up_engine_use_case is None:
+            self._warm_up_engine_use_case = WarmUpEngineUseCase(extractor=self.extractor)
+        return self._warm_up_engine_use_case
+
 
 # Global container instance
 container = DesktopServiceContainer()
@@ -51,6 +51,27 @@ class AppConfig:
     embed_subtitles: bool = False
     embed_thumbnail: bool = False
 
+    # Startup
+    prewarm_engine: bool = False
+    prewarm_probe_url: str = ""
+
+    # Activity log (the file log keeps everything)
+    log_max_lines: int = 1000
+    log_level: str = "INFO"
+
+    # Download queue
+    max_concurrent_downloads: int = 2
+
+    # Fetch video info in the background while the URL is being entered
+    prefetch_metadata: bool = True
+
+    # Disk cache of thumbnail images, in megabytes
+    thumbnail_cache_mb: int = 64
+
+    # Proxy pool (supersedes `proxy` when non-empty): URLs or {"url", "weight"}
+    proxies: list[Any] = field(default_factory=list)
+    proxy_strategy: str = "least_loaded"
+
     def to_dict(self) -> dict[str, Any]:
         return {
             "window_width": self.window_width,
@@ -72,6 +93,15 @@ class AppConfig:
             "subtitle_langs": self.subtitle_langs,
             "embed_subtitles": self.embed_subtitles,
             "embed_thumbnail": self.embed_thumbnail,
+            "prewarm_engine": self.prewarm_engine,
+            "prewarm_probe_url": self.prewarm_probe_url,
+            "log_max_lines": self.log_max_lines,
+            "log_level": self.log_level,
+            "max_concurrent_downloads": self.max_concurrent_downloads,
+            "prefetch_metadata": self.prefetch_metadata,
+            "thumbnail_cache_mb": self.thumbnail_cache_mb,
+            "proxies": self.proxies,
+            "proxy_strategy": self.proxy_strategy,
         }
 
     @classmethod
@@ -96,4 +126,13 @@ class AppConfig:
             subtitle_langs=data.get("subtitle_langs", []),
             embed_subtitles=data.get("embed_subtitles", False),
             embed_thumbnail=data.get("embed_thumbnail", False),
+            prewarm_engine=data.get("prewarm_engine", False),
+            prewarm_probe_url=data.get("prewarm_probe_url", ""),
+            log_max_lines=data.get("log_max_lines", 1000),
+            log_level=data.get("log_level", "INFO"),
+            max_concurrent_downloads=data.get("max_concurrent_downloads", 2),
+            prefetch_metadata=data.get("prefetch_metadata", True),
+            thumbnail_cache_mb=data.get("thumbnail_cache_mb", 64),
+            proxies=data.get("proxies", []),
+            proxy_strategy=data.get("proxy_strategy", "least_loaded"),
         )
\ No newline at end of file
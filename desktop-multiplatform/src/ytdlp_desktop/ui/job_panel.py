@@ -0,0 +1,129 @@
+"""Download queue panel: one row per job."""
+
+from __future__ import annotations
+
+import time
+import tkinter as tk
+from typing import Any, Callable, Dict, Iterable
+
+import customtkinter as ctk
+
+_FINAL = ("completed", "failed", "cancelled")
+_MB = 1024 * 1024
+
+
+def describe(job: Dict[str, Any]) -> str:
+    """One-line status for a job snapshot."""
+    status = job["status"]
+    if status == "pending":
+        if job.get("retry_at"):
+            wait = max(0, int(job["retry_at"] - time.time()))
+            return f"Retrying in {wait}s (attempt {job['attempts'] + 1}) · {job['error']}"
+        return "Queued"
+    if status == "completed":
+        return f"Completed · {job['downloaded_bytes'] / _MB:.1f} MB"
+    if status == "failed":
+        return f"Failed: {job['error'] or 'unknown error'}"
+    if status == "cancelled":
+        return "Cancelled"
+    parts = [f"{job['percent']:.0f}%"]
+    total = job["total_bytes"]
+    done = job["downloaded_bytes"] / _MB
+    parts.append(f"{done:.1f} / {total / _MB:.1f} MB" if total else f"{done:.1f} MB")
+    if job["speed"]:
+        parts.append(f"{job['speed'] / _MB:.2f} MB/s")
+    if job["eta"]:
+        parts.append(f"ETA {job['eta']}s")
+    return " · ".join(parts)
+
+
+class _JobRow:
+    def __init__(self, parent: ctk.CTkScrollableFrame, job_id: str, title: str, on_cancel: Callable[[str], None]):
+        self.frame = ctk.CTkFrame(parent)
+        self.title_label = ctk.CTkLabel(self.frame, text=title, anchor="w", font=ctk.CTkFont(weight="bold"))
+        self.cancel_btn = ctk.CTkButton(
+            self.frame, text="✕", width=30, height=24, command=lambda: on_cancel(job_id)
+        )
+        self.progress_bar = ctk.CTkProgressBar(self.frame, height=12)
+        self.progress_bar.set(0)
+        self.detail_label = ctk.CTkLabel(self.frame, text="Queued", anchor="w")
+
+        self.frame.pack(fill=tk.X, padx=5, pady=3)
+        self.frame.grid_columnconfigure(0, weight=1)
+        self.title_label.grid(row=0, column=0, sticky="ew", padx=(10, 5), pady=(5, 0))
+        self.cancel_btn.grid(row=0, column=1, padx=(0, 10), pady=(5, 0))
+        self.progress_bar.grid(row=1, column=0, columnspan=2, sticky="ew", padx=10, pady=(3, 0))
+        self.detail_label.grid(row=2, column=0, columnspan=2, sticky="ew", padx=10, pady=(0, 5))
+        self._shown: tuple = ()
+
+    def show(self, job: Dict[str, Any]) -> bool:
+        """Redraw for `job`; False if nothing visible changed (no Tk calls made)."""
+        status = job["status"]
+        percent = 100.0 if status == "completed" else job["percent"]
+        text = describe(job)
+        if self._shown == (percent, text):
+            return False
+        self._shown = (percent, text)
+        self.progress_bar.set(percent / 100)
+        self.detail_label.configure(text=text)
+        if status in _FINAL:
+            self.cancel_btn.configure(state="disabled")
+        return True
+
+    def destroy(self) -> None:
+        self.frame.destroy()
+
+
+class JobQueuePanel(ctk.CTkScrollableFrame):
+    """Rows for queued, running and finished downloads.
+
+    Rows are only touched from `apply`, which the window calls from its
+    refresh loop with the snapshots that changed since the last frame, and
+    from `refresh_countdowns`: a job waiting for a retry sends no snapshots
+    while it waits, so the loop re-renders its countdown itself.
+    """
+
+    def __init__(self, master: Any, on_cancel: Callable[[str], None], **kwargs: Any):
+        super().__init__(master, **kwargs)
+        self.on_cancel = on_cancel
+        self._rows: Dict[str, _JobRow] = {}
+        self._titles: Dict[str, str] = {}
+        self._status: Dict[str, str] = {}
+        self._waiting: Dict[str, Dict[str, Any]] = {}  # last snapshot of jobs waiting for a retry
+
+    def add(self, job_id: str, title: str) -> None:
+        """Register a display title before the job's first snapshot arrives."""
+        self._titles[job_id] = title
+
+    def apply(self, jobs: Iterable[Dict[str, Any]]) -> None:
+        for job in jobs:
+            row = self._rows.get(job["id"])
+            if row is None:
+                title = self._titles.get(job["id"], job["url"])
+                row = self._rows[job["id"]] = _JobRow(self, job["id"], title, self.on_cancel)
+            row.show(job)
+            self._status[job["id"]] = job["status"]
+            if job["status"] == "pending" and job.get("retry_at"):
+                self._waiting[job["id"]] = job
+            else:
+                self._waiting.pop(job["id"], None)
+
+    def refresh_countdowns(self, budget: int) -> int:
+        """Redraw up to `budget` retry countdowns that changed; returns how many were redrawn."""
+        redrawn = 0
+        for job_id, job in self._waiting.items():
+            if redrawn >= budget:
+                break
+            if self._rows[job_id].show(job):
+                redrawn += 1
+        return redrawn
+
+    def clear_finished(self) -> list[str]:
+        """Remove rows of finished jobs; returns their ids."""
+        finished = [job_id for job_id, status in self._status.items() if status in _FINAL]
+        for job_id in finished:
+            self._rows.pop(job_id).destroy()
+            self._titles.pop(job_id, None)
+            self._waiting.pop(job_id, None)
+            del self._status[job_id]
+        return finished
@@ -0,0 +1,48 @@
+"""Thread-safe store of the latest download job states."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Optional
+
+
+class JobSnapshotStore:
+    """Latest ``job.to_dict()`` per job, written by queue threads and drained by the UI loop.
+
+    `update` is a JobQueue listener: it only swaps the job's snapshot and
+    marks it dirty, so worker threads never touch Tk and a burst of events
+    for one job collapses into a single row update. `drain(limit)` hands out
+    at most `limit` dirty snapshots per frame, oldest change first; the rest
+    wait for the next frame, which keeps the per-frame cost flat however
+    many jobs are active.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._dirty: Dict[str, None] = {}  # insertion-ordered set
+        self._lock = threading.Lock()
+
+    def update(self, event: str, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._jobs[job["id"]] = job
+            self._dirty[job["id"]] = None
+
+    def drain(self, limit: Optional[int] = None) -> list[Dict[str, Any]]:
+        with self._lock:
+            ids = list(self._dirty)[:limit]
+            for job_id in ids:
+                del self._dirty[job_id]
+            return [self._jobs[job_id] for job_id in ids]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def forget(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+            self._dirty.pop(job_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
@@ -0,0 +1,82 @@
+"""Bounded activity log model for the main window."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+# Level names offered by the log filter, lowest first
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+
+def parse_level(name: str, default: int = logging.INFO) -> int:
+    """Numeric level for a name like "WARNING"; `default` for unknown names."""
+    level = logging.getLevelName(str(name).upper())
+    return level if isinstance(level, int) else default
+
+
+class LogEntry(NamedTuple):
+    created: float
+    level: int
+    text: str
+
+    def render(self) -> str:
+        return f"[{time.strftime('%H:%M:%S', time.localtime(self.created))}] {self.text}\n"
+
+
+class LogBuffer:
+    """Ring buffer of the latest `max_lines` entries plus a queue of unrendered ones.
+
+    Any thread may `append`; the UI thread calls `drain` on a timer and
+    renders the batch in one insert. Entries older than `max_lines` are
+    dropped here - the file log keeps the full history.
+    """
+
+    def __init__(self, max_lines: int = 1000, level: int = logging.INFO):
+        self.max_lines = max(1, max_lines)
+        self.level = level
+        self._entries: deque[LogEntry] = deque(maxlen=self.max_lines)
+        self._pending: deque[LogEntry] = deque(maxlen=self.max_lines)
+        self._lock = threading.Lock()
+
+    def append(self, text: str, level: int = logging.INFO, created: float | None = None) -> None:
+        entry = LogEntry(created if created is not None else time.time(), level, text)
+        with self._lock:
+            self._entries.append(entry)
+            self._pending.append(entry)
+
+    def drain(self) -> list[LogEntry]:
+        """Entries added since the last drain that pass the level filter."""
+        with self._lock:
+            pending = list(self._pending)
+            self._pending.clear()
+        return [e for e in pending if e.level >= self.level]
+
+    def visible(self) -> list[LogEntry]:
+        """Every buffered entry that passes the level filter; for a full re-render."""
+        with self._lock:
+            self._pending.clear()
+            entries = list(self._entries)
+        return [e for e in entries if e.level >= self.level]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+
+
+class LogBufferHandler(logging.Handler):
+    """Feed log records into a LogBuffer (message only; the UI adds the timestamp)."""
+
+    def __init__(self, buffer: LogBuffer, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.buffer = buffer
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.buffer.append(record.getMessage(), record.levelno, record.created)
+        except Exception:
+            self.handleError(record)
@@ -3,19 +3,35 @@
 from __future__ import annotations
 
 import logging
-import threading
 import tkinter as tk
+from concurrent.futures import Future
 from pathlib import Path
 from tkinter import filedialog, messagebox
-from typing import Optional
+from typing import Callable, Optional
 
 import customtkinter as ctk
 
 from ytdlp_desktop.config.manager import ConfigManager
 from ytdlp_desktop.data.services import DesktopServiceContainer
-from ytdlp_core.core.models import DownloadProgress, DownloadStatus, MediaType
-from ytdlp_core.application.use_cases import GetVideoInfoUseCase, DownloadVideoUseCase
+from ytdlp_desktop.ui.job_panel import JobQueuePanel
+from ytdlp_desktop.ui.job_store import JobSnapshotStore
+from ytdlp_desktop.ui.log_model import LOG_LEVELS, LogBuffer, LogBufferHandler, parse_level
+from ytdlp_desktop.ui.thumbnail_loader import ThumbnailLoader
+from ytdlp_core.core.models import MediaType
+from ytdlp_core.application.job_queue import DownloadJob
 from ytdlp_core.domain.exceptions import ExtractionError, ValidationError
+from ytdlp_core.infrastructure.thumbnails import thumbnail_candidates
+
+logger = logging.getLogger(__name__)
+
+# Milliseconds between two frames of the refresh loop (10 fps)
+FRAME_MS = 100
+
+# Job rows redrawn per frame at most; further changes wait a frame
+MAX_ROW_UPDATES = 20
+
+# Quiet time after the last edit of the URL field before info is prefetched
+PREFETCH_DEBOUNCE_MS = 400
 
 
 class MainWindow(ctk.CTk):
@@ -32,8 +48,35 @@ class MainWindow(ctk.CTk):
         # State
         self._video_info = None
         self._selected_format_id: Optional[str] = None
-        self._download_thread: Optional[threading.Thread] = None
-        self._is_downloading = False
+
+        # Queue workers write job states here; the refresh loop drains them
+        self._job_store = JobSnapshotStore()
+        self._unsubscribe_jobs: Optional[Callable[[], None]] = None
+        self._reported_jobs: set[str] = set()
+
+        # Video info: prefetched while the URL is typed or pasted; the refresh
+        # loop shows the result of the fetch the user asked for
+        self._prefetch_enabled = bool(self.config_manager.get("prefetch_metadata", True))
+        self._prefetch_id: Optional[str] = None
+        self._info_url: Optional[str] = None
+        self._info_future: Optional[Future] = None
+
+        # Thumbnail preview, decoded off the UI thread
+        self._thumbnails = ThumbnailLoader(self.container.thumbnails)
+        self._thumbnail_future: Optional[Future] = None
+        self._thumbnail_image = None  # keeps the shown CTkImage alive
+
+        # Activity log: bounded buffer fed by the logging system, rendered in batches
+        log_level = self.config_manager.get("log_level", "INFO")
+        self._log_buffer = LogBuffer(
+            max_lines=int(self.config_manager.get("log_max_lines", 1000)),
+            level=parse_level(log_level),
+        )
+        self._log_handler = LogBufferHandler(self._log_buffer)
+        root = logging.getLogger()
+        root.addHandler(self._log_handler)
+        self._root_log_level = root.level
+        self._apply_log_level(self._log_buffer.level)
 
         # UI Components
         self._create_widgets()
@@ -45,6 +88,9 @@ class MainWindow(ctk.CTk):
         if last_dir and Path(last_dir).exists():
             self.output_dir_var.set(last_dir)
 
+        self.log_level_menu.set(log_level)
+        self._tick_id = self.after(FRAME_MS, self._tick)
+
     def _create_widgets(self):
         """Create all UI widgets."""
         # Main container
@@ -60,6 +106,7 @@ class MainWindow(ctk.CTk):
 
         # Video Info Section
         self.info_frame = ctk.CTkFrame(self.main_frame)
+        self.thumbnail_label = ctk.CTkLabel(self.info_frame, text="")
         self.info_label = ctk.CTkLabel(self.info_frame, text="", justify="left", anchor="w", font=ctk.CTkFont(size=12))
 
         # Options Section
@@ -104,26 +151,23 @@ class MainWindow(ctk.CTk):
             state="disabled",
         )
 
-        # Progress Section
-        self.progress_frame = ctk.CTkFrame(self.main_frame)
-        self.progress_label = ctk.CTkLabel(self.progress_frame, text="Progress:", font=ctk.CTkFont(weight="bold"))
-        self.progress_bar = ctk.CTkProgressBar(self.progress_frame, height=20)
-        self.progress_bar.set(0)
-
-        # Progress details
-        self.progress_details_frame = ctk.CTkFrame(self.progress_frame, fg_color="transparent")
-        self.speed_var = ctk.StringVar(value="Speed: --")
-        self.eta_var = ctk.StringVar(value="ETA: --:--")
-        self.downloaded_var = ctk.StringVar(value="Downloaded: 0 / 0 MB")
-        self.speed_label = ctk.CTkLabel(self.progress_details_frame, textvariable=self.speed_var)
-        self.eta_label = ctk.CTkLabel(self.progress_details_frame, textvariable=self.eta_var)
-        self.downloaded_label = ctk.CTkLabel(self.progress_details_frame, textvariable=self.downloaded_var)
+        # Download queue
+        self.jobs_frame = ctk.CTkFrame(self.main_frame)
+        self.jobs_header_frame = ctk.CTkFrame(self.jobs_frame, fg_color="transparent")
+        self.jobs_label = ctk.CTkLabel(self.jobs_header_frame, text="Downloads:", font=ctk.CTkFont(weight="bold"))
+        self.clear_jobs_btn = ctk.CTkButton(
+            self.jobs_header_frame, text="Clear finished", command=self._clear_finished_jobs, width=100, height=25
+        )
+        self.jobs_panel = JobQueuePanel(self.jobs_frame, on_cancel=self._cancel_job, height=180)
 
         # Log Section
         self.log_frame = ctk.CTkFrame(self.main_frame)
         self.log_header_frame = ctk.CTkFrame(self.log_frame, fg_color="transparent")
         self.log_label = ctk.CTkLabel(self.log_header_frame, text="Activity Log:", font=ctk.CTkFont(weight="bold"))
         self.clear_log_btn = ctk.CTkButton(self.log_header_frame, text="Clear", command=self._clear_log, width=60, height=25)
+        self.log_level_menu = ctk.CTkOptionMenu(
+            self.log_header_frame, values=list(LOG_LEVELS), command=self._on_log_level_change, width=100, height=25
+        )
         self.log_text = ctk.CTkTextbox(self.log_frame, height=150, font=("Consolas", 11))
 
     def _layout_widgets(self):
@@ -137,7 +181,8 @@ class MainWindow(ctk.CTk):
 
         # Video Info
         self.info_frame.pack(fill=tk.X, pady=(0, 10))
-        self.info_label.pack(fill=tk.X, padx=15, pady=10)
+        self.thumbnail_label.pack(side=tk.LEFT, padx=(15, 0), pady=10)
+        self.info_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=15, pady=10)
 
         # Options
         self.options_frame.pack(fill=tk.X, pady=(0, 10))
@@ -161,26 +206,26 @@ class MainWindow(ctk.CTk):
         # Download button
         self.download_btn.pack(fill=tk.X, padx=10, pady=(0, 10))
 
-        # Progress
-        self.progress_frame.pack(fill=tk.X, pady=(0, 10))
-        self.progress_label.pack(anchor=tk.W, padx=15, pady=(10, 0))
-        self.progress_bar.pack(fill=tk.X, padx=15, pady=(5, 5))
-
-        self.progress_details_frame.pack(fill=tk.X, padx=15, pady=(0, 10))
-        self.speed_label.pack(side=tk.LEFT, padx=(0, 20))
-        self.eta_label.pack(side=tk.LEFT, padx=(0, 20))
-        self.downloaded_label.pack(side=tk.LEFT)
+        # Download queue
+        self.jobs_frame.pack(fill=tk.X, pady=(0, 10))
+        self.jobs_header_frame.pack(fill=tk.X, padx=15, pady=(10, 0))
+        self.jobs_label.pack(side=tk.LEFT)
+        self.clear_jobs_btn.pack(side=tk.RIGHT)
+        self.jobs_panel.pack(fill=tk.X, padx=15, pady=(5, 10))
 
         # Log
         self.log_frame.pack(fill=tk.BOTH, expand=True)
         self.log_header_frame.pack(fill=tk.X, padx=15, pady=(10, 0))
         self.log_label.pack(side=tk.LEFT)
         self.clear_log_btn.pack(side=tk.RIGHT)
+        self.log_level_menu.pack(side=tk.RIGHT, padx=(0, 10))
         self.log_text.pack(fill=tk.BOTH, expand=True, padx=15, pady=(5, 10))
 
     def _bind_events(self):
         """Bind events."""
         self.url_entry.bind("<Return>", lambda e: self._on_get_info())
+        self.url_entry.bind("<KeyRelease>", self._on_url_edited, add="+")
+        self.url_entry.bind("<<Paste>>", self._on_url_edited, add="+")
 
     def _toggle_theme(self):
         """Toggle theme."""
@@ -203,23 +248,58 @@ class MainWindow(ctk.CTk):
             messagebox.showwarning("URL Required", "Please enter a YouTube URL.")
             return
 
+        self._cancel_prefetch_timer()
         self._log(f"Fetching info for: {url}")
         self.get_info_btn.configure(state="disabled", text="Loading...")
         self.info_label.configure(text="Fetching video info...")
 
-        def fetch():
-            try:
-                use_case: GetVideoInfoUseCase = self.container.get_video_info_use_case
-                info = use_case.execute(url)
-                self.after(0, lambda: self._on_info_loaded(info))
-            except ValidationError as e:
-                self.after(0, lambda: self._on_info_error(str(e)))
-            except ExtractionError as e:
-                self.after(0, lambda: self._on_info_error(f"Failed to extract info: {e}"))
-            except Exception as e:
-                self.after(0, lambda: self._on_info_error(f"Unexpected error: {e}"))
+        # Joins the prefetch for this URL if one is running, or hits the cache
+        self._info_url = url
+        self._info_future = self.container.prefetcher.request(url)
+        self._set_thumbnail(None)
+        self._poll_info()
+
+    def _on_url_edited(self, _event=None):
+        """Restart the prefetch countdown on every edit of the URL field."""
+        if not self._prefetch_enabled:
+            return
+        self._cancel_prefetch_timer()
+        self._prefetch_id = self.after(PREFETCH_DEBOUNCE_MS, self._prefetch)
+
+    def _cancel_prefetch_timer(self):
+        if self._prefetch_id is not None:
+            self.after_cancel(self._prefetch_id)
+            self._prefetch_id = None
 
-        threading.Thread(target=fetch, daemon=True).start()
+    def _prefetch(self):
+        """Warm the info cache for the URL in the field, if it looks valid."""
+        self._prefetch_id = None
+        url = self.url_entry.get().strip()
+        # Regex check only; half-typed URLs never reach yt-dlp
+        if url and url != self._info_url and self.container.extractor.validate_url(url):
+            self.container.prefetcher.request(url)
+
+    def _poll_info(self):
+        """Show the requested info once its fetch is done; called from the refresh loop."""
+        future = self._info_future
+        if future is None or not future.done():
+            return
+        self._info_future = None
+        if future.cancelled() or not self.container.prefetcher.is_current(self._info_url):
+            # The URL was edited meanwhile; the new one is being prefetched
+            self.get_info_btn.configure(state="normal", text="Get Info")
+            self.info_label.configure(text="")
+            return
+        try:
+            info = future.result()
+        except ValidationError as e:
+            self._on_info_error(str(e))
+        except ExtractionError as e:
+            self._on_info_error(f"Failed to extract info: {e}")
+        except Exception as e:
+            self._on_info_error(f"Unexpected error: {e}")
+        else:
+            self._on_info_loaded(info)
 
     def _on_info_loaded(self, info):
         """Handle loaded video info."""
@@ -237,26 +317,55 @@ class MainWindow(ctk.CTk):
 
         display_text = f"📹 {info.title}\n⏱️ {duration_str} | 👤 {info.uploader or 'Unknown'} | 👁️ {views_str} views"
         self.info_label.configure(text=display_text)
+        if self._thumbnails.available:
+            self._thumbnail_future = self._thumbnails.request(thumbnail_candidates(info.thumbnails, info.thumbnail))
+            self._poll_thumbnail()
 
         # Populate quality combo
         self._update_quality_options()
         self.download_btn.configure(state="normal")
         self._log(f"Loaded: {info.title} ({len(info.formats)} formats)")
 
+    def _poll_thumbnail(self):
+        """Show the preview once decoded; called from the refresh loop."""
+        future = self._thumbnail_future
+        if future is None or not future.done():
+            return
+        self._thumbnail_future = None
+        try:
+            image = future.result()
+        except Exception as e:
+            logger.debug("Thumbnail preview failed: %s", e)
+            image = None
+        self._set_thumbnail(image)
+
+    def _set_thumbnail(self, image):
+        """Show a decoded PIL image, or clear the preview with None."""
+        if image is None:
+            self._thumbnail_future = None
+            self._thumbnail_image = None
+            self.thumbnail_label.configure(image=None)
+            return
+        # CTkImage must be created on the UI thread
+        self._thumbnail_image = ctk.CTkImage(light_image=image, dark_image=image, size=image.size)
+        self.thumbnail_label.configure(image=self._thumbnail_image)
+
     def _on_info_error(self, error: str):
         """Handle info loading error."""
         self.get_info_btn.configure(state="normal", text="Get Info")
         self.info_label.configure(text="")
         messagebox.showerror("Error", error)
-        self._log(f"Error: {error}")
+        self._log(f"Error: {error}", logging.ERROR)
 
     def _update_quality_options(self):
         """Update quality combo based on media type."""
         if not self._video_info:
             return
 
+        index = self._video_info.format_index
         media_type = MediaType(self.media_type_var.get())
-        formats = self._video_info.video_formats if media_type == MediaType.VIDEO else self._video_info.audio_formats
+        entries = index.video_by_quality if media_type == MediaType.VIDEO else index.audio_by_quality
+        formats = [e.format for e in entries]
 
         if not formats:
             self.quality_combo.configure(values=["No formats available"])
@@ -277,16 +386,12 @@ class MainWindow(ctk.CTk):
         if not self._video_info:
             return
 
-        media_type = MediaType(self.media_type_var.get())
-        formats = self._video_info.video_formats if media_type == MediaType.VIDEO else self._video_info.audio_formats
-
-        for fmt in formats:
-            if fmt.display_name == value:
-                self._selected_format_id = fmt.format_id
-                break
+        fmt = self._video_info.format_index.find_by_label(value)
+        if fmt is not None:
+            self._selected_format_id = fmt.format_id
 
     def _on_download(self):
-        """Handle download button click."""
+        """Queue a download of the loaded video with the selected format."""
         if not self._video_info or not self._selected_format_id:
             return
 
@@ -294,73 +399,103 @@ class MainWindow(ctk.CTk):
         output_dir = Path(self.output_dir_var.get()) if self.output_dir_var.get() else None
         media_type = MediaType(self.media_type_var.get())
 
-        self._is_downloading = True
-        self.download_btn.configure(state="disabled", text="Downloading...")
-        self.progress_bar.set(0)
-        self._log(f"Starting download: {self._video_info.title}")
-
-        def download():
-            try:
-                use_case: DownloadVideoUseCase = self.container.download_video_use_case
-                result = use_case.execute(
-                    url=url,
-                    format_id=self._selected_format_id,
-                    media_type=media_type,
-                    output_dir=output_dir,
-                    progress_callback=self._on_progress,
-                )
-                self.after(0, lambda: self._on_download_complete(result))
-            except Exception as e:
-                self.after(0, lambda: self._on_download_error(str(e)))
-
-        self._download_thread = threading.Thread(target=download, daemon=True)
-        self._download_thread.start()
-
-    def _on_progress(self, progress: DownloadProgress):
-        """Handle download progress."""
-        def update():
-            if progress.status == DownloadStatus.DOWNLOADING:
-                if progress.total_bytes:
-                    self.progress_bar.set(progress.percent / 100)
-                self.speed_var.set(f"Speed: {progress.speed / (1024*1024):.2f} MB/s" if progress.speed else "Speed: --")
-                self.eta_var.set(f"ETA: {progress.eta}s" if progress.eta else "ETA: --:--")
-                self.downloaded_var.set(
-                    f"Downloaded: {progress.downloaded_bytes / (1024*1024):.1f} / "
-                    f"{progress.total_bytes / (1024*1024):.1f} MB" if progress.total_bytes else
-                    f"Downloaded: {progress.downloaded_bytes / (1024*1024):.1f} MB"
-                )
-            elif progress.status == DownloadStatus.COMPLETED:
-                self.progress_bar.set(1)
-                self.speed_var.set("Speed: Done")
-                self.eta_var.set("ETA: 0s")
-        self.after(0, update)
-
-    def _on_download_complete(self, result):
-        """Handle download completion."""
-        self._is_downloading = False
-        self.download_btn.configure(state="normal", text="🚀 Download")
-
-        if result.success:
-            self._log(f"✅ Download completed: {result.output_path}")
-            messagebox.showinfo("Success", f"Download completed!\nSaved to: {result.output_path}")
+        queue = self.container.job_queue
+        if self._unsubscribe_jobs is None:
+            self._unsubscribe_jobs = queue.subscribe(self._job_store.update)
+        job = DownloadJob(
+            url=url,
+            format_id=self._selected_format_id,
+            media_type=media_type,
+            output_dir=output_dir,
+        )
+        self.jobs_panel.add(job.id, self._video_info.title)
+        queue.submit(job)
+        self._log(f"Queued: {self._video_info.title}")
+
+    def _cancel_job(self, job_id: str):
+        # Only sets the downloader's cancel flag, so it never blocks the UI thread
+        self.container.job_queue.cancel(job_id)
+
+    def _clear_finished_jobs(self):
+        for job_id in self.jobs_panel.clear_finished():
+            self._job_store.forget(job_id)
+
+    def _tick(self):
+        """The window's only refresh loop: log batch, video info and thumbnail, then changed job rows."""
+        self._flush_log()
+        self._poll_info()
+        self._poll_thumbnail()
+        jobs = self._job_store.drain(MAX_ROW_UPDATES)
+        if jobs:
+            self.jobs_panel.apply(jobs)
+            for job in jobs:
+                self._log_job_result(job)
+        # Waiting retries send no snapshots; their countdowns use what is left of the budget
+        self.jobs_panel.refresh_countdowns(MAX_ROW_UPDATES - len(jobs))
+        self._tick_id = self.after(FRAME_MS, self._tick)
+
+    def _log_job_result(self, job: dict):
+        if job["status"] not in ("completed", "failed", "cancelled") or job["id"] in self._reported_jobs:
+            return
+        self._reported_jobs.add(job["id"])
+        if job["status"] == "completed":
+            self._log(f"✅ Download completed: {job['output_path']}")
+        elif job["status"] == "failed":
+            self._log(f"❌ Download failed: {job['error']}", logging.ERROR)
         else:
-            self._log(f"❌ Download failed: {result.error}")
-            messagebox.showerror("Error", f"Download failed: {result.error}")
-
-    def _on_download_error(self, error: str):
-        """Handle download error."""
-        self._is_downloading = False
-        self.download_btn.configure(state="normal", text="🚀 Download")
-        self._log(f"❌ Error: {error}")
-        messagebox.showerror("Error", f"Download error: {error}")
-
-    def _log(self, message: str):
-        """Add message to log."""
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert("end", f"[{timestamp}] {message}\n")
+            self._log(f"Download cancelled: {job['url']}")
+
+    def on_closing(self):
+        """Persist pending config changes and close the window."""
+        self.after_cancel(self._tick_id)
+        self._cancel_prefetch_timer()
+        root = logging.getLogger()
+        root.removeHandler(self._log_handler)
+        root.setLevel(self._root_log_level)
+        self.container.config.flush()
+        self.container.close()
+        self.destroy()
+
+    def _log(self, message: str, level: int = logging.INFO):
+        """Add message to log (file log and the on-screen buffer)."""
+        logger.log(level, message)
+
+    def _flush_log(self):
+        """Render buffered log entries in one insert, then drop lines past the limit."""
+        entries = self._log_buffer.drain()
+        if entries:
+            self.log_text.insert("end", "".join(e.render() for e in entries))
+            self._trim_log()
+            self.log_text.see("end")
+
+    def _trim_log(self):
+        # Count the widget's lines, not entries: a message (traceback) may span several
+        lines = int(self.log_text.index("end-1c").split(".")[0]) - 1  # text ends with a newline
+        excess = lines - self._log_buffer.max_lines
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+
+    def _apply_log_level(self, level: int):
+        """Filter the on-screen log at `level`, letting the root logger pass records that low.
+
+        The file and console handlers keep their own level, so DEBUG here does
+        not reach the log file.
+        """
+        self._log_buffer.level = level
+        # min() keeps a NOTSET (0) root, which already lets everything through
+        logging.getLogger().setLevel(min(level, self._root_log_level))
+
+    def _on_log_level_change(self, value: str):
+        """Apply the level filter and re-render what the buffer still holds."""
+        self._apply_log_level(parse_level(value))
+        self.config_manager.set("log_level", value)
+        entries = self._log_buffer.visible()
+        self.log_text.delete("1.0", "end")
+        self.log_text.insert("end", "".join(e.render() for e in entries))
+        self._trim_log()
         self.log_text.see("end")
 
     def _clear_log(self):
         """Clear log."""
+        self._log_buffer.clear()
         self.log_text.delete("1.0", "end")
\ No newline at end of file
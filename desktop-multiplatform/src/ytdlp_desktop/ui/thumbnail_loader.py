@@ -0,0 +1,70 @@
+"""Decoded, preview-sized thumbnails for the main window."""
+
+from __future__ import annotations
+
+import io
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Optional, Sequence
+
+from ytdlp_core.infrastructure.thumbnails import ThumbnailService
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it there is no preview
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+
+class ThumbnailLoader:
+    """Fetch, decode and shrink thumbnails on the service's pool.
+
+    Decoded images are kept for the `max_images` most recently shown URLs,
+    so going back to a video does not decode again. Futures resolve to a
+    PIL image (or None); turning it into a Tk image is left to the UI
+    thread.
+    """
+
+    def __init__(self, service: ThumbnailService, size: tuple[int, int] = (160, 90), max_images: int = 32):
+        self.service = service
+        self.size = size
+        self.max_images = max_images
+        self._images: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    def request(self, urls: Sequence[str]) -> Future:
+        """Future for a preview of the first loadable of `urls` (best first)."""
+        with self._lock:
+            for url in urls:
+                image = self._images.get(url)
+                if image is not None:
+                    self._images.move_to_end(url)
+                    future: Future = Future()
+                    future.set_result(image)
+                    return future
+        return self.service.submit(urls, self._decode)
+
+    def _decode(self, url: str, data: bytes) -> Optional[Any]:
+        if Image is None:
+            return None
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.draft("RGB", self.size)  # JPEG: decode at a reduced scale
+            image = image.convert("RGB")
+            image.thumbnail(self.size)
+        except Exception as e:
+            logger.debug("Could not decode thumbnail %s: %s", url, e)
+            return None
+        with self._lock:
+            self._images[url] = image
+            self._images.move_to_end(url)
+            while len(self._images) > self.max_images:
+                self._images.popitem(last=False)
+        return image
@@ -8,16 +8,24 @@ from pathlib import Path
 
 
 def setup_logging(log_file: Path, level: int = logging.INFO):
-    """Setup application logging."""
+    """Setup application logging.
+
+    `level` is set on the file and console handlers as well as the root
+    logger, so the root can be lowered (e.g. for the window's DEBUG view)
+    without flooding the log file.
+    """
     log_file.parent.mkdir(parents=True, exist_ok=True)
 
+    handlers = [
+        logging.FileHandler(log_file, encoding="utf-8"),
+        logging.StreamHandler(sys.stdout),
+    ]
+    for handler in handlers:
+        handler.setLevel(level)
     logging.basicConfig(
         level=level,
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(log_file, encoding="utf-8"),
-            logging.StreamHandler(sys.stdout),
-        ],
+        handlers=handlers,
     )
 
     # Reduce noise from libraries
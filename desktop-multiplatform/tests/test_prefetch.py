@@ -0,0 +1,106 @@
+"""MetadataPrefetcher: one fetch per URL, superseded fetches cancelled."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from ytdlp_desktop.data.prefetch import MetadataPrefetcher
+
+
+class FakeInfoUseCase:
+    """Stands in for GetVideoInfoUseCase; each URL blocks until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.gates = {}
+
+    def gate(self, url):
+        return self.gates.setdefault(url, threading.Event())
+
+    def execute(self, url):
+        self.calls.append(url)
+        if not self.gate(url).wait(timeout=5):
+            raise TimeoutError(url)
+        return f"info:{url}"
+
+
+@pytest.fixture
+def use_case():
+    return FakeInfoUseCase()
+
+
+@pytest.fixture
+def prefetcher(use_case):
+    prefetcher = MetadataPrefetcher(use_case, workers=1)
+    yield prefetcher
+    for gate in use_case.gates.values():
+        gate.set()
+    prefetcher.close()
+
+
+def _within(seconds, func):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()), daemon=True)
+    thread.start()
+    thread.join(timeout=seconds)
+    assert result, "blocked"
+    return result[0]
+
+
+def test_same_url_joins_the_inflight_fetch(prefetcher, use_case):
+    first = prefetcher.request("a")
+    assert prefetcher.request("a") is first
+
+    use_case.gate("a").set()
+
+    assert first.result(timeout=5) == "info:a"
+    assert use_case.calls == ["a"]
+
+
+def test_new_url_cancels_queued_fetches_without_deadlock(prefetcher, use_case):
+    running = prefetcher.request("a")  # occupies the only worker
+    queued = prefetcher.request("b")
+
+    latest = _within(2, lambda: prefetcher.request("c"))
+
+    assert queued.cancelled()
+    assert not running.cancelled()
+    assert prefetcher.is_current("c") and not prefetcher.is_current("a")
+    use_case.gate("a").set()
+    use_case.gate("c").set()
+    assert latest.result(timeout=5) == "info:c"
+    assert use_case.calls == ["a", "c"]
+
+
+def test_failed_fetch_is_retried(prefetcher, use_case):
+    use_case.gates["a"] = None  # execute() fails on it
+    failed = prefetcher.request("a")
+    with pytest.raises(AttributeError):
+        failed.result(timeout=5)
+    _within(2, lambda: _wait_forgotten(prefetcher, failed))
+
+    del use_case.gates["a"]
+    use_case.gate("a").set()
+
+    assert prefetcher.request("a").result(timeout=5) == "info:a"
+
+
+def _wait_forgotten(prefetcher, future):
+    # The done callback runs on the worker, just after result() unblocks
+    while future in prefetcher._inflight.values():
+        time.sleep(0.001)
+    return True
+
+
+def test_close_cancels_pending_fetches(use_case):
+    prefetcher = MetadataPrefetcher(use_case, workers=1)
+    prefetcher.request("a")
+    pending = prefetcher.request("b")
+
+    _within(2, prefetcher.close)
+
+    assert pending.cancelled()
+    use_case.gate("a").set()
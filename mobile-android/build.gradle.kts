@@ -109,7 +109,8 @@ chaquopy {
 
         pip {
             install("yt-dlp")
-            install("ffmpeg-python")
+            // ytdlp_core from this repo (brings ffmpeg-python along)
+            install("../shared")
         }
 
         buildDir = file("src/main/python")
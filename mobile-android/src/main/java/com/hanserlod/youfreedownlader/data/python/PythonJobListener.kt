@@ -0,0 +1,19 @@
+package com.hanserlod.youfreedownlader.data.python
+
+/**
+ * Callbacks for a job queued on `hanserlod.DownloadWorker`, invoked from a worker thread.
+ *
+ * Progress arrives through [onProgress]; [onFinished] is called exactly once
+ * with status "completed", "failed" or "cancelled". Empty strings stand in
+ * for a missing path or error.
+ */
+interface PythonJobListener : PythonProgressListener {
+    fun onFinished(
+        jobId: String,
+        status: String,
+        outputPath: String,
+        downloadedBytes: Long,
+        seconds: Double,
+        error: String
+    )
+}
@@ -0,0 +1,17 @@
+package com.hanserlod.youfreedownlader.data.python
+
+/**
+ * Progress callback invoked from `hanserlod.descargar_video` (and `DownloadWorker` jobs) on the download thread.
+ *
+ * Only primitives cross the Chaquopy boundary; unknown values are -1.
+ */
+interface PythonProgressListener {
+    fun onProgress(
+        status: String,
+        downloadedBytes: Long,
+        totalBytes: Long,
+        speed: Double,
+        eta: Int,
+        percent: Double
+    )
+}
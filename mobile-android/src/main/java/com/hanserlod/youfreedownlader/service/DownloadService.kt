@@ -0,0 +1,104 @@
+package com.hanserlod.youfreedownlader.service
+
+import android.app.NotificationChannel
+import android.app.NotificationManager
+import android.app.Service
+import android.content.Context
+import android.content.Intent
+import android.content.pm.ServiceInfo
+import android.os.Build
+import android.os.IBinder
+import androidx.core.app.NotificationCompat
+import androidx.core.app.ServiceCompat
+import androidx.core.content.ContextCompat
+import com.chaquo.python.PyObject
+import com.chaquo.python.Python
+import com.chaquo.python.android.AndroidPlatform
+import java.util.concurrent.atomic.AtomicBoolean
+import java.util.concurrent.atomic.AtomicReference
+import kotlin.concurrent.thread
+
+/**
+ * Foreground service that owns the Python `DownloadWorker` for its lifetime.
+ *
+ * The worker is created (and yt-dlp warmed up) once in [onCreate] on a
+ * background thread and closed in [onDestroy]; callers get it from [worker].
+ * Only the instance this service got is closed, so a worker already created
+ * for the next service is left alone.
+ */
+class DownloadService : Service() {
+
+    private val ownWorker = AtomicReference<PyObject?>(null)
+    private val destroyed = AtomicBoolean(false)
+
+    override fun onCreate() {
+        super.onCreate()
+        ServiceCompat.startForeground(
+            this,
+            NOTIFICATION_ID,
+            buildNotification(),
+            if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.Q) ServiceInfo.FOREGROUND_SERVICE_TYPE_DATA_SYNC else 0
+        )
+        thread(name = "python-worker-init") {
+            ownWorker.set(worker(this))
+            if (destroyed.get()) {
+                releaseWorker()  // destroyed while warming up
+            }
+        }
+    }
+
+    override fun onStartCommand(intent: Intent?, flags: Int, startId: Int): Int = START_NOT_STICKY
+
+    override fun onBind(intent: Intent?): IBinder? = null
+
+    override fun onDestroy() {
+        destroyed.set(true)
+        releaseWorker()
+        super.onDestroy()
+    }
+
+    /** Detach and close this service's worker, once; the close itself runs on a Python thread. */
+    private fun releaseWorker() {
+        ownWorker.getAndSet(null)?.let { worker ->
+            Python.getInstance().getModule("hanserlod").callAttr("detener_worker", worker)
+        }
+    }
+
+    private fun buildNotification() = run {
+        val manager = getSystemService(NotificationManager::class.java)
+        if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.O) {
+            manager.createNotificationChannel(
+                NotificationChannel(CHANNEL_ID, "Downloads", NotificationManager.IMPORTANCE_LOW)
+            )
+        }
+        NotificationCompat.Builder(this, CHANNEL_ID)
+            .setSmallIcon(android.R.drawable.stat_sys_download)
+            .setContentTitle("Downloading")
+            .setOngoing(true)
+            .build()
+    }
+
+    companion object {
+        private const val CHANNEL_ID = "downloads"
+        private const val NOTIFICATION_ID = 1
+
+        fun start(context: Context) {
+            ContextCompat.startForegroundService(context, Intent(context, DownloadService::class.java))
+        }
+
+        fun stop(context: Context) {
+            context.stopService(Intent(context, DownloadService::class.java))
+        }
+
+        /**
+         * The process-wide Python worker; created and warmed up on first use,
+         * so call it off the main thread.
+         */
+        fun worker(context: Context): PyObject {
+            if (!Python.isStarted()) {
+                Python.start(AndroidPlatform(context.applicationContext))
+            }
+            return Python.getInstance().getModule("hanserlod").callAttr("iniciar_worker")
+        }
+    }
+}
@@ -40,6 +40,7 @@ fun DownloadScreen(viewModel: DownloadViewModel = viewModel()) {
     val isLoading by viewModel.isLoading.collectAsStateWithLifecycle(false)
     val error by viewModel.error.collectAsStateWithLifecycle()
     val downloadPath by viewModel.downloadPath.collectAsStateWithLifecycle()
+    val downloadStats by viewModel.downloadStats.collectAsStateWithLifecycle()
 
     var urlText by remember { mutableStateOf(url) }
     var showFormatDropdown by remember { mutableStateOf(false) }
@@ -120,7 +121,7 @@ fun DownloadScreen(viewModel: DownloadViewModel = viewModel()) {
 
                 // Download Complete
                 downloadPath?.let { path ->
-                    DownloadCompleteCard(path = path)
+                    DownloadCompleteCard(path = path, stats = downloadStats)
                 }
             }
         }
@@ -489,7 +490,7 @@ fun DetailChip(icon: androidx.compose.ui.graphics.vector.ImageVector, label: Str
 
 // Download Complete Card
 @Composable
-fun DownloadCompleteCard(path: String) {
+fun DownloadCompleteCard(path: String, stats: String? = null) {
     Card(
         modifier = Modifier.fillMaxWidth(),
         colors = CardDefaults.cardColors(
@@ -506,6 +507,9 @@ fun DownloadCompleteCard(path: String) {
             Column {
                 Text("Download Complete!", style = MaterialTheme.typography.titleMedium, color = MaterialTheme.colorScheme.onTertiaryContainer)
                 Text(path, style = MaterialTheme.typography.bodySmall, color = MaterialTheme.colorScheme.onTertiaryContainer, maxLines = 1, overflow = TextOverflow.Ellipsis)
+                stats?.let {
+                    Text(it, style = MaterialTheme.typography.bodySmall, color = MaterialTheme.colorScheme.onTertiaryContainer)
+                }
             }
             IconButton(onClick = { /* open folder */ }) {
                 Icon(
@@ -3,15 +3,15 @@ package com.hanserlod.youfreedownlader.ui.viewmodel
 import android.app.Application
 import androidx.lifecycle.ViewModel
 import androidx.lifecycle.viewModelScope
+import com.hanserlod.youfreedownlader.data.python.PythonJobListener
 import com.hanserlod.youfreedownlader.domain.model.DownloadProgress
 import com.hanserlod.youfreedownlader.domain.model.DownloadStatus
 import com.hanserlod.youfreedownlader.domain.model.MediaType
 import com.hanserlod.youfreedownlader.domain.model.VideoFormat
 import com.hanserlod.youfreedownlader.domain.model.VideoInfo
+import com.hanserlod.youfreedownlader.service.DownloadService
 import kotlinx.coroutines.Dispatchers
-import kotlinx.coroutines.channels.Channel
 import kotlinx.coroutines.launch
-import kotlinx.coroutines.withContext
 
 class DownloadViewModel(application: Application) : ViewModel() {
 
@@ -47,7 +47,21 @@ class DownloadViewModel(application: Application) : ViewModel() {
     private val _downloadPath = androidx.lifecycle.MutableLiveData<String?>()
     val downloadPath: androidx.lifecycle.LiveData<String?> = _downloadPath
 
-    private var currentDownloadJob: kotlinx.coroutines.Job? = null
+    // "<size> in <time>" for the last finished download, when Python reports it
+    private val _downloadStats = androidx.lifecycle.MutableLiveData<String?>()
+    val downloadStats: androidx.lifecycle.LiveData<String?> = _downloadStats
+
+    private val appContext = application.applicationContext
+    private val activeJobs = java.util.concurrent.atomic.AtomicInteger(0)
+
+    /** One [startDownload]; its id is known only once `submit` returns, callbacks may come first. */
+    private class JobHandle {
+        @Volatile
+        var id: String? = null
+    }
+
+    // The job allowed to update the UI; callbacks from any other (replaced) job are dropped
+    private val currentJob = java.util.concurrent.atomic.AtomicReference<JobHandle?>(null)
 
     init {
         initializePython()
@@ -89,8 +103,8 @@ class DownloadViewModel(application: Application) : ViewModel() {
 
         viewModelScope.launch(Dispatchers.IO) {
             try {
-                val pyFormatos = hanserlodModule?.callAttr("obtener_formatos", url)?.asList()
-                val videoInfo = parseVideoInfo(url, pyFormatos)
+                val pyInfo = hanserlodModule?.callAttr("obtener_info", url)
+                val videoInfo = parseVideoInfo(url, pyInfo)
                 _videoInfo.postValue(videoInfo)
                 _isLoading.postValue(false)
             } catch (e: Exception) {
@@ -110,36 +124,36 @@ class DownloadViewModel(application: Application) : ViewModel() {
         return patterns.any { url.contains(it) }
     }
 
-    private fun parseVideoInfo(url: String, pyFormatos: com.chaquo.python.PyObject?): VideoInfo? {
-        val formatList = mutableListOf<VideoFormat>()
-        pyFormatos?.let { pyList ->
-            for (i in 0 until pyList.length()) {
-                val item = pyList[i].asList()
-                if (item.length() >= 2) {
-                    val formatId = item[0].toString()
-                    val desc = item[1].toString()
-                    // Parse description to extract format info
-                    val format = parseFormatDescription(formatId, desc)
-                    formatList.add(format)
-                }
-            }
-        }
+    private fun parseVideoInfo(url: String, pyInfo: com.chaquo.python.PyObject?): VideoInfo? {
+        // (id, title, duration, uploader, thumbnail, is_live, formats)
+        val fields = pyInfo?.asList() ?: return null
+        val formats = fields[6].asList().map { parseFormatRecord(it.asList()) }
 
         return VideoInfo(
-            id = extractVideoId(url) ?: "",
-            title = "Loading...",
-            formats = formatList
+            id = fields[0]?.toString() ?: extractVideoId(url) ?: "",
+            title = fields[1]?.toString() ?: "",
+            duration = fields[2]?.toInt(),
+            uploader = fields[3]?.toString(),
+            thumbnail = fields[4]?.toString(),
+            isLive = fields[5]?.toBoolean() ?: false,
+            formats = formats
         )
     }
 
-    private fun parseFormatDescription(formatId: String, description: String): VideoFormat {
-        // description format: "itag - 720p - mp4" or similar
-        val parts = description.split(" - ")
+    private fun parseFormatRecord(row: List<com.chaquo.python.PyObject?>): VideoFormat {
+        // hanserlod.FORMAT_FIELDS: format_id, ext, height, fps, vcodec, acodec,
+        // abr, filesize, filesize_approx, note
         return VideoFormat(
-            formatId = formatId,
-            ext = parts.lastOrNull()?.split(".")?.last() ?: "mp4",
-            resolution = parts.find { it.endsWith("p") }?.removeSuffix("p"),
-            formatNote = parts.find { it.contains("kbps") || it.contains("fps") }
+            formatId = row[0].toString(),
+            ext = row[1]?.toString() ?: "mp4",
+            resolution = row[2]?.toInt()?.toString(),
+            fps = row[3]?.toFloat(),
+            vcodec = row[4]?.toString(),
+            acodec = row[5]?.toString(),
+            abr = row[6]?.toInt(),
+            filesize = row[7]?.toLong(),
+            filesizeApprox = row[8]?.toLong(),
+            formatNote = row[9]?.toString()?.takeIf { it.isNotEmpty() }
         )
     }
 
@@ -188,56 +202,122 @@ class DownloadViewModel(application: Application) : ViewModel() {
         }
 
         _downloadProgress.value = DownloadProgress(status = DownloadStatus.DOWNLOADING)
+        _downloadStats.value = null
         _error.value = null
 
-        currentDownloadJob?.cancel()
-        currentDownloadJob = viewModelScope.launch(Dispatchers.IO) {
+        cancelCurrentJob()
+        val handle = JobHandle()
+        currentJob.set(handle)
+        // The service keeps the process (and the warm Python worker) alive while jobs run
+        DownloadService.start(appContext)
+        activeJobs.incrementAndGet()
+        viewModelScope.launch(Dispatchers.IO) {
             try {
-                val progressChannel = Channel<DownloadProgress>(10)
+                val listener = object : PythonJobListener {
+                    override fun onProgress(
+                        status: String,
+                        downloadedBytes: Long,
+                        totalBytes: Long,
+                        speed: Double,
+                        eta: Int,
+                        percent: Double
+                    ) {
+                        if (currentJob.get() !== handle) return
+                        _downloadProgress.postValue(
+                            DownloadProgress(
+                                status = DownloadStatus.DOWNLOADING,
+                                downloadedBytes = downloadedBytes,
+                                totalBytes = totalBytes.takeIf { it >= 0 },
+                                speed = speed.takeIf { it >= 0 },
+                                eta = eta.takeIf { it >= 0 },
+                                percent = percent
+                            )
+                        )
+                    }
 
-                // Start progress listener
-                val progressJob = viewModelScope.launch {
-                    for (progress in progressChannel) {
-                        _downloadProgress.postValue(progress)
+                    override fun onFinished(
+                        jobId: String,
+                        status: String,
+                        outputPath: String,
+                        downloadedBytes: Long,
+                        seconds: Double,
+                        error: String
+                    ) {
+                        if (!currentJob.compareAndSet(handle, null)) {
+                            jobFinished()  // replaced or cancelled: its outcome is not shown
+                            return
+                        }
+                        when (status) {
+                            "completed" -> {
+                                _downloadProgress.postValue(DownloadProgress(status = DownloadStatus.COMPLETED, percent = 100.0))
+                                _downloadPath.postValue(outputPath)
+                                val mb = downloadedBytes / (1024.0 * 1024.0)
+                                _downloadStats.postValue("%.1f MB in %.1f s".format(mb, seconds))
+                            }
+                            "cancelled" -> _downloadProgress.postValue(DownloadProgress(status = DownloadStatus.CANCELLED))
+                            else -> {
+                                _downloadProgress.postValue(DownloadProgress(status = DownloadStatus.FAILED, error = error))
+                                _error.postValue("Download failed: $error")
+                            }
+                        }
+                        jobFinished()
                     }
                 }
 
-                // Run download
-                val outputPath = "$outputDir/%(title)s.%(ext)s"
-                val soloAudio = type == MediaType.AUDIO_ONLY
-
-                hanserlodModule?.callAttr(
-                    "descargar_video",
+                // Audio is kept as AAC/m4a: no video bytes, no transcode
+                val jobId = DownloadService.worker(appContext).callAttr(
+                    "submit",
                     url,
-                    outputPath,
+                    outputDir,
                     format.formatId,
-                    soloAudio
-                )
-
-                progressChannel.close()
-                progressJob.join()
-
-                _downloadProgress.postValue(DownloadProgress(status = DownloadStatus.COMPLETED))
-                _downloadPath.postValue(outputDir)
-            } catch (e: Exception) {
-                if (e !is kotlinx.coroutines.CancellationException) {
-                    _downloadProgress.postValue(DownloadProgress(
-                        status = DownloadStatus.FAILED,
-                        error = e.message
-                    ))
-                    _error.postValue("Download failed: ${e.message}")
+                    type == MediaType.AUDIO_ONLY,
+                    "m4a",
+                    listener
+                ).toString()
+                handle.id = jobId
+                if (currentJob.get() !== handle) {
+                    // Replaced while submitting, before cancelCurrentJob could see the id;
+                    // its onFinished still balances activeJobs, so a failed cancel is not ours to count
+                    runCatching { DownloadService.worker(appContext).callAttr("cancel", jobId) }
                 }
+            } catch (e: Exception) {
+                jobFinished()
+                if (!currentJob.compareAndSet(handle, null)) return@launch
+                _downloadProgress.postValue(DownloadProgress(
+                    status = DownloadStatus.FAILED,
+                    error = e.message
+                ))
+                _error.postValue("Download failed: ${e.message}")
             }
         }
     }
 
+    private fun jobFinished() {
+        if (activeJobs.decrementAndGet() == 0) {
+            DownloadService.stop(appContext)
+        }
+    }
+
+    private fun cancelCurrentJob() {
+        val handle = currentJob.getAndSet(null) ?: return
+        val jobId = handle.id ?: return  // still submitting: it cancels itself once it has the id
+        viewModelScope.launch(Dispatchers.IO) {
+            DownloadService.worker(appContext).callAttr("cancel", jobId)
+        }
+    }
+
     fun cancelDownload() {
-        currentDownloadJob?.cancel()
+        cancelCurrentJob()
         _downloadProgress.value = DownloadProgress(status = DownloadStatus.CANCELLED)
     }
 
     override fun onCleared() {
-        currentDownloadJob?.cancel()
+        // viewModelScope is already cancelled here, so cancel on the caller's (main)
+        // thread: only look the worker up - creating one would warm up yt-dlp here,
+        // and a new worker never heard of this job anyway
+        currentJob.getAndSet(null)?.id?.let { jobId ->
+            python?.getModule("hanserlod")?.callAttr("worker_actual")?.callAttr("cancel", jobId)
+        }
         super.onCleared()
     }
 }
\ No newline at end of file
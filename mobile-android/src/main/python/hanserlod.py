@@ -1,66 +1,459 @@
-import yt_dlp
+"""Python entry points for the Android app (called from Kotlin via Chaquopy).
+
+Everything runs on ytdlp_core: one session pool, info cache and profile set
+is shared by all calls in the process. Values crossing into Kotlin are kept
+to flat tuples and primitives, since every attribute access or dict
+conversion on the Chaquopy boundary is a JNI round trip.
+
+The download foreground service holds a `DownloadWorker` (`iniciar_worker`
+/ `detener_worker`, `worker_actual` to look it up) for its lifetime: it warms yt-dlp up front, queues jobs
+and reports per-call latency.
+"""
+
+from __future__ import annotations
+
 import os
-import ffmpeg
-
-def obtener_formatos(url):
-    ydl_opts = {'quiet': True}
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=False)
-        formats = info.get('formats', [])
-        format_list = []
-        for f in formats:
-            itag = f.get('format_id')
-            res = f.get('height', 'N/A')
-            ext = f.get('ext', 'unknown')
-            vcodec = f.get('vcodec', 'none')
-            acodec = f.get('acodec', 'none')
-            abr = f.get('abr', 'N/A')
-            filesize = f.get('filesize', 0)
-            size_mb = f"{filesize // (1024*1024)}MB" if filesize else "?"
-            if vcodec != 'none' or acodec != 'none':
-                format_list.append((itag, f"{itag} - {res}p - {ext} ({size_mb})"))
-        return format_list
-
-
-def descargar_video(url, output_path, format_id, solo_audio=False):
-    format_string = f"{format_id}+bestaudio/best" if not solo_audio else format_id
-
-    ydl_opts = {
-        'format': format_string,
-        'outtmpl': output_path,
-        'progress_hooks': [progress_hook],
-        'merge_output_format': 'mp4',
-        'noplaylist': True,
-    }
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from ytdlp_core.application.job_queue import DownloadJob, JobQueue
+from ytdlp_core.application.profiles import DownloadProfileProvider
+from ytdlp_core.application.use_cases import (
+    DownloadVideoUseCase,
+    GetVideoInfoUseCase,
+    WarmUpEngineUseCase,
+    format_spec,
+)
+from ytdlp_core.core.models import DownloadProgress, DownloadStatus, MediaType, VideoInfo
+from ytdlp_core.domain.exceptions import CancellationError
+from ytdlp_core.domain.ports import IPlatformService
+
+# Order of the fields in each record returned by `obtener_formatos`
+FORMAT_FIELDS = ("format_id", "ext", "height", "fps", "vcodec", "acodec", "abr", "filesize", "filesize_approx", "note")
+
+# Audio target when Kotlin doesn't ask for one: AAC in m4a needs no transcode
+DEFAULT_AUDIO_FORMAT = "m4a"
+
+# Minimum seconds between two "downloading" callbacks for one job
+PROGRESS_INTERVAL = 0.25
+
+# Pooled yt-dlp sessions live this long between calls; the service keeps
+# the process around, so keep them warm well past a typical pause
+SESSION_IDLE_TIMEOUT = 30 * 60.0
+
+# Order of the fields in each record returned by `DownloadWorker.jobs`
+JOB_FIELDS = ("id", "url", "status", "percent", "downloaded_bytes", "total_bytes", "output_path", "error")
+
+
+class _AndroidPlatform(IPlatformService):
+    def get_data_dir(self) -> Path:
+        # Chaquopy points HOME at the app's private files directory
+        return Path(os.environ.get("HOME", "."))
+
+    def get_download_dir(self) -> Path:
+        return Path(os.environ.get("EXTERNAL_STORAGE", "/sdcard")) / "Download"
+
+    def open_folder(self, path: Path) -> bool:
+        return False
+
+    def show_notification(self, title: str, message: str) -> None:
+        pass
+
+
+class _Services:
+    """Process-wide engine state, built on first use."""
+
+    def __init__(self) -> None:
+        # deferred: the infrastructure modules pull in yt-dlp
+        from ytdlp_core.infrastructure.extractor import YtDlpVideoInfoExtractor
+        from ytdlp_core.infrastructure.metrics import MetricsRegistry
+        from ytdlp_core.infrastructure.platform import FFmpegLocator, MemoryCacheStore, MemoryConfigStore
+        from ytdlp_core.infrastructure.session_pool import YoutubeDLSessionPool
+
+        self.config = MemoryConfigStore()
+        self.platform = _AndroidPlatform()
+        self.metrics = MetricsRegistry()
+        self.session_pool = YoutubeDLSessionPool(idle_timeout=SESSION_IDLE_TIMEOUT)
+        self.profiles = DownloadProfileProvider(self.config)
+        self.ffmpeg = FFmpegLocator()
+        self.extractor = YtDlpVideoInfoExtractor(timeout=30, session_pool=self.session_pool)
+        self.info = GetVideoInfoUseCase(
+            extractor=self.extractor,
+            cache=MemoryCacheStore(max_entries=50),
+            metrics=self.metrics,
+        )
+
+    def download_use_case(self) -> DownloadVideoUseCase:
+        from ytdlp_core.infrastructure.downloader import YtDlpDownloader
+
+        return DownloadVideoUseCase(
+            downloader=YtDlpDownloader(session_pool=self.session_pool, metrics=self.metrics),
+            ffmpeg_locator=self.ffmpeg,
+            config=self.config,
+            platform=self.platform,
+            profiles=self.profiles,
+            metrics=self.metrics,
+            cache=self.info.cache,
+        )
+
+    def video_spec(self, url: str, format_id: str) -> str:
+        """Pair a video-only pick with the best audio when ffmpeg can merge them."""
+        cached = self.info.cache.get(url)
+        fmt = cached.format_index.get(format_id) if cached is not None else None
+        if fmt is None:
+            return format_id
+        return format_spec(fmt, MediaType.VIDEO, merge_audio=self.ffmpeg.find_ffmpeg() is not None)
+
+
+_services: Optional[_Services] = None
+_services_lock = threading.Lock()
+
+
+def _get_services() -> _Services:
+    global _services
+    if _services is None:
+        with _services_lock:
+            if _services is None:
+                _services = _Services()
+    return _services
+
+
+class CancelToken:
+    """Per-job cancellation handle; Kotlin keeps it and calls `cancel()`."""
+
+    def __init__(self) -> None:
+        # Handed to the use case as its cancel event, so a cancel before the
+        # transfer starts is not lost
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+
+def nuevo_token() -> CancelToken:
+    return CancelToken()
+
+
+@contextmanager
+def _timed(call: str) -> Iterator[None]:
+    """Record the block as ``call_seconds{call=...}``, even if it raises."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _get_services().metrics.observe("call_seconds", time.perf_counter() - started, {"call": call})
+
+
+def _format_records(info: VideoInfo) -> list[tuple[Any, ...]]:
+    """Compact rows (see FORMAT_FIELDS): video best-first, then audio best-first."""
+    index = info.format_index
+    return [
+        (
+            e.format.format_id,
+            e.format.ext,
+            e.height or None,
+            e.format.fps,
+            e.format.vcodec,
+            e.format.acodec,
+            e.format.audio_bitrate,
+            e.format.filesize,
+            e.est_size if e.format.filesize is None else None,
+            e.format.format_note,
+        )
+        for e in index.video_by_quality + index.audio_by_quality
+    ]
+
 
+def obtener_info(url: str) -> tuple[Any, ...]:
+    """(id, title, duration, uploader, thumbnail, is_live, formats) for `url`."""
+    with _timed("obtener_info"):
+        info = _get_services().info.execute(url)
+    return (info.id, info.title, info.duration, info.uploader, info.thumbnail, info.is_live, _format_records(info))
+
+
+def obtener_formatos(url: str) -> list[tuple[Any, ...]]:
+    """Format records for `url` (see FORMAT_FIELDS)."""
+    with _timed("obtener_formatos"):
+        return _format_records(_get_services().info.execute(url))
+
+
+def _progress_forwarder(listener: Any, interval: float):
+    """Adapt DownloadProgress to ``listener.onProgress(status, downloaded, total, speed, eta, percent)``.
+
+    Unknown numbers are passed as -1 so the Kotlin side takes primitives only.
+    "downloading" ticks are throttled to one per `interval`; state changes
+    always go through.
+    """
+    last = [0.0]
+
+    def forward(progress: DownloadProgress) -> None:
+        now = time.monotonic()
+        if progress.status == DownloadStatus.DOWNLOADING and now - last[0] < interval:
+            return
+        last[0] = now
+        listener.onProgress(
+            progress.status.value,
+            int(progress.downloaded_bytes or 0),
+            int(progress.total_bytes or -1),
+            float(progress.speed if progress.speed is not None else -1.0),
+            int(progress.eta if progress.eta is not None else -1),
+            float(progress.percent),
+        )
+
+    return forward
+
+
+def descargar_video(
+    url: str,
+    output_dir: str,
+    format_id: str,
+    solo_audio: bool = False,
+    listener: Any = None,
+    token: Optional[CancelToken] = None,
+    intervalo: float = PROGRESS_INTERVAL,
+) -> Optional[str]:
+    """Download `url` into `output_dir`; returns the file path, or None if cancelled.
+
+    `solo_audio` keeps the old MP3 output but only fetches the audio stream;
+    use `descargar_audio` to skip the transcode as well. Errors are raised as
+    ytdlp_core exceptions (PyException on the Kotlin side).
+    """
+    if solo_audio:
+        result = descargar_audio(url, output_dir, format_id, "mp3", listener, token, intervalo)
+        return result[0] if result else None
+
+    services = _get_services()
+    token = token or CancelToken()
+    callback = _progress_forwarder(listener, intervalo) if listener is not None else None
+    spec = services.video_spec(url, format_id)
+
+    use_case = services.download_use_case()
+    if token.cancelled:
+        return None
+    try:
+        # A picked format that fails (gone, 403, ...) falls back down the
+        # downloader's format ladder within the same extraction
+        with _timed("descargar_video"):
+            result = use_case.execute(
+                url,
+                spec,
+                MediaType.VIDEO,
+                output_dir=Path(output_dir),
+                progress_callback=callback,
+                cancel_event=token._cancelled,
+            )
+    except CancellationError:
+        if callback is not None:
+            callback(DownloadProgress(status=DownloadStatus.CANCELLED))
+        return None
+    return str(result.output_path) if result.output_path else None
+
+
+def descargar_audio(
+    url: str,
+    output_dir: str,
+    format_id: str = "bestaudio",
+    formato: str = DEFAULT_AUDIO_FORMAT,
+    listener: Any = None,
+    token: Optional[CancelToken] = None,
+    intervalo: float = PROGRESS_INTERVAL,
+) -> Optional[tuple[str, int, float]]:
+    """Fetch only an audio stream; returns (path, downloaded_bytes, seconds), or None if cancelled.
+
+    "m4a", "opus" and "best" keep the source codec (remuxed when ffmpeg is
+    present, otherwise saved in its native container); only "mp3" transcodes.
+    """
+    services = _get_services()
+    token = token or CancelToken()
+    callback = _progress_forwarder(listener, intervalo) if listener is not None else None
+
+    use_case = services.download_use_case()
+    if token.cancelled:
+        return None
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-
-        if solo_audio:
-            video_path = output_path.replace("%(ext)s", "mp4")
-            audio_path = output_path.replace("%(ext)s", "mp3")
-            ffmpeg.input(video_path).output(audio_path).run(overwrite_output=True)
-            os.remove(video_path)
-            print(f"Archivo convertido a MP3: {audio_path}")
-
-    except yt_dlp.DownloadError as e:
-        print(f"Error de descarga: {e}")
-        print("Intentando descargar el mejor formato disponible...")
-        ydl_opts['format'] = 'best'
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            ydl.download([url])
-
-
-def progress_hook(d):
-    if d['status'] == 'downloading':
-        downloaded = d.get('downloaded_bytes', 0)
-        total = d.get('total_bytes', 1)
-        percent = (downloaded / total) * 100
-        print(f"Descargando: {percent:.2f}% - {downloaded / (1024 * 1024):.2f} MB de {total / (1024 * 1024):.2f} MB")
-
-    elif d['status'] == 'finished':
-        print(f"Descarga terminada: {d['filename']}")
-
-    elif d['status'] == 'error':
-        print(f"Error durante la descarga: {d.get('error', 'Desconocido')}")
\ No newline at end of file
+        with _timed("descargar_audio"):
+            result = use_case.execute(
+                url,
+                format_id,
+                MediaType.AUDIO_ONLY,
+                output_dir=Path(output_dir),
+                progress_callback=callback,
+                audio_format=formato,
+                cancel_event=token._cancelled,
+            )
+    except CancellationError:
+        if callback is not None:
+            callback(DownloadProgress(status=DownloadStatus.CANCELLED))
+        return None
+    path = str(result.output_path) if result.output_path else ""
+    return (path, result.downloaded_bytes, round(result.timings.get("total", 0.0), 3))
+
+
+class DownloadWorker:
+    """Engine state for the Android foreground service, created once per service lifetime.
+
+    Shares the process-wide session pool and metadata cache with the
+    module-level calls, keeps yt-dlp imported and its sessions warm, and runs
+    downloads on a small JobQueue. Every call is timed as
+    ``call_seconds{call=...}``; `latency()` returns the summary.
+    """
+
+    def __init__(self, workers: int = 1) -> None:
+        services = _get_services()
+        self._services = services
+        self.queue = JobQueue(
+            services.download_use_case,
+            info=services.info,
+            workers=workers,
+            merge_audio=services.ffmpeg.find_ffmpeg() is not None,
+            progress_interval=PROGRESS_INTERVAL,
+        )
+        self._listeners: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self.queue.subscribe(self._forward)
+        self.queue.start()
+
+    def warm_up(self, probe_url: Optional[str] = None) -> None:
+        """Import yt-dlp and prime a pooled session; best-effort, call off the main thread."""
+        with _timed("warm_up"):
+            WarmUpEngineUseCase(self._services.extractor).execute(probe_url)
+
+    def info(self, url: str) -> tuple[Any, ...]:
+        """Same record as `obtener_info`, served from the shared cache when possible."""
+        return obtener_info(url)
+
+    def submit(
+        self,
+        url: str,
+        output_dir: str,
+        format_id: str,
+        solo_audio: bool = False,
+        formato: str = DEFAULT_AUDIO_FORMAT,
+        listener: Any = None,
+        priority: int = 0,
+    ) -> str:
+        """Queue a download and return its job id.
+
+        `listener` gets ``onProgress(...)`` like `descargar_video`, then
+        ``onFinished(job_id, status, output_path, downloaded_bytes, seconds, error)``
+        once; empty strings stand in for a missing path or error.
+        """
+        with _timed("submit"):
+            job = DownloadJob(
+                url=url,
+                format_id=format_id if solo_audio else self._services.video_spec(url, format_id),
+                media_type=MediaType.AUDIO_ONLY if solo_audio else MediaType.VIDEO,
+                audio_format=formato,
+                output_dir=Path(output_dir),
+                priority=priority,
+            )
+            if listener is not None:
+                with self._lock:
+                    self._listeners[job.id] = listener
+            self.queue.submit(job)
+        return job.id
+
+    def _forward(self, event: str, job: dict[str, Any]) -> None:
+        with self._lock:
+            listener = self._listeners.get(job["id"])
+        if listener is None:
+            return
+        if event == "progress":
+            listener.onProgress(
+                DownloadStatus.DOWNLOADING.value,
+                int(job["downloaded_bytes"] or 0),
+                int(job["total_bytes"] or -1),
+                float(job["speed"] if job["speed"] is not None else -1.0),
+                int(job["eta"] if job["eta"] is not None else -1),
+                float(job["percent"]),
+            )
+        elif event in ("completed", "failed", "cancelled"):
+            with self._lock:
+                self._listeners.pop(job["id"], None)
+            listener.onFinished(
+                job["id"],
+                event,
+                job["output_path"] or "",
+                int(job["downloaded_bytes"] or 0),
+                round(job["timings"].get("total", 0.0), 3),
+                job["error"] or "",
+            )
+
+    def cancel(self, job_id: str) -> bool:
+        with _timed("cancel"):
+            return self.queue.cancel(job_id)
+
+    def jobs(self) -> list[tuple[Any, ...]]:
+        """Every known job as a flat record (see JOB_FIELDS)."""
+        with _timed("jobs"):
+            rows = [job.to_dict() for job in self.queue.jobs()]
+        return [tuple(row[name] for name in JOB_FIELDS) for row in rows]
+
+    def latency(self) -> list[tuple[str, int, float, float]]:
+        """(call, count, mean_ms, max_ms) for every call timed in this process."""
+        series = self._services.metrics.snapshot()["distributions"].get("call_seconds", [])
+        return sorted(
+            (
+                s["labels"]["call"],
+                s["count"],
+                round(s["sum"] / s["count"] * 1000, 1),
+                round(s["max"] * 1000, 1),
+            )
+            for s in series
+            if s["count"]
+        )
+
+    def close(self) -> None:
+        """Cancel queued and running jobs and stop the queue's threads."""
+        self.queue.close()
+        with self._lock:
+            self._listeners.clear()
+
+
+_worker: Optional[DownloadWorker] = None
+
+
+def iniciar_worker(workers: int = 1, probe_url: Optional[str] = None) -> DownloadWorker:
+    """The service's worker, created and warmed up on first call."""
+    global _worker
+    with _services_lock:
+        worker = _worker
+    if worker is None:
+        worker = DownloadWorker(workers)
+        worker.warm_up(probe_url)
+        with _services_lock:
+            if _worker is None:
+                _worker = worker
+            else:
+                worker.close()
+                worker = _worker
+    return worker
+
+
+def worker_actual() -> Optional[DownloadWorker]:
+    """The running worker, or None; never creates one, so it is safe on the UI thread."""
+    with _services_lock:
+        return _worker
+
+
+def detener_worker(worker: DownloadWorker) -> None:
+    """Close `worker`, the one a service instance got from `iniciar_worker`, when it is destroyed.
+
+    It stops being the current worker only if it still is one, so a worker
+    created for the next service is never closed by a late call. Detaching
+    is immediate and the close runs on its own thread, so this is safe on
+    the UI thread: a download started right after returns gets a new
+    worker. The warm sessions stay for the next one.
+    """
+    global _worker
+    with _services_lock:
+        if _worker is worker:
+            _worker = None
+    threading.Thread(target=worker.close, name="worker-close", daemon=True).start()
@@ -0,0 +1,111 @@
+"""yt-dlp info-dict fixtures: recorded files and a synthetic generator."""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+from typing import Any
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def load_fixtures() -> dict[str, dict[str, Any]]:
+    """Recorded info dicts in fixtures/, keyed by file stem."""
+    return {
+        path.stem: json.loads(path.read_text(encoding="utf-8"))
+        for path in sorted(FIXTURES_DIR.glob("*.json"))
+    }
+
+
+def record_fixture(url: str, name: str) -> Path:
+    """Extract `url` with yt-dlp (network required) and save it as a fixture."""
+    import yt_dlp
+
+    with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True, "skip_download": True}) as ydl:
+        info = ydl.sanitize_info(ydl.extract_info(url, download=False))
+    path = FIXTURES_DIR / f"{name}.json"
+    path.write_text(json.dumps(info, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    return path
+
+
+_VIDEO_LADDER = [
+    (256, 144, "avc1.4d400c", "vp09.00.11.08", "av01.0.00M.08"),
+    (426, 240, "avc1.4d4015", "vp09.00.20.08", "av01.0.00M.08"),
+    (640, 360, "avc1.4d401e", "vp09.00.21.08", "av01.0.01M.08"),
+    (854, 480, "avc1.4d401f", "vp09.00.30.08", "av01.0.04M.08"),
+    (1280, 720, "avc1.64001f", "vp09.00.31.08", "av01.0.05M.08"),
+    (1920, 1080, "avc1.640028", "vp09.00.40.08", "av01.0.08M.08"),
+    (2560, 1440, None, "vp09.00.50.08", "av01.0.12M.08"),
+    (3840, 2160, None, "vp09.00.51.08", "av01.0.12M.08"),
+]
+
+
+def make_info_dict(index: int, seed: int = 0) -> dict[str, Any]:
+    """Build one info dict with ~40 formats, ~40 thumbnails and a long description."""
+    rng = random.Random(seed * 100_003 + index)
+    video_id = f"vid{index:08d}"
+    duration = rng.randint(60, 3600)
+    formats: list[dict[str, Any]] = [
+        {"format_id": "sb0", "ext": "mhtml", "vcodec": "none", "acodec": "none", "protocol": "mhtml"},
+    ]
+    for itag, ext, acodec, abr in (("139", "m4a", "mp4a.40.5", 48.8), ("140", "m4a", "mp4a.40.2", 129.5),
+                                   ("249", "webm", "opus", 53.1), ("250", "webm", "opus", 69.4),
+                                   ("251", "webm", "opus", 137.2)):
+        formats.append({
+            "format_id": itag, "ext": ext, "vcodec": "none", "acodec": acodec, "abr": abr, "tbr": abr,
+            "filesize": int(abr * 125 * duration), "protocol": "https", "format_note": "medium",
+            "audio_channels": 2, "asr": 48000,
+        })
+    for rung, (width, height, avc, vp9, av1) in enumerate(_VIDEO_LADDER):
+        for codec, ext in ((avc, "mp4"), (vp9, "webm"), (av1, "mp4")):
+            if codec is None:
+                continue
+            for protocol in ("https", "m3u8_native"):
+                vbr = round(rng.uniform(80, 200) * (rung + 1) ** 2, 3)
+                formats.append({
+                    "format_id": f"{396 + rung * 6 + len(formats)}" + ("-hls" if protocol != "https" else ""),
+                    "ext": ext, "width": width, "height": height, "fps": 30 if rung < 5 else 60,
+                    "vcodec": codec, "acodec": "none", "vbr": vbr, "tbr": vbr,
+                    "filesize": int(vbr * 125 * duration) if protocol == "https" else None,
+                    "filesize_approx": int(vbr * 125 * duration),
+                    "protocol": protocol, "format_note": f"{height}p", "dynamic_range": "SDR",
+                    "url": f"https://rr3---sn-example.googlevideo.com/videoplayback?id={video_id}&itag={rung}",
+                })
+    formats.append({
+        "format_id": "18", "ext": "mp4", "width": 640, "height": 360, "fps": 30,
+        "vcodec": "avc1.42001E", "acodec": "mp4a.40.2", "tbr": 503.2, "protocol": "https",
+        "format_note": "360p", "filesize_approx": int(503.2 * 125 * duration),
+    })
+
+    thumbnails = []
+    for n, (w, h) in enumerate([(120, 90), (168, 94), (196, 110), (246, 138), (320, 180),
+                                (336, 188), (480, 360), (640, 480), (1280, 720), (1920, 1080)] * 4):
+        thumbnails.append({
+            "url": f"https://i.ytimg.com/vi/{video_id}/hq{n}.jpg?sqp=-oaymwE{n}",
+            "preference": n - 40, "id": str(n), "width": w, "height": h, "resolution": f"{w}x{h}",
+        })
+
+    words = ["lorem", "ipsum", "dolor", "sit", "amet", "video", "subscribe", "https://example.com/link"]
+    description = " ".join(rng.choice(words) for _ in range(rng.randint(200, 600)))
+
+    return {
+        "id": video_id,
+        "title": f"Benchmark video {index}",
+        "description": description,
+        "uploader": f"Channel {index % 50}",
+        "uploader_id": f"@channel{index % 50}",
+        "upload_date": "20240101",
+        "duration": duration,
+        "view_count": rng.randint(0, 10**7),
+        "like_count": rng.randint(0, 10**5),
+        "thumbnail": thumbnails[-1]["url"],
+        "thumbnails": thumbnails,
+        "formats": formats,
+        "webpage_url": f"https://www.youtube.com/watch?v={video_id}",
+        "is_live": False,
+        "availability": "public",
+        "age_limit": 0,
+        "categories": ["Music"],
+        "tags": [f"tag{rng.randint(0, 30)}" for _ in range(12)],
+    }
@@ -0,0 +1,125 @@
+"""Codec benchmark: ytdlp_core.core.codec against pickle and json(asdict).
+
+Every format is round-tripped and compared with the original before it is
+timed, so the script doubles as a codec self-check:
+
+    python benchmarks/bench_codec.py --iterations 200 --output codec.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import pickle
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _fixtures import make_info_dict  # noqa: E402
+
+from ytdlp_core.core import codec  # noqa: E402
+from ytdlp_core.core.models import (  # noqa: E402
+    DownloadOptions,
+    DownloadProgress,
+    DownloadResult,
+    DownloadStatus,
+    MediaType,
+)
+from ytdlp_core.infrastructure.extractor import YtDlpVideoInfoExtractor  # noqa: E402
+
+
+def _asdict_json(obj: Any) -> bytes:
+    return json.dumps(dataclasses.asdict(obj), default=str).encode("utf-8")
+
+
+def _json_form(obj: Any) -> bytes:
+    return codec.encode_json(obj).encode("utf-8")
+
+
+# name -> (encode, decode or None when the format cannot rebuild the model)
+FORMATS: dict[str, tuple[Callable[[Any], bytes], Optional[Callable[[bytes], Any]]]] = {
+    "codec_binary": (codec.encode_binary, codec.decode_binary),
+    "codec_json": (_json_form, codec.decode_json),
+    "pickle": (lambda obj: pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads),
+    "json_asdict": (_asdict_json, None),
+}
+
+
+def sample_records() -> dict[str, Any]:
+    info = YtDlpVideoInfoExtractor()._parse_video_info(make_info_dict(0), "https://youtu.be/vid00000000")
+    options = DownloadOptions(
+        url=info.webpage_url,
+        output_path=Path("/tmp/downloads"),
+        format_id="137+140",
+        media_type=MediaType.VIDEO,
+        rate_limit="2M",
+        subtitle_langs=["en", "es"],
+        post_processors=({"key": "FFmpegMetadata"},),
+    )
+    return {
+        "VideoInfo": info,
+        "DownloadOptions": options,
+        "DownloadProgress": DownloadProgress(
+            status=DownloadStatus.DOWNLOADING, downloaded_bytes=1 << 20, total_bytes=8 << 20,
+            speed=512_000.0, eta=14, filename="video.mp4", percent=12.5,
+        ),
+        "DownloadResult": DownloadResult(success=True, output_path=Path("/tmp/downloads/video.mp4"), video_info=info),
+    }
+
+
+def bench(fn: Callable[[], Any], iterations: int) -> float:
+    """Operations per second for `fn`."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def run(iterations: int) -> dict[str, Any]:
+    results: dict[str, Any] = {}
+    for record_name, obj in sample_records().items():
+        row: dict[str, Any] = {}
+        for fmt_name, (encode, decode) in FORMATS.items():
+            blob = encode(obj)
+            if decode is not None and decode(blob) != obj:
+                raise SystemExit(f"{fmt_name} round-trip mismatch for {record_name}")
+            entry = {
+                "bytes": len(blob),
+                "encode_ops_s": round(bench(lambda: encode(obj), iterations)),
+            }
+            if decode is not None:
+                entry["decode_ops_s"] = round(bench(lambda: decode(blob), iterations))
+            row[fmt_name] = entry
+        results[record_name] = row
+    return results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "codec",
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "schema_version": codec.SCHEMA_VERSION,
+        "binary_payload": "json" if codec.msgpack is None else "msgpack",
+        "results": run(args.iterations),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
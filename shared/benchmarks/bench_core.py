@@ -0,0 +1,252 @@
+"""Offline micro-benchmarks for the ytdlp_core hot paths.
+
+Driven by the recorded info dicts in benchmarks/fixtures; no network is
+used. Results are JSON so runs can be stored and compared:
+
+    python benchmarks/bench_core.py --output base.json
+    python benchmarks/bench_core.py --compare base.json --threshold 1.25
+    python benchmarks/bench_core.py --record https://youtu.be/ID --name my_video
+
+With --compare, each case reports its ratio to the baseline median, and
+any case slower than --threshold times the baseline fails the run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _fixtures import load_fixtures, record_fixture  # noqa: E402
+
+from ytdlp_core.core.models import DownloadOptions, MediaType, VideoInfo  # noqa: E402
+from ytdlp_core.application.profiles import compile_profile  # noqa: E402
+from ytdlp_core.infrastructure.downloader import YtDlpDownloader  # noqa: E402
+from ytdlp_core.infrastructure.extractor import YtDlpVideoInfoExtractor  # noqa: E402
+from ytdlp_core.infrastructure.platform import JsonConfigStore, MemoryCacheStore  # noqa: E402
+
+URLS = [
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ",
+    "https://www.youtube.com/shorts/abcdefghijk",
+    "https://www.youtube.com/playlist?list=PL1234567890",
+    "https://example.com/not/a/video",
+    "not a url at all",
+]
+
+
+def progress_stream(total: int = 50 * 1024 * 1024, chunk: int = 256 * 1024) -> list[dict[str, Any]]:
+    """yt-dlp progress dicts for one download, as the hook would see them."""
+    events: list[dict[str, Any]] = [
+        {
+            "status": "downloading",
+            "downloaded_bytes": done,
+            "total_bytes": total,
+            "speed": 4.2e6,
+            "eta": (total - done) // 4_200_000,
+            "filename": "/tmp/video.f137.mp4.part",
+            "tmpfilename": "/tmp/video.f137.mp4.part",
+            "elapsed": done / 4.2e6,
+        }
+        for done in range(0, total, chunk)
+    ]
+    events.append({"status": "finished", "total_bytes": total, "filename": "/tmp/video.f137.mp4"})
+    return events
+
+
+def build_cases(tmp: Path) -> tuple[dict[str, Callable[[], Any]], list[JsonConfigStore]]:
+    """Map case name -> zero-argument callable performing one operation.
+
+    Also returns the config stores, which must be flushed before `tmp` goes away.
+    """
+    fixtures = load_fixtures()
+    extractor = YtDlpVideoInfoExtractor()
+    downloader = YtDlpDownloader()
+    cases: dict[str, Callable[[], Any]] = {}
+
+    for name, info in fixtures.items():
+        url = info.get("webpage_url", "")
+        cases[f"parse_video_info[{name}]"] = lambda info=info, url=url: extractor._parse_video_info(info, url)
+        parsed = extractor._parse_video_info(info, url)
+        cases[f"format_index[{name}]"] = lambda parsed=parsed: VideoInfo(
+            id=parsed.id, title=parsed.title, formats=parsed.formats, duration=parsed.duration
+        ).format_index
+        cases[f"select_format[{name}]"] = lambda parsed=parsed: parsed.select_format(
+            "<=1080p, prefer avc1, prefer mp4, max 500MB"
+        )
+
+    cases["validate_url"] = lambda: [extractor.validate_url(url) for url in URLS]
+
+    plain = DownloadOptions(
+        url=URLS[0],
+        output_path=tmp,
+        format_id="137+140",
+        rate_limit="2M",
+        write_subtitles=True,
+        subtitle_langs=["en", "es"],
+    )
+    profile = compile_profile({"rate_limit": "2M", "write_subtitles": True, "subtitle_langs": "en,es"})
+    profiled = profile.to_options(url=URLS[0], output_path=tmp, format_id="137+140")
+    audio = profile.to_options(url=URLS[0], output_path=tmp, format_id="140", media_type=MediaType.AUDIO_ONLY)
+    cases["to_ydl_opts[plain]"] = plain.to_ydl_opts
+    cases["to_ydl_opts[profile]"] = profiled.to_ydl_opts
+    cases["to_ydl_opts[audio]"] = audio.to_ydl_opts
+
+    events = progress_stream()
+    sink: list[Any] = []
+
+    def progress_hook() -> None:
+        # Same work as the downloader's hook: parse, then hand to the callback
+        sink.clear()
+        for d in events:
+            sink.append(downloader._parse_progress(d))
+
+    cases[f"progress_hook[{len(events)} events]"] = progress_hook
+
+    cache = MemoryCacheStore()
+    videos = [extractor._parse_video_info(info, info.get("webpage_url", "")) for info in fixtures.values()]
+    keys = [f"https://youtu.be/{i:011d}" for i in range(1000)]
+
+    def cache_set() -> None:
+        for i, key in enumerate(keys):
+            cache.set(key, videos[i % len(videos)])
+
+    def cache_get() -> None:
+        for key in keys:
+            cache.get(key)
+
+    cases["cache_set[1000]"] = cache_set
+    cases["cache_get[1000]"] = cache_get
+
+    debounced = JsonConfigStore(tmp / "debounced.json")
+    immediate = JsonConfigStore(tmp / "immediate.json", flush_delay=0)
+    counter = iter(range(10**9))
+
+    cases["config_set[debounced]"] = lambda: debounced.set("download_dir", f"/tmp/{next(counter)}")
+    cases["config_set[immediate]"] = lambda: immediate.set("download_dir", f"/tmp/{next(counter)}")
+
+    def config_batch() -> None:
+        with immediate.batch():
+            for key in ("quality", "media_type", "download_dir", "proxy", "rate_limit"):
+                immediate.set(key, f"{key}-{next(counter)}")
+
+    cases["config_batch[5 keys]"] = config_batch
+    return cases, [debounced, immediate]
+
+
+def time_case(fn: Callable[[], Any], repeat: int, min_time: float) -> dict[str, Any]:
+    """Calibrate a loop count so one sample takes `min_time`, then take `repeat` samples."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number)
+
+    median = statistics.median(samples)
+    return {
+        "median_us": round(median * 1e6, 3),
+        "min_us": round(min(samples) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(samples) * 1e6, 3) if len(samples) > 1 else 0.0,
+        "ops_s": round(1 / median) if median else None,
+        "loops": number,
+        "repeat": repeat,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        proc = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=ROOT, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return proc.stdout.strip() or None
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    """Annotate results with ratios to `baseline`; return regressions."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base.get("median_us"):
+            continue
+        ratio = result["median_us"] / base["median_us"]
+        result["baseline_median_us"] = base["median_us"]
+        result["ratio"] = round(ratio, 3)
+        if ratio > threshold:
+            regressions.append(f"{name}: {ratio:.2f}x slower than baseline")
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    parser.add_argument("--filter", default="", help="only run cases containing this text")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path, metavar="BASELINE")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--record", metavar="URL", help="record a new fixture and exit")
+    parser.add_argument("--name", help="fixture name for --record")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        print(record_fixture(args.record, args.name or "recorded"))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cases, stores = build_cases(Path(tmp))
+        results = {
+            name: time_case(fn, args.repeat, args.min_time)
+            for name, fn in cases.items()
+            if args.filter in name
+        }
+        for store in stores:
+            store.flush()
+
+    report: dict[str, Any] = {
+        "benchmark": "core",
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "results": results,
+    }
+    regressions = []
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.threshold)
+        report["baseline_revision"] = baseline.get("revision")
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
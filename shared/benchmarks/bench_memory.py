@@ -0,0 +1,88 @@
+"""Memory benchmark: bytes retained per cached VideoInfo.
+
+Parses synthetic info dicts through the extractor, stores the results in
+a MemoryCacheStore and measures the retained heap with tracemalloc:
+
+    python benchmarks/bench_memory.py --videos 500 --output memory.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _fixtures import make_info_dict  # noqa: E402
+
+from ytdlp_core.infrastructure.extractor import YtDlpVideoInfoExtractor  # noqa: E402
+from ytdlp_core.infrastructure.platform import MemoryCacheStore  # noqa: E402
+
+
+def measure(build: Callable[[], Any]) -> tuple[int, Any]:
+    """Bytes still allocated after `build()` returns, and its result."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, result
+
+
+def run(videos: int) -> dict[str, Any]:
+    extractor = YtDlpVideoInfoExtractor()
+
+    def cache_videos() -> MemoryCacheStore:
+        # The info dict is dropped after parsing, as after a real extraction
+        cache = MemoryCacheStore()
+        for i in range(videos):
+            info = make_info_dict(i)
+            cache.set(info["id"], extractor._parse_video_info(info, info["webpage_url"]))
+        return cache
+
+    cached_bytes, cache = measure(cache_videos)
+    ids = list(cache._cache)
+    index_bytes, _ = measure(lambda: [cache.get(key).format_index for key in ids])
+    raw_bytes, _ = measure(lambda: [make_info_dict(i) for i in range(videos)])
+
+    sample = cache.get(ids[0])
+    return {
+        "videos": videos,
+        "formats_per_video": len(sample.formats),
+        "thumbnails_per_video": len(sample.thumbnails),
+        "bytes_per_video": cached_bytes // videos,
+        "format_index_bytes_per_video": index_bytes // videos,
+        "raw_info_dict_bytes_per_video": raw_bytes // videos,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--videos", type=int, default=500)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "memory",
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "results": run(args.videos),
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""End-to-end load test: N concurrent jobs against the local media server.
+
+Each job runs the same path as the apps: GetVideoInfoUseCase (through the
+load-test yt-dlp extractor plugin), then DownloadVideoUseCase on a worker
+thread, with all workers sharing one YoutubeDL session pool. Nothing
+leaves the machine:
+
+    python benchmarks/loadtest/bench_load.py --jobs 64 --concurrency 8 --size 8M
+    python benchmarks/loadtest/bench_load.py --protocols hls,dash --latency 30 --throttle 4M --fail-rate 0.05
+    python benchmarks/loadtest/bench_load.py --sidecars 4 --sidecar-latency 300 --throttle 4M [--inline-sidecars]
+
+The media server runs in a child process so its CPU time is not charged
+to the driver. With --source pointing at a real media file and ffmpeg on
+PATH, --audio-ratio also exercises FFmpegExtractAudio post-processing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Optional
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parents[1]))
+# Plugin extractors must be importable before yt-dlp builds its extractor list
+sys.path.insert(0, str(HERE / "plugins"))
+
+from media_server import SUBTITLE_LANGS, parse_rate  # noqa: E402
+
+from ytdlp_core.application.use_cases import DownloadVideoUseCase, GetVideoInfoUseCase  # noqa: E402
+from ytdlp_core.core.models import MediaType  # noqa: E402
+from ytdlp_core.domain.ports import IPlatformService  # noqa: E402
+from ytdlp_core.infrastructure.downloader import YtDlpDownloader  # noqa: E402
+from ytdlp_core.infrastructure.extractor import YtDlpVideoInfoExtractor  # noqa: E402
+from ytdlp_core.infrastructure.metrics import MetricsRegistry, PrometheusExporter  # noqa: E402
+from ytdlp_core.infrastructure.platform import FFmpegLocator, JsonConfigStore, MemoryCacheStore  # noqa: E402
+from ytdlp_core.infrastructure.session_pool import YoutubeDLSessionPool  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class LoadTestExtractor(YtDlpVideoInfoExtractor):
+    """Extractor that accepts the media server's watch URLs."""
+
+    YOUTUBE_PATTERNS = [r"^https?://(?:127\.0\.0\.1|localhost):\d+/watch/[\w-]+"]
+
+
+class TempPlatformService(IPlatformService):
+    def __init__(self, root: Path):
+        self.root = root
+
+    def get_data_dir(self) -> Path:
+        return self.root
+
+    def get_download_dir(self) -> Path:
+        return self.root / "downloads"
+
+    def open_folder(self, path: Path) -> bool:
+        return False
+
+    def show_notification(self, title: str, message: str) -> None:
+        pass
+
+
+def start_server(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    cmd = [
+        sys.executable, str(HERE / "media_server.py"),
+        "--latency", str(args.latency),
+        "--sidecar-latency", str(args.sidecar_latency),
+        "--fail-rate", str(args.fail_rate),
+        "--drop-rate", str(args.drop_rate),
+    ]
+    if args.throttle:
+        cmd += ["--throttle", args.throttle]
+    if args.source:
+        cmd += ["--source", str(args.source)]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    base_url = proc.stdout.readline().strip()
+    if not base_url:
+        proc.kill()
+        raise SystemExit(f"media server failed to start: {proc.stderr.read()}")
+    return proc, base_url
+
+
+def stop_server(proc: subprocess.Popen) -> dict[str, Any]:
+    # SIGINT lets the server print its stats; Windows has no SIGINT for children
+    if sys.platform == "win32":
+        proc.terminate()
+    else:
+        proc.send_signal(signal.SIGINT)
+    try:
+        _, err = proc.communicate(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        return {}
+    for line in reversed(err.strip().splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {}
+
+
+def percentile(values: list[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def cpu_seconds() -> float:
+    if resource is None:
+        return time.process_time()
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def phase_summary(metrics: MetricsRegistry) -> dict[str, dict[str, Any]]:
+    """Mean and max per job phase from the ``phase_seconds`` histogram."""
+    summary = {}
+    for series in metrics.snapshot()["distributions"].get("phase_seconds", []):
+        summary[series["labels"]["phase"]] = {
+            "count": series["count"],
+            "mean": round(series["sum"] / series["count"] * 1000, 2),
+            "max": round(series["max"] * 1000, 2),
+        }
+    return dict(sorted(summary.items()))
+
+
+def run(args: argparse.Namespace, base_url: str, root: Path) -> dict[str, Any]:
+    config = JsonConfigStore(root / "config.json")
+    with config.batch():
+        config.set("download_retries", args.retries)
+        config.set("download_timeout", 30)
+        if args.sidecars:
+            config.set("write_subtitles", True)
+            config.set("subtitle_langs", list(SUBTITLE_LANGS[:args.sidecars]))
+            config.set("write_thumbnail", True)
+    platform_service = TempPlatformService(root)
+    pool = YoutubeDLSessionPool(max_idle_per_key=args.concurrency)
+    metrics = MetricsRegistry()
+    info_use_case = GetVideoInfoUseCase(
+        extractor=LoadTestExtractor(session_pool=pool),
+        cache=MemoryCacheStore(),
+        metrics=metrics,
+    )
+    locator = FFmpegLocator()
+    has_ffmpeg = locator.find_ffmpeg() is not None
+
+    local = threading.local()
+
+    def download_use_case() -> DownloadVideoUseCase:
+        # One downloader per worker: a downloader tracks a single active job
+        if not hasattr(local, "use_case"):
+            local.use_case = DownloadVideoUseCase(
+                downloader=YtDlpDownloader(
+                    session_pool=pool, metrics=metrics, parallel_sidecars=not args.inline_sidecars
+                ),
+                ffmpeg_locator=locator,
+                config=config,
+                platform=platform_service,
+                metrics=metrics,
+            )
+        return local.use_case
+
+    protocols = args.protocols.split(",")
+    size = parse_rate(args.size)
+    audio_every = int(1 / args.audio_ratio) if args.audio_ratio > 0 else 0
+
+    def job(i: int) -> dict[str, Any]:
+        url = f"{base_url}/watch/job{i:05d}?size={size}&segments={args.segments}"
+        fmt = protocols[i % len(protocols)]
+        media_type = MediaType.AUDIO_ONLY if audio_every and i % audio_every == 0 else MediaType.VIDEO
+        out_dir = root / "downloads" / f"job{i:05d}"
+        record: dict[str, Any] = {"job": i, "format": fmt, "media_type": media_type.value}
+        started = time.perf_counter()
+        try:
+            info_use_case.execute(url)
+            record["extract_s"] = time.perf_counter() - started
+            if media_type == MediaType.AUDIO_ONLY:
+                # Audio-only stream, remuxed at most: no ffmpeg needed
+                fmt = "bestaudio"
+            result = download_use_case().execute(url, fmt, media_type, output_dir=out_dir, audio_format="m4a")
+            record["ok"] = result.success
+            record["sidecar_saved_s"] = result.sidecar_seconds_saved
+            if result.output_path and result.output_path.exists():
+                record["bytes"] = result.output_path.stat().st_size
+        except Exception as e:
+            record["ok"] = False
+            record["error"] = f"{type(e).__name__}: {e}"[:300]
+        record["latency_s"] = time.perf_counter() - started
+        if not args.keep_files:
+            shutil.rmtree(out_dir, ignore_errors=True)
+        return record
+
+    cpu_start = cpu_seconds()
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency, thread_name_prefix="job") as executor:
+        records = list(executor.map(job, range(args.jobs)))
+    wall = time.perf_counter() - wall_start
+    cpu = cpu_seconds() - cpu_start
+    pool.close()
+    config.flush()
+    if args.prometheus:
+        PrometheusExporter(metrics).write(args.prometheus)
+
+    ok = [r for r in records if r.get("ok")]
+    latencies = [r["latency_s"] for r in ok]
+    total_bytes = sum(r.get("bytes", 0) for r in ok)
+    errors: dict[str, int] = {}
+    for r in records:
+        if "error" in r:
+            errors[r["error"]] = errors.get(r["error"], 0) + 1
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 1) if value is not None else None
+
+    return {
+        "jobs": args.jobs,
+        "succeeded": len(ok),
+        "failed": len(records) - len(ok),
+        "wall_s": round(wall, 3),
+        "jobs_per_s": round(len(ok) / wall, 2) if wall else None,
+        "throughput_mb_s": round(total_bytes / wall / (1024 * 1024), 2) if wall else None,
+        "bytes": total_bytes,
+        "latency_ms": {
+            "p50": ms(percentile(latencies, 50)),
+            "p90": ms(percentile(latencies, 90)),
+            "p99": ms(percentile(latencies, 99)),
+            "max": ms(max(latencies) if latencies else None),
+        },
+        "extract_ms_p50": ms(percentile([r["extract_s"] for r in ok if "extract_s" in r], 50)),
+        "cpu_s": round(cpu, 3),
+        "cpu_percent": round(cpu / wall * 100, 1) if wall else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "session_pool": pool.stats(),
+        "phases_ms": phase_summary(metrics),
+        "retries": metrics.counter("retries"),
+        "sidecar_saved_ms_p50": ms(percentile([r["sidecar_saved_s"] for r in ok], 50)) if args.sidecars else None,
+        "ffmpeg": has_ffmpeg,
+        "errors": errors,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--size", default="4M", help="bytes per synthetic video, e.g. 8M")
+    parser.add_argument("--segments", type=int, default=8, help="segments per HLS/DASH stream")
+    parser.add_argument("--protocols", default="progressive,hls,dash")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--audio-ratio", type=float, default=0.0, help="fraction of audio-only (m4a) jobs")
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in milliseconds")
+    parser.add_argument("--throttle", help="server per-connection rate, e.g. 2M")
+    parser.add_argument("--sidecars", type=int, default=0,
+                        help=f"write this many subtitle languages (max {len(SUBTITLE_LANGS)}) and the thumbnail")
+    parser.add_argument("--sidecar-latency", type=float, default=0.0,
+                        help="extra server latency for subtitles and thumbnails, in milliseconds")
+    parser.add_argument("--inline-sidecars", action="store_true",
+                        help="let yt-dlp fetch sidecars itself, before the transfer (baseline)")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--source", type=Path, help="serve this media file instead of random bytes")
+    parser.add_argument("--keep-files", action="store_true")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--prometheus", type=Path, help="also write metrics in Prometheus text format")
+    args = parser.parse_args(argv)
+
+    proc, base_url = start_server(args)
+    try:
+        with tempfile.TemporaryDirectory(prefix="ytdlp-load-") as tmp:
+            results = run(args, base_url, Path(tmp))
+    finally:
+        server_stats = stop_server(proc)
+
+    report = {
+        "benchmark": "load",
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "parameters": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items() if k not in ("output", "prometheus")},
+        "results": results,
+        "server": server_stats,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    return 0 if results["succeeded"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""Local HTTP media server for load tests.
+
+Serves synthetic media without touching the network:
+
+    /api/<id>?size=&segments=&segment_size=   JSON manifest for the test extractor
+    /media/<id>/progressive/<size>.mp4         single file, honours Range
+    /media/<id>/hls/<n>x<size>/index.m3u8      HLS playlist of n segments
+    /media/<id>/hls/<n>x<size>/seg<i>.ts
+    /media/<id>/dash/<n>x<size>/seg<i>.m4s     DASH segments (listed in the manifest)
+    /subs/<id>/<lang>.vtt                      WebVTT subtitles, one track per SUBTITLE_LANGS
+    /thumb/<id>.jpg                            thumbnail image
+
+Bodies are pseudo-random bytes, or slices of `--source FILE` so real media
+(and therefore ffmpeg post-processing) can be exercised. Latency (also a
+separate one for subtitles and thumbnails), per-connection throttling and
+injected failures are configurable:
+
+    python benchmarks/loadtest/media_server.py --port 8765 --latency 20 --throttle 2M --fail-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+_CHUNK = 64 * 1024
+_ROUTE = re.compile(
+    r"^/media/(?P<id>[\w-]+)/(?:"
+    r"progressive/(?P<size>\d+)\.mp4"
+    r"|(?P<kind>hls|dash)/(?P<n>\d+)x(?P<seg>\d+)/(?:index\.m3u8|seg(?P<i>\d+)\.(?:ts|m4s))"
+    r")$"
+)
+_SIDECAR_ROUTE = re.compile(r"^/(?:subs/(?P<id>[\w-]+)/(?P<lang>[\w-]+)\.vtt|thumb/(?P<thumb>[\w-]+)\.jpg)$")
+
+SUBTITLE_LANGS = ("en", "es", "fr", "de", "pt", "ja")
+
+
+class MediaServer:
+    """Threaded media server; use as a context manager or call start/stop."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        throttle: Optional[int] = None,
+        fail_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        source: Optional[Path] = None,
+        seed: int = 0,
+        sidecar_latency: float = 0.0,
+    ):
+        self.latency = latency  # seconds before each response
+        self.sidecar_latency = sidecar_latency  # extra seconds before subtitle/thumbnail responses
+        self.throttle = throttle  # bytes/s per connection
+        self.fail_rate = fail_rate  # fraction of media requests answered with 503
+        self.drop_rate = drop_rate  # fraction of media responses cut off midway
+        self.source = source.read_bytes() if source else None
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._pattern = random.Random(seed).randbytes(_CHUNK) if hasattr(random.Random, "randbytes") else (
+            bytes(random.Random(seed).getrandbits(8) for _ in range(_CHUNK))
+        )
+        self.requests = 0
+        self.failures = 0
+        self.bytes_sent = 0
+        self._stats_lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def watch_url(self, video_id: str, size: int, segments: int = 8) -> str:
+        """URL handled by the load-test extractor."""
+        return f"{self.base_url}/watch/{video_id}?size={size}&segments={segments}"
+
+    def start(self) -> MediaServer:
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="media-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> MediaServer:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return {"requests": self.requests, "failures": self.failures, "bytes_sent": self.bytes_sent}
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._random_lock:
+            return self._random.random() < rate
+
+    def _content(self, start: int, end: int) -> bytes:
+        """Bytes [start, end) of the virtual media file."""
+        if self.source is not None:
+            return self.source[start:end]
+        offset = start % _CHUNK
+        length = end - start
+        repeats = (offset + length) // _CHUNK + 1
+        return (self._pattern * repeats)[offset:offset + length]
+
+    def media_size(self, requested: int) -> int:
+        return len(self.source) if self.source is not None else requested
+
+    def manifest(self, video_id: str, size: int, segments: int) -> dict:
+        size = self.media_size(size)
+        seg = -(-size // segments)
+        base = f"{self.base_url}/media/{video_id}"
+        return {
+            "id": video_id,
+            "title": f"Load test {video_id}",
+            "duration": 60,
+            "size": size,
+            "progressive": f"{base}/progressive/{size}.mp4",
+            "hls": f"{base}/hls/{segments}x{seg}/index.m3u8",
+            "dash_base": f"{base}/dash/{segments}x{seg}/",
+            "dash_fragments": [f"seg{i}.m4s" for i in range(segments)],
+            "subtitles": {lang: f"{self.base_url}/subs/{video_id}/{lang}.vtt" for lang in SUBTITLE_LANGS},
+            "thumbnail": f"{self.base_url}/thumb/{video_id}.jpg",
+        }
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                with server._stats_lock:
+                    server.requests += 1
+                if server.latency:
+                    time.sleep(server.latency)
+                parsed = urlparse(self.path)
+                if parsed.path.startswith("/api/"):
+                    query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                    body = json.dumps(server.manifest(
+                        parsed.path[len("/api/"):],
+                        int(query.get("size", 4 << 20)),
+                        int(query.get("segments", 8)),
+                    )).encode("utf-8")
+                    return self._send(200, body, "application/json")
+
+                sidecar = _SIDECAR_ROUTE.match(parsed.path)
+                if sidecar:
+                    if server.sidecar_latency:
+                        time.sleep(server.sidecar_latency)
+                    if sidecar.group("lang"):
+                        cues = "".join(
+                            f"\n00:00:{i:02d}.000 --> 00:00:{i + 1:02d}.000\n[{sidecar.group('lang')}] line {i}\n"
+                            for i in range(30)
+                        )
+                        return self._send(200, f"WEBVTT\n{cues}".encode(), "text/vtt")
+                    # JPEG magic, then filler
+                    return self._send(200, b"\xff\xd8\xff\xe0" + server._content(0, 16 * 1024), "image/jpeg")
+
+                match = _ROUTE.match(parsed.path)
+                if not match:
+                    return self._send(404, b"not found", "text/plain")
+                if server._roll(server.fail_rate):
+                    with server._stats_lock:
+                        server.failures += 1
+                    return self._send(503, b"injected failure", "text/plain")
+
+                if match.group("size"):
+                    size = int(match.group("size"))
+                    return self._send_range(0, size, "video/mp4")
+
+                n, seg = int(match.group("n")), int(match.group("seg"))
+                total = server.media_size(n * seg)
+                if match.group("i") is None:
+                    lines = ["#EXTM3U", "#EXT-X-VERSION:3", "#EXT-X-TARGETDURATION:8", "#EXT-X-MEDIA-SEQUENCE:0"]
+                    for i in range(n):
+                        lines += ["#EXTINF:7.5,", f"seg{i}.ts"]
+                    lines.append("#EXT-X-ENDLIST")
+                    return self._send(200, ("\n".join(lines) + "\n").encode(), "application/vnd.apple.mpegurl")
+                i = int(match.group("i"))
+                start = min(i * seg, total)
+                self._send_range(start, min(start + seg, total), "video/mp2t")
+
+            def _send(self, code: int, body: bytes, content_type: str) -> None:
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_range(self, start: int, end: int, content_type: str) -> None:
+                """Serve virtual bytes [start, end), narrowed by a Range header."""
+                code = 200
+                first, last = 0, end - start - 1
+                header = self.headers.get("Range")
+                range_match = re.match(r"bytes=(\d*)-(\d*)", header or "")
+                if range_match and range_match.group(1):
+                    first = int(range_match.group(1))
+                    if range_match.group(2):
+                        last = min(int(range_match.group(2)), last)
+                    code = 206
+                if first > last:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{end - start}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Length", str(last - first + 1))
+                if code == 206:
+                    self.send_header("Content-Range", f"bytes {first}-{last}/{end - start}")
+                self.end_headers()
+
+                drop_at = None
+                if server._roll(server.drop_rate):
+                    drop_at = first + (last - first) // 2
+                    with server._stats_lock:
+                        server.failures += 1
+                pos = first
+                started = time.monotonic()
+                while pos <= last:
+                    chunk_end = min(pos + _CHUNK, last + 1)
+                    if drop_at is not None and chunk_end > drop_at:
+                        self.close_connection = True
+                        return
+                    data = server._content(start + pos, start + chunk_end)
+                    try:
+                        self.wfile.write(data)
+                    except (BrokenPipeError, ConnectionResetError):
+                        return
+                    with server._stats_lock:
+                        server.bytes_sent += len(data)
+                    pos = chunk_end
+                    if server.throttle:
+                        ahead = (pos - first) / server.throttle - (time.monotonic() - started)
+                        if ahead > 0:
+                            time.sleep(ahead)
+
+        return Handler
+
+
+def parse_rate(text: Optional[str]) -> Optional[int]:
+    if not text:
+        return None
+    units = {"K": 1024, "M": 1024**2, "G": 1024**3}
+    text = text.strip().upper()
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0, help="milliseconds before each response")
+    parser.add_argument("--sidecar-latency", type=float, default=0.0,
+                        help="extra milliseconds before subtitle and thumbnail responses")
+    parser.add_argument("--throttle", help="per-connection rate, e.g. 2M")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--source", type=Path, help="serve slices of this media file")
+    args = parser.parse_args(argv)
+
+    server = MediaServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency / 1000,
+        sidecar_latency=args.sidecar_latency / 1000,
+        throttle=parse_rate(args.throttle),
+        fail_rate=args.fail_rate,
+        drop_rate=args.drop_rate,
+        source=args.source,
+    )
+    # The driver reads the bound address from the first line
+    print(server.base_url, flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        print(json.dumps(server.stats()), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""yt-dlp plugin extractor for the local load-test media server.
+
+Picked up when benchmarks/loadtest/plugins is on sys.path before yt-dlp
+builds its extractor list; plugin extractors are tried before built-in ones.
+"""
+
+from yt_dlp.extractor.common import InfoExtractor
+
+
+class LoadTestIE(InfoExtractor):
+    IE_NAME = "loadtest"
+    _VALID_URL = r"https?://(?:127\.0\.0\.1|localhost):\d+/watch/(?P<id>[\w-]+)"
+
+    def _real_extract(self, url):
+        video_id = self._match_id(url)
+        query = url.partition("?")[2]
+        api_url = url.replace("/watch/", "/api/", 1).split("?")[0] + (f"?{query}" if query else "")
+        manifest = self._download_json(api_url, video_id, note="Downloading load-test manifest")
+
+        common = {"ext": "mp4", "vcodec": "avc1.64001f", "acodec": "mp4a.40.2", "width": 1280, "height": 720}
+        size = manifest["size"]
+        formats = [
+            {**common, "format_id": "progressive", "url": manifest["progressive"], "protocol": "http",
+             "filesize": size, "quality": 3},
+            {**common, "format_id": "hls", "url": manifest["hls"], "protocol": "m3u8_native",
+             "filesize_approx": size, "quality": 2},
+            {**common, "format_id": "dash", "url": manifest["dash_base"], "protocol": "http_dash_segments",
+             "fragment_base_url": manifest["dash_base"],
+             "fragments": [{"path": path} for path in manifest["dash_fragments"]],
+             "filesize_approx": size, "quality": 1},
+            # Audio-only stream, an eighth of the video size, like a real site's m4a track
+            {"format_id": "audio", "ext": "m4a", "vcodec": "none", "acodec": "mp4a.40.2", "abr": 128,
+             "url": manifest["progressive"].rsplit("/", 1)[0] + f"/{size // 8}.mp4", "protocol": "http",
+             "filesize": size // 8, "quality": 0},
+        ]
+        return {
+            "id": manifest["id"],
+            "title": manifest["title"],
+            "duration": manifest["duration"],
+            "formats": formats,
+            "subtitles": {
+                lang: [{"ext": "vtt", "url": sub_url}] for lang, sub_url in manifest.get("subtitles", {}).items()
+            },
+            "thumbnails": [{"id": "0", "url": manifest["thumbnail"]}] if manifest.get("thumbnail") else [],
+        }
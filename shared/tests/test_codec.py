@@ -0,0 +1,208 @@
+"""Codec round trips and rejection of malformed records."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from ytdlp_core.core import codec
+from ytdlp_core.core.codec import decode_binary, decode_json, encode_binary, encode_json, from_record, to_record
+from ytdlp_core.core.models import (
+    DownloadOptions,
+    DownloadProgress,
+    DownloadResult,
+    DownloadStatus,
+    MediaType,
+    VideoFormat,
+    VideoInfo,
+)
+from ytdlp_core.domain.exceptions import SerializationError
+
+FORMATS = [
+    VideoFormat("140", "m4a", vcodec="none", acodec="mp4a.40.2", audio_bitrate=128, filesize=3_000_000),
+    VideoFormat("137", "mp4", "1920x1080", 30.0, "avc1.640028", "none", 4400.5, filesize=60_000_000),
+]
+
+INFO = VideoInfo(
+    id="abc123def45",
+    title="Título con acentos",
+    description="x" * 1000,
+    duration=212,
+    thumbnails=[{"url": "https://i.ytimg.com/vi/abc/hq.jpg", "width": 480, "height": 360, "preference": -1}],
+    formats=FORMATS,
+    tags=["a", "b"],
+)
+
+MODELS = [
+    INFO,
+    FORMATS[1],
+    DownloadOptions(
+        url="https://youtu.be/abc123def45",
+        output_path=Path("/tmp/out"),
+        format_id="137+140",
+        media_type=MediaType.AUDIO_ONLY,
+        subtitle_langs=["en", "es"],
+        post_processors=({"key": "FFmpegMetadata"},),
+    ),
+    DownloadProgress(status=DownloadStatus.DOWNLOADING, downloaded_bytes=5, total_bytes=10, speed=1.5),
+    DownloadResult(success=True, output_path=Path("/tmp/out/a.mp4"), video_info=INFO, timings={"total": 1.25}),
+]
+
+
+# Written with msgpack: a DownloadProgress and FORMATS[1]
+MSGPACK_PROGRESS = bytes.fromhex(
+    "5954430192b0446f776e6c6f616450726f677265737386a6737461747573ab646f776e6c6f6164696e67"
+    "b0646f776e6c6f616465645f627974657305ab746f74616c5f6279746573ce00011170a57370656564cb"
+    "3ff8000000000000a3657461fda866696c656e616d65aa766964c3a96f2e6d7034"
+)
+MSGPACK_FORMAT = bytes.fromhex(
+    "5954430192ab566964656f466f726d61749aa3313337a36d7034a9313932307831303830cb403e000000"
+    "000000ab617663312e363430303238a46e6f6e65cb40b1308000000000c0c0ce03938700"
+)
+
+
+@pytest.fixture(params=["msgpack", "json"])
+def binary_impl(request, monkeypatch):
+    """Run with the msgpack package, and as without it (JSON payload, pure-Python msgpack reader)."""
+    if request.param == "json":
+        monkeypatch.setattr(codec, "msgpack", None)
+    elif codec.msgpack is None:
+        pytest.skip("msgpack not installed")
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda m: type(m).__name__)
+def test_json_round_trip(model):
+    assert decode_json(encode_json(model)) == model
+
+
+@pytest.mark.usefixtures("binary_impl")
+@pytest.mark.parametrize("model", MODELS, ids=lambda m: type(m).__name__)
+def test_binary_round_trip(model):
+    data = encode_binary(model)
+    assert data[:3] == b"YTC"
+    assert decode_binary(data) == model
+
+
+def test_without_msgpack_the_payload_is_json(monkeypatch):
+    monkeypatch.setattr(codec, "msgpack", None)
+    record = to_record(INFO)
+    assert json.loads(encode_binary(INFO)[4:]) == [record["t"], record["d"]]
+
+
+@pytest.mark.usefixtures("binary_impl")
+def test_msgpack_records_are_read():
+    assert decode_binary(MSGPACK_PROGRESS) == DownloadProgress(
+        status=DownloadStatus.DOWNLOADING,
+        downloaded_bytes=5,
+        total_bytes=70000,
+        speed=1.5,
+        eta=-3,
+        filename="vidéo.mp4",
+    )
+    assert decode_binary(MSGPACK_FORMAT) == FORMATS[1]
+
+
+def test_json_payloads_are_read_with_msgpack_installed(monkeypatch):
+    monkeypatch.setattr(codec, "msgpack", None)
+    data = encode_binary(INFO)
+    monkeypatch.undo()
+    assert decode_binary(data) == INFO
+
+
+def test_compact_fields_survive():
+    decoded = decode_json(encode_json(INFO))
+    assert decoded.description == INFO.description
+    assert decoded.thumbnails == INFO.thumbnails
+    assert decoded.format_index.best_video().format_id == "137"
+
+
+def test_unknown_fields_are_ignored():
+    record = to_record(INFO)
+    record["d"]["added_later"] = 1
+    assert from_record(record) == INFO
+
+
+@pytest.mark.parametrize("version", [0, 2, "1", None, True, 1.0])
+def test_unsupported_versions_are_rejected(version):
+    record = dict(to_record(INFO), v=version)
+    with pytest.raises(SerializationError, match="version"):
+        from_record(record)
+
+
+@pytest.mark.usefixtures("binary_impl")
+def test_unsupported_binary_version_is_rejected():
+    data = bytearray(encode_binary(INFO))
+    data[3] = codec.SCHEMA_VERSION + 1
+    with pytest.raises(SerializationError, match="version"):
+        decode_binary(bytes(data))
+
+
+@pytest.mark.parametrize("record", [
+    None,
+    [],
+    "VideoInfo",
+    {"t": "VideoInfo", "d": {}},
+    {"v": 1, "d": {}},
+    {"v": 1, "t": "Nope", "d": {}},
+    {"v": 1, "t": ["VideoInfo"], "d": {}},
+    {"v": 1, "t": "VideoInfo", "d": []},
+    {"v": 1, "t": "VideoInfo", "d": {"id": "x"}},
+    {"v": 1, "t": "VideoInfo", "d": {"id": "x", "title": "t", "formats": 5}},
+    {"v": 1, "t": "VideoInfo", "d": {"id": "x", "title": "t", "formats": [["137"]]}},
+    {"v": 1, "t": "VideoInfo", "d": {"id": "x", "title": "t", "formats": ["137"]}},
+    {"v": 1, "t": "VideoInfo", "d": {"id": "x", "title": "t", "formats": [None]}},
+    {"v": 1, "t": "VideoInfo", "d": {"id": "x", "title": "t", "thumbnails": ["u"]}},
+    {"v": 1, "t": "VideoInfo", "d": {"id": "x", "title": "t", "description": 5}},
+    {"v": 1, "t": "VideoFormat", "d": ["137"]},
+    {"v": 1, "t": "VideoFormat", "d": 137},
+    {"v": 1, "t": "DownloadProgress", "d": {"status": "exploded"}},
+    {"v": 1, "t": "DownloadOptions", "d": {"url": "u", "output_path": 5, "format_id": "b"}},
+    {"v": 1, "t": "DownloadOptions", "d": {"url": "u", "output_path": "/x", "format_id": "b", "post_processors": [1]}},
+    {"v": 1, "t": "DownloadResult", "d": {"success": True, "video_info": {"id": "x"}}},
+])
+def test_malformed_records_raise_serialization_error(record):
+    with pytest.raises(SerializationError):
+        from_record(record)
+
+
+@pytest.mark.parametrize("text", ["", "{", "[1, 2]", '{"v": 1, "t": "VideoFormat", "d": {}}'])
+def test_malformed_json_raises_serialization_error(text):
+    with pytest.raises(SerializationError):
+        decode_json(text)
+
+
+@pytest.mark.usefixtures("binary_impl")
+def test_truncated_binary_raises_serialization_error():
+    data = encode_binary(INFO)
+    for end in range(0, len(data), 7):
+        with pytest.raises(SerializationError):
+            decode_binary(data[:end])
+
+
+@pytest.mark.usefixtures("binary_impl")
+def test_trailing_bytes_are_rejected():
+    with pytest.raises(SerializationError):
+        decode_binary(encode_binary(FORMATS[0]) + b"\x00")
+    with pytest.raises(SerializationError):
+        decode_binary(MSGPACK_FORMAT + b"\x00")
+
+
+@pytest.mark.usefixtures("binary_impl")
+def test_truncated_msgpack_raises_serialization_error():
+    for end in range(0, len(MSGPACK_PROGRESS)):
+        with pytest.raises(SerializationError):
+            decode_binary(MSGPACK_PROGRESS[:end])
+
+
+@pytest.mark.usefixtures("binary_impl")
+def test_corrupt_binary_raises_serialization_error():
+    data = bytearray(encode_binary(INFO))
+    for i in range(4, len(data), 5):
+        corrupt = bytearray(data)
+        corrupt[i] ^= 0xFF
+        try:
+            decode_binary(bytes(corrupt))
+        except SerializationError:
+            pass
@@ -0,0 +1,147 @@
+"""DiskSpaceLedger reservations and estimate_peak_bytes."""
+
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from ytdlp_core.application.disk_space import (
+    ESTIMATE_SLACK,
+    MP3_KBPS,
+    DiskSpaceLedger,
+    estimate_peak_bytes,
+)
+from ytdlp_core.core.models import MediaType, VideoFormat, VideoInfo
+from ytdlp_core.domain.exceptions import InsufficientSpaceError
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def ledger():
+    return DiskSpaceLedger(headroom=10 * MB)
+
+
+@pytest.fixture
+def info():
+    return VideoInfo(
+        id="abc",
+        title="t",
+        duration=100,
+        formats=[
+            VideoFormat("140", "m4a", vcodec="none", acodec="mp4a.40.2", audio_bitrate=128, filesize=3 * MB),
+            VideoFormat("137", "mp4", "1920x1080", 30, "avc1.640028", "none", filesize=60 * MB),
+            VideoFormat("22", "mp4", "1280x720", 30, "avc1.64001F", "mp4a.40.2"),  # size unknown
+        ],
+    )
+
+
+def test_reserve_within_free_space(ledger, tmp_path):
+    reservation = ledger.reserve(tmp_path, 50 * MB, free=100 * MB)
+    assert reservation.size == 50 * MB
+    assert ledger.outstanding(tmp_path) == 50 * MB
+
+
+def test_reserve_keeps_headroom_free(ledger, tmp_path):
+    with pytest.raises(InsufficientSpaceError) as excinfo:
+        ledger.reserve(tmp_path, 95 * MB, free=100 * MB)
+    assert excinfo.value.required == 105 * MB
+    assert excinfo.value.available == 100 * MB
+    assert ledger.outstanding(tmp_path) == 0
+
+
+def test_running_reservations_count_against_new_jobs(ledger, tmp_path):
+    ledger.reserve(tmp_path, 60 * MB, free=200 * MB)
+    # The first job has written nothing yet, so the OS still reports 200 MB free
+    with pytest.raises(InsufficientSpaceError) as excinfo:
+        ledger.reserve(tmp_path, 140 * MB, free=200 * MB)
+    assert excinfo.value.required == 210 * MB
+    ledger.reserve(tmp_path, 130 * MB, free=200 * MB)
+
+
+def test_written_bytes_stop_being_held(ledger, tmp_path):
+    reservation = ledger.reserve(tmp_path, 60 * MB, free=200 * MB)
+    reservation.written("video.f137.mp4", 40 * MB)
+    reservation.written("video.f140.m4a", 5 * MB)
+    assert reservation.outstanding == 15 * MB
+    assert ledger.outstanding(tmp_path) == 15 * MB
+    # Progress for the same stream replaces, not adds to, what it reported
+    reservation.written("video.f137.mp4", 50 * MB)
+    assert ledger.outstanding(tmp_path) == 5 * MB
+    reservation.written(None, 100 * MB)
+    assert reservation.outstanding == 0
+
+
+def test_release_frees_the_volume(ledger, tmp_path):
+    reservation = ledger.reserve(tmp_path, 60 * MB, free=100 * MB)
+    with pytest.raises(InsufficientSpaceError):
+        ledger.reserve(tmp_path, 60 * MB, free=100 * MB)
+    reservation.release()
+    reservation.release()  # idempotent
+    assert ledger.outstanding(tmp_path) == 0
+    ledger.reserve(tmp_path, 60 * MB, free=100 * MB)
+
+
+def test_context_manager_releases_on_error(ledger, tmp_path):
+    with pytest.raises(RuntimeError):
+        with ledger.reserve(tmp_path, 60 * MB, free=100 * MB):
+            assert ledger.outstanding(tmp_path) == 60 * MB
+            raise RuntimeError("download failed")
+    assert ledger.outstanding(tmp_path) == 0
+
+
+def test_unknown_free_space_is_still_counted(ledger, tmp_path):
+    ledger.reserve(tmp_path, 80 * MB, free=None)
+    assert ledger.outstanding(tmp_path) == 80 * MB
+    with pytest.raises(InsufficientSpaceError):
+        ledger.reserve(tmp_path, 20 * MB, free=100 * MB)
+
+
+def test_concurrent_reservations_never_overcommit(ledger, tmp_path):
+    admitted = []
+    barrier = threading.Barrier(8)
+
+    def reserve():
+        barrier.wait()
+        try:
+            admitted.append(ledger.reserve(tmp_path, 30 * MB, free=100 * MB))
+        except InsufficientSpaceError:
+            pass
+
+    threads = [threading.Thread(target=reserve) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # (100 - 10 headroom) / 30
+    assert len(admitted) == 3
+
+
+def test_shared_ledger_is_a_singleton():
+    assert DiskSpaceLedger.shared() is DiskSpaceLedger.shared()
+
+
+def test_estimate_merge_holds_components_and_output(info):
+    peak = estimate_peak_bytes(info, "137+140", MediaType.VIDEO)
+    assert peak == int(2 * 63 * MB * ESTIMATE_SLACK)
+
+
+def test_estimate_without_ffmpeg_is_just_the_download(info):
+    peak = estimate_peak_bytes(info, "137+140", MediaType.VIDEO, ffmpeg=False)
+    assert peak == int(63 * MB * ESTIMATE_SLACK)
+
+
+def test_estimate_mp3_adds_the_transcode(info):
+    peak = estimate_peak_bytes(info, "140", MediaType.AUDIO_ONLY, audio_format="mp3")
+    assert peak == int((3 * MB + MP3_KBPS * 1000 // 8 * 100) * ESTIMATE_SLACK)
+
+
+def test_estimate_audio_best_is_not_converted(info):
+    peak = estimate_peak_bytes(info, "140", MediaType.AUDIO_ONLY, audio_format="best")
+    assert peak == int(3 * MB * ESTIMATE_SLACK)
+
+
+def test_estimate_unknown_size(info):
+    assert estimate_peak_bytes(info, "22", MediaType.VIDEO) is None
+    assert estimate_peak_bytes(info, "999", MediaType.VIDEO) is None
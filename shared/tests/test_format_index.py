@@ -0,0 +1,116 @@
+"""FormatIndex estimates and the FormatFallbackPlanner ladder."""
+
+from __future__ import annotations
+
+import pytest
+
+from ytdlp_core.core.format_index import FormatFallbackPlanner, FormatIndex, FormatRung, height_cap
+from ytdlp_core.core.models import VideoFormat
+
+MB = 1024 * 1024
+
+# yt-dlp order: worst to best
+FORMATS = [
+    VideoFormat("139", "m4a", vcodec="none", acodec="mp4a.40.5", audio_bitrate=48, filesize=1 * MB),
+    VideoFormat("140", "m4a", vcodec="none", acodec="mp4a.40.2", audio_bitrate=128, filesize=3 * MB),
+    VideoFormat("251", "webm", vcodec="none", acodec="opus", audio_bitrate=160, filesize=4 * MB),
+    VideoFormat("18", "mp4", "640x360", 30, "avc1.42001E", "mp4a.40.2", filesize=10 * MB),
+    VideoFormat("134", "mp4", "640x360", 30, "avc1.4d401e", "none", filesize=8 * MB),
+    VideoFormat("136", "mp4", "1280x720", 30, "avc1.4d401f", "none", filesize=30 * MB),
+    VideoFormat("247", "webm", "1280x720", 30, "vp9", "none", filesize=25 * MB),
+    VideoFormat("137", "mp4", "1920x1080", 30, "avc1.640028", "none", filesize=60 * MB),
+    VideoFormat("248", "webm", "1920x1080", 30, "vp9", "none", filesize=50 * MB),
+    VideoFormat("313", "webm", "3840x2160", 30, "vp9", "none", filesize=400 * MB),
+]
+
+
+@pytest.fixture
+def index():
+    return FormatIndex(FORMATS)
+
+
+def _heights(index, ladder):
+    heights = []
+    for rung in ladder:
+        for fid in rung.format_ids:
+            fmt = index.get(fid)
+            if fmt.is_video:
+                heights.append(int(fmt.resolution.split("x")[1]))
+    return heights
+
+
+@pytest.mark.parametrize("spec, cap", [
+    ("bestvideo[height<=720]+bestaudio/best", 720),
+    ("bv[height<?1080][ext=mp4]+ba", 1079),
+    ("best[res<=480]", 480),
+    ("bestvideo[height<=1080][height<=720]", 720),
+    ("bestvideo+bestaudio/best[height<=720]", None),
+    ("bestvideo[height>=720]", None),
+])
+def test_height_cap(spec, cap):
+    assert height_cap(spec) == cap
+
+
+def test_estimate_size(index):
+    assert index.estimate_size("137+140") == 63 * MB
+    assert index.estimate_size("bestvideo+bestaudio") == 404 * MB
+    assert index.estimate_size("bestvideo[height<=720]+bestaudio/best") == 34 * MB
+    assert index.estimate_size("best") == 10 * MB
+    assert index.estimate_size("worstvideo") is None
+
+
+def test_expected_height(index):
+    assert index.expected_height("bestvideo+bestaudio") == 2160
+    assert index.expected_height("bestvideo[height<=1080]+bestaudio") == 1080
+    assert index.expected_height("136+140") == 720
+    assert index.expected_height("bestaudio") is None
+
+
+def test_plan_explicit_pick_steps_down_pinning_audio(index):
+    ladder = FormatFallbackPlanner().plan(index, "137+140")
+
+    assert ladder[0] == FormatRung("137+140", ("137", "140"))
+    assert [r.spec for r in ladder[1:-1]] == ["248+140", "136+140", "247+140"]
+    assert ladder[-1] == FormatRung("best[height<=?1080]")
+
+
+@pytest.mark.parametrize("requested, cap", [
+    ("bestvideo[height<=720]+bestaudio/best", 720),
+    ("bv*[height<=1080]+ba/b", 1080),
+    ("bestvideo[res<=480]+bestaudio", 480),
+])
+def test_plan_never_goes_above_a_filtered_cap(index, requested, cap):
+    ladder = FormatFallbackPlanner(max_rungs=8).plan(index, requested)
+
+    assert ladder[0] == FormatRung(requested)
+    heights = _heights(index, ladder)
+    assert heights and max(heights) <= cap
+    assert ladder[-1].spec == f"best[height<=?{cap}]"
+
+
+def test_plan_expression_without_filter_uses_expected_pick(index):
+    ladder = FormatFallbackPlanner().plan(index, "bestvideo+bestaudio")
+
+    assert ladder[1].spec == "313+251"
+    assert ladder[-1].spec == "best[height<=?2160]"
+
+
+def test_plan_skips_failed_and_prefers_completed_audio(index):
+    planner = FormatFallbackPlanner()
+    ladder = planner.plan(index, "137+140", completed={"251"}, failed={"137", "140"})
+
+    assert ladder[0] == FormatRung("248+251", ("248", "251"))
+    assert not {"137", "140"} & {fid for rung in ladder for fid in rung.format_ids}
+    assert max(_heights(index, ladder)) == 1080
+
+
+def test_plan_without_ffmpeg_uses_combined_formats(index):
+    ladder = FormatFallbackPlanner(merge_audio=False).plan(index, "bestvideo[height<=720]+bestaudio/best")
+
+    assert [r.spec for r in ladder[1:-1]] == ["18"]
+
+
+def test_plan_audio_only_keeps_container(index):
+    ladder = FormatFallbackPlanner().plan(index, "140", audio_only=True)
+
+    assert [r.spec for r in ladder] == ["140", "139", "251", "bestaudio/best"]
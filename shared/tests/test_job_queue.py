@@ -0,0 +1,247 @@
+"""JobQueue cancellation, retries and host throttling."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from ytdlp_core.application.job_queue import DownloadJob, JobQueue
+from ytdlp_core.application.retry import HostCircuitBreaker, RetryPolicy
+from ytdlp_core.application.use_cases import DownloadVideoUseCase
+from ytdlp_core.core.models import DownloadOptions, DownloadResult, DownloadStatus, MediaType
+from ytdlp_core.domain.exceptions import CancellationError, DownloadError
+from ytdlp_core.infrastructure.platform import MemoryConfigStore
+
+FAST_RETRY = RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.01)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+class ScriptedUseCase:
+    """Stands in for DownloadVideoUseCase: outcomes are popped from a shared script per URL."""
+
+    def __init__(self, script, calls):
+        self.script = script
+        self.calls = calls
+
+    def execute(self, url, format_id, media_type, cancel_event=None, **kwargs):
+        self.calls.append(url)
+        outcome = self.script[url].pop(0) if self.script.get(url) else None
+        if callable(outcome):
+            outcome = outcome(cancel_event)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return DownloadResult(success=True, format_used=format_id)
+
+    def cancel(self):
+        pass
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+def make_queue(script, events, calls=None, **kwargs):
+    calls = [] if calls is None else calls
+    kwargs.setdefault("retry", FAST_RETRY)
+    queue = JobQueue(lambda: ScriptedUseCase(script, calls), **kwargs)
+    queue.subscribe(lambda event, job: events.append((event, job["id"])))
+    return queue
+
+
+def test_transient_error_is_retried(events):
+    url = "https://www.youtube.com/watch?v=aaaaaaaaaaa"
+    queue = make_queue({url: [DownloadError("HTTP Error 503: Service Unavailable")]}, events)
+    queue.start()
+    job = queue.submit(DownloadJob(url))
+
+    wait_for(lambda: job.done)
+    queue.close()
+
+    assert job.status == DownloadStatus.COMPLETED
+    assert job.attempts == 2
+    assert ("retrying", job.id) in events
+
+
+def test_permanent_error_fails_at_once(events):
+    url = "https://www.youtube.com/watch?v=bbbbbbbbbbb"
+    queue = make_queue({url: [DownloadError("Private video")]}, events)
+    queue.start()
+    job = queue.submit(DownloadJob(url))
+
+    wait_for(lambda: job.done)
+    queue.close()
+
+    assert job.status == DownloadStatus.FAILED
+    assert job.attempts == 1
+    assert "Private video" in job.error
+
+
+def test_retries_stop_at_max_attempts(events):
+    url = "https://www.youtube.com/watch?v=ccccccccccc"
+    queue = make_queue({url: [DownloadError("Connection reset by peer")] * 5}, events)
+    queue.start()
+    job = queue.submit(DownloadJob(url))
+
+    wait_for(lambda: job.done)
+    queue.close()
+
+    assert job.status == DownloadStatus.FAILED
+    assert job.attempts == FAST_RETRY.max_attempts
+
+
+def test_throttling_pauses_the_host_and_halves_concurrency(events):
+    url = "https://www.youtube.com/watch?v=ddddddddddd"
+    breaker = HostCircuitBreaker(cooldown=0.1)
+    queue = make_queue({url: [DownloadError("HTTP Error 429: Too Many Requests")]}, events, workers=4, breaker=breaker)
+    queue.start()
+    job = queue.submit(DownloadJob(url))
+
+    wait_for(lambda: job.status == DownloadStatus.PENDING and job.attempts == 1)
+    assert queue.limiter.limit == 2
+    assert breaker.remaining("youtube.com") > 0
+    wait_for(lambda: job.done)
+    queue.close()
+
+    assert job.status == DownloadStatus.COMPLETED
+    assert job.attempts == 2
+
+
+def test_cancel_queued_job(events):
+    gate = threading.Event()
+    first, second = "https://example.com/1", "https://example.com/2"
+    queue = make_queue({first: [lambda _cancel: gate.wait(5) and None]}, events, workers=1)
+    queue.start()
+    running = queue.submit(DownloadJob(first))
+    wait_for(lambda: running.status == DownloadStatus.DOWNLOADING)
+    queued = queue.submit(DownloadJob(second))
+
+    assert queue.cancel(queued.id)
+    gate.set()
+    wait_for(lambda: running.done)
+    queue.close()
+
+    assert queued.status == DownloadStatus.CANCELLED
+    assert running.status == DownloadStatus.COMPLETED
+    assert not queue.cancel(running.id)
+
+
+def test_cancel_waiting_retry(events):
+    url = "https://example.com/retry"
+    queue = make_queue({url: [DownloadError("timed out")]}, events, retry=RetryPolicy(base_delay=30, max_delay=30))
+    queue.start()
+    job = queue.submit(DownloadJob(url))
+    wait_for(lambda: ("retrying", job.id) in events)
+
+    assert queue.cancel(job.id)
+    queue.close()
+
+    assert job.status == DownloadStatus.CANCELLED
+    assert job.attempts == 1
+
+
+def test_cancel_and_close_notify_outside_the_lock(events):
+    """A listener may call back into the queue from another thread (SSE, Android bridge)."""
+    first = "https://example.com/1"
+    queue = make_queue({first: [lambda cancel: cancel.wait(5) and None]}, events, workers=1)
+    seen = []
+
+    def listener(event, job):
+        if event == "cancelled":
+            thread = threading.Thread(target=lambda: seen.append((job["id"], len(queue.jobs()))), daemon=True)
+            thread.start()
+            thread.join(timeout=2)
+
+    queue.subscribe(listener)
+    queue.start()
+    running = queue.submit(DownloadJob(first))
+    wait_for(lambda: running.status == DownloadStatus.DOWNLOADING)
+    cancelled = queue.submit(DownloadJob("https://example.com/2"))
+    closed = queue.submit(DownloadJob("https://example.com/3"))
+
+    assert queue.cancel(cancelled.id)
+    assert seen == [(cancelled.id, 3)]
+    queue.close()
+
+    assert (closed.id, 3) in seen
+    assert closed.status == DownloadStatus.CANCELLED
+
+
+def test_cancel_running_job_reaches_the_download(events):
+    url = "https://example.com/slow"
+
+    def slow(cancel_event):
+        if cancel_event.wait(5):
+            return CancellationError("Download cancelled by user")
+        return None
+
+    queue = make_queue({url: [slow]}, events)
+    queue.start()
+    job = queue.submit(DownloadJob(url))
+    wait_for(lambda: job.status == DownloadStatus.DOWNLOADING)
+
+    assert queue.cancel(job.id)
+    wait_for(lambda: job.done)
+    queue.close()
+
+    assert job.status == DownloadStatus.CANCELLED
+
+
+class RecordingDownloader:
+    def __init__(self):
+        self.calls = []
+
+    def download(self, options: DownloadOptions, progress_callback=None, cancel_event=None):
+        self.calls.append(options.url)
+        if cancel_event is not None and cancel_event.is_set():
+            raise CancellationError("Download cancelled by user")
+        return DownloadResult(success=True)
+
+    def cancel(self):
+        pass
+
+
+class NoFFmpeg:
+    def find_ffmpeg(self):
+        return None
+
+
+def test_cancel_between_start_and_download_is_not_lost(tmp_path, events):
+    """A cancel landing while the worker prepares the job (profile, disk space) still wins."""
+    downloader = RecordingDownloader()
+    config = MemoryConfigStore()
+
+    def factory():
+        return DownloadVideoUseCase(downloader=downloader, ffmpeg_locator=NoFFmpeg(), config=config, platform=None)
+
+    queue = JobQueue(factory, retry=FAST_RETRY)
+    # "started" is emitted on the worker after the job is registered, before it runs
+    queue.subscribe(lambda event, data: event == "started" and queue.cancel(data["id"]))
+    queue.start()
+    job = queue.submit(DownloadJob("https://example.com/v", media_type=MediaType.VIDEO, output_dir=tmp_path))
+
+    wait_for(lambda: job.done)
+    queue.close()
+
+    assert job.status == DownloadStatus.CANCELLED
+    assert job.attempts == 1
+    assert downloader.calls == []
+
+
+def test_downloader_honours_a_cancel_made_before_the_call(tmp_path):
+    from ytdlp_core.infrastructure.downloader import YtDlpDownloader
+
+    cancel = threading.Event()
+    cancel.set()
+    options = DownloadOptions(url="https://example.com/v", output_path=tmp_path, format_id="best")
+
+    with pytest.raises(CancellationError):
+        YtDlpDownloader().download(options, cancel_event=cancel)
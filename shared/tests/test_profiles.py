@@ -0,0 +1,158 @@
+"""Config store notifications and the profile cache under concurrent use."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from ytdlp_core.application.profiles import DownloadProfileProvider
+from ytdlp_core.infrastructure.platform import JsonConfigStore, MemoryConfigStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JsonConfigStore(tmp_path / "config.json", flush_delay=0)
+    yield store
+    store.flush()
+
+
+def _from_other_thread(func):
+    """Run `func` in another thread; None if it did not finish (e.g. blocked on a lock)."""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()), daemon=True)
+    thread.start()
+    thread.join(timeout=2)
+    return result[0] if result else None
+
+
+def test_listeners_run_after_the_lock_is_released(store):
+    seen = []
+    store.subscribe(lambda key, value: seen.append(_from_other_thread(lambda: store.get(key))))
+
+    store.set("rate_limit", "1M")
+
+    assert seen == ["1M"]
+
+
+def test_batch_notifies_once_at_the_end(store):
+    seen = []
+    store.subscribe(lambda key, value: seen.append((key, value)))
+
+    with store.batch():
+        store.set("retries", 5)
+        store.set("timeout", 10)
+        assert seen == []
+
+    assert sorted(seen) == [("retries", 5), ("timeout", 10)]
+    assert JsonConfigStore(store.config_path).get("retries") == 5
+
+
+def test_batch_does_not_block_other_threads(store):
+    store.set("retries", 1)
+
+    with store.batch():
+        store.set("retries", 5)
+        assert store.get("retries") == 5
+        assert store.get_all()["retries"] == 5
+        # Others see the committed value and can still write
+        assert _from_other_thread(lambda: store.get("retries")) == 1
+        assert _from_other_thread(lambda: store.set("timeout", 30) or "written") == "written"
+        assert store.get("timeout") == 30
+
+    assert store.get("retries") == 5
+    assert JsonConfigStore(store.config_path).get_all() == {"retries": 5, "timeout": 30}
+
+
+def test_failed_batch_rolls_back_without_notifying(store):
+    seen = []
+    store.set("retries", 1)
+    store.subscribe(lambda key, value: seen.append(key))
+
+    with pytest.raises(RuntimeError), store.batch():
+        store.set("retries", 7)
+        raise RuntimeError
+
+    assert store.get("retries") == 1
+    assert seen == []
+
+
+def test_debounced_burst_uses_one_flusher(tmp_path):
+    store = JsonConfigStore(tmp_path / "config.json", flush_delay=0.1)
+    seen_flushers = set()
+    for i in range(200):
+        store.set("volume", i)
+        seen_flushers.update(t.ident for t in threading.enumerate() if t.name == "config-flush")
+    assert len(seen_flushers) == 1
+    assert not store.config_path.exists()
+
+    deadline = time.monotonic() + 5
+    while any(t.name == "config-flush" for t in threading.enumerate()):
+        assert time.monotonic() < deadline, "never flushed"
+        time.sleep(0.01)
+    assert JsonConfigStore(store.config_path).get("volume") == 199
+
+
+def test_unsubscribe(store):
+    seen = []
+    unsubscribe = store.subscribe(lambda key, value: seen.append(key))
+    unsubscribe()
+    unsubscribe()
+
+    store.set("retries", 2)
+
+    assert seen == []
+
+
+@pytest.mark.parametrize("make_store", [
+    lambda tmp_path: JsonConfigStore(tmp_path / "config.json", flush_delay=0),
+    lambda tmp_path: MemoryConfigStore(),
+])
+def test_provider_follows_config_changes(tmp_path, make_store):
+    store = make_store(tmp_path)
+    provider = DownloadProfileProvider(store)
+    assert provider.get().retries == 3
+
+    store.set("retries", 9)
+    assert provider.get().retries == 9
+
+    store.set("profiles", {"slow": {"rate_limit": "500K"}})
+    assert provider.get("slow").rate_limit == 500 * 1024
+    assert provider.names() == ["default", "slow"]
+    provider.close()
+
+
+def test_provider_and_store_do_not_deadlock(store):
+    provider = DownloadProfileProvider(store)
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        while not stop.is_set():
+            try:
+                provider.get()
+                time.sleep(0.0001)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+    def write():
+        for i in range(300):
+            store.set("retries", i % 7)
+            with store.batch():
+                store.set("timeout", 10 + i % 5)
+
+    readers = [threading.Thread(target=read, daemon=True) for _ in range(4)]
+    writer = threading.Thread(target=write, daemon=True)
+    for thread in readers + [writer]:
+        thread.start()
+    writer.join(timeout=20)
+    stop.set()
+    for thread in readers:
+        thread.join(timeout=5)
+
+    assert not writer.is_alive() and not any(t.is_alive() for t in readers), "deadlocked"
+    assert errors == []
+    # Nothing stale may stay cached once the writes settle
+    assert provider.get().retries == store.get("retries")
+    assert provider.get().timeout == store.get("timeout")
@@ -0,0 +1,215 @@
+"""ProxyPool selection, stickiness, ejection and health checks."""
+
+from __future__ import annotations
+
+import http.server
+import threading
+import time
+
+import pytest
+
+from ytdlp_core.domain.exceptions import ConfigurationError, DownloadError
+from ytdlp_core.infrastructure.proxy_pool import ProxyEndpoint, ProxyPool, video_key
+
+A, B, C = "http://a:8080", "http://b:8080", "http://c:8080"
+
+
+def fail(pool, error, key=None):
+    with pytest.raises(type(error)):
+        with pool.lease(key):
+            raise error
+
+
+def by_url(pool):
+    return {entry["url"]: entry for entry in pool.snapshot()}
+
+
+def test_blocked_proxy_is_ejected_at_once():
+    pool = ProxyPool([A, B], max_failures=3, eject_for=60)
+    with pool.lease() as url:
+        assert url == A
+    fail(pool, DownloadError("ERROR: unable to download webpage: HTTP Error 429: Too Many Requests"), "x")
+    state = by_url(pool)
+    # The lease for "x" went to B (A had one more lease); only B is out
+    assert not state[B]["healthy"]
+    assert 55 < state[B]["ejected_for"] <= 60
+    assert state[A]["healthy"]
+    for _ in range(5):
+        with pool.lease() as url:
+            assert url == A
+
+
+def test_connection_failures_eject_after_max_failures():
+    pool = ProxyPool([A], max_failures=3)
+    for _ in range(2):
+        fail(pool, DownloadError("Unable to download: [Errno 111] Connection refused"))
+    assert by_url(pool)[A]["failures"] == 2
+    assert by_url(pool)[A]["healthy"]
+    fail(pool, DownloadError("Unable to download: [Errno 111] Connection refused"))
+    assert not by_url(pool)[A]["healthy"]
+    assert by_url(pool)[A]["failures"] == 0
+
+
+def test_success_resets_the_failure_count():
+    pool = ProxyPool([A], max_failures=2)
+    fail(pool, DownloadError("Read timed out"))
+    with pool.lease():
+        pass
+    fail(pool, DownloadError("Read timed out"))
+    assert by_url(pool)[A]["healthy"]
+
+
+def test_unrelated_errors_say_nothing_about_the_proxy():
+    pool = ProxyPool([A], max_failures=1)
+    fail(pool, DownloadError("ERROR: Private video"))
+    state = by_url(pool)[A]
+    assert state["healthy"]
+    assert state["failures"] == 0
+    assert state["active"] == 0
+
+
+def test_original_error_text_is_considered():
+    pool = ProxyPool([A, B])
+    error = DownloadError("Download failed", original=RuntimeError("Sign in to confirm you're not a bot"))
+    fail(pool, error)
+    assert not by_url(pool)[A]["healthy"]
+
+
+def test_ejection_backs_off_and_is_capped():
+    pool = ProxyPool([A, B], eject_for=10, max_eject_for=25)
+    endpoint = pool.endpoints[0]
+    durations = []
+    for _ in range(3):
+        with pool._lock:
+            pool._eject(endpoint, "test")
+        durations.append(endpoint.ejected_until - time.monotonic())
+        endpoint.ejected_until = 0.0  # its time ran out, still failing
+    assert durations == [pytest.approx(d, abs=0.5) for d in (10, 20, 25)]
+    # A success once readmitted ends the streak
+    with pool.lease():
+        pass
+    assert endpoint.ejections == 0
+
+
+def test_all_ejected_falls_back_to_the_soonest_readmitted():
+    pool = ProxyPool([A, B], eject_for=60)
+    fail(pool, DownloadError("HTTP Error 429"), "k")
+    pool.eject_for = 30
+    fail(pool, DownloadError("HTTP Error 429"), "j")
+    with pool.lease() as url:
+        assert url == B
+
+
+def test_sticky_key_keeps_its_proxy():
+    pool = ProxyPool([A, B, C])
+    key = video_key("https://youtu.be/dQw4w9WgXcQ")
+    with pool.lease(key) as first:
+        pass
+    for _ in range(3):
+        with pool.lease():
+            pass
+    with pool.lease(video_key("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=1")) as again:
+        assert again == first
+
+
+def test_sticky_key_moves_when_its_proxy_is_ejected():
+    pool = ProxyPool([A, B])
+    with pool.lease("k") as first:
+        pass
+    fail(pool, DownloadError("HTTP Error 429"), "k")
+    with pool.lease("k") as moved:
+        assert moved != first
+    with pool.lease("k") as again:
+        assert again == moved
+
+
+def test_sticky_table_is_bounded():
+    pool = ProxyPool([A, B], max_sticky=2)
+    for key in "xyz":
+        with pool.lease(key):
+            pass
+    assert list(pool._sticky) == ["y", "z"]
+
+
+def test_least_loaded_prefers_fewest_active_per_weight():
+    pool = ProxyPool([ProxyEndpoint(A, weight=2), ProxyEndpoint(B)])
+    with pool.lease() as first, pool.lease() as second, pool.lease() as third:
+        assert (first, second, third) == (A, B, A)
+
+
+def test_round_robin_is_weighted_and_interleaved():
+    pool = ProxyPool.from_config(
+        [{"url": A, "weight": 3}, {"url": B, "weight": 1}], strategy="round_robin"
+    )
+    picks = ""
+    for _ in range(8):
+        with pool.lease() as url:
+            picks += "a" if url == A else "b"
+    assert picks == "aabaaaba"
+
+
+def test_from_config_forms():
+    pool = ProxyPool.from_config(f"{A}, {B},", max_failures=5)
+    assert [e.url for e in pool.endpoints] == [A, B]
+    assert pool.max_failures == 5
+    assert ProxyPool.from_config(None) is None
+    assert ProxyPool.from_config(" , ") is None
+    with pytest.raises(ConfigurationError):
+        ProxyPool.from_config([{"weight": 2}])
+    with pytest.raises(ConfigurationError):
+        ProxyPool([A], strategy="random")
+    with pytest.raises(ConfigurationError):
+        ProxyPool([])
+
+
+class _ProxyHandler(http.server.BaseHTTPRequestHandler):
+    status = 204
+
+    def do_GET(self):
+        self.send_response(self.status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_proxy():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _ProxyHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    _ProxyHandler.status = 204
+
+
+def test_health_check_readmits_a_working_proxy(local_proxy):
+    pool = ProxyPool([local_proxy], health_url="http://example.invalid/generate_204", timeout=2)
+    fail(pool, DownloadError("HTTP Error 429"))
+    endpoint = pool.endpoints[0]
+    assert not by_url(pool)[local_proxy]["healthy"]
+    assert pool.check(endpoint)
+    assert by_url(pool)[local_proxy]["healthy"]
+    assert endpoint.rtt is not None
+
+
+def test_health_check_ejects_a_refusing_proxy(local_proxy):
+    _ProxyHandler.status = 429
+    pool = ProxyPool([local_proxy], health_url="http://example.invalid/generate_204", timeout=2, max_failures=2)
+    assert not pool.check(pool.endpoints[0])
+    assert by_url(pool)[local_proxy]["healthy"]
+    assert not pool.check(pool.endpoints[0])
+    assert not by_url(pool)[local_proxy]["healthy"]
+
+
+def test_health_check_counts_unreachable_proxies():
+    pool = ProxyPool(["http://127.0.0.1:9"], health_url="http://example.invalid/", timeout=1, max_failures=1)
+    assert not pool.check(pool.endpoints[0])
+    assert not by_url(pool)["http://127.0.0.1:9"]["healthy"]
+
+
+def test_socks_proxies_are_not_probed():
+    pool = ProxyPool(["socks5://127.0.0.1:9"])
+    assert pool.check(pool.endpoints[0])
@@ -0,0 +1,31 @@
+"""Retry classification of failed jobs."""
+
+from __future__ import annotations
+
+import pytest
+
+from ytdlp_core.application.retry import ErrorKind, classify_error
+from ytdlp_core.domain.exceptions import CancellationError, DownloadError
+
+
+@pytest.mark.parametrize("message, kind", [
+    ("Got error: The read operation timed out. Retrying (1/10)...", ErrorKind.TRANSIENT),
+    ("Got error: HTTP Error 503: Service Unavailable", ErrorKind.TRANSIENT),
+    ("[Errno 104] Connection reset by peer", ErrorKind.TRANSIENT),
+    ("Got error: HTTP Error 403: Forbidden", ErrorKind.PERMANENT),
+    ("Got error: HTTP Error 404: Not Found", ErrorKind.PERMANENT),
+    ("Got error: HTTP Error 410: Gone", ErrorKind.PERMANENT),
+    ("ERROR: [youtube] abc: Private video", ErrorKind.PERMANENT),
+    ("HTTP Error 429: Too Many Requests", ErrorKind.THROTTLED),
+])
+def test_classify_error(message, kind):
+    assert classify_error(DownloadError(message)) is kind
+
+
+def test_original_error_is_considered():
+    error = DownloadError("Download failed", original=OSError("Network is unreachable"))
+    assert classify_error(error) is ErrorKind.TRANSIENT
+
+
+def test_cancellation_is_never_retried():
+    assert classify_error(CancellationError("Connection reset while cancelling")) is ErrorKind.PERMANENT
@@ -1,67 +1,123 @@
-"""ytdlp-core: Shared core library for YouTube downloading."""
+"""ytdlp-core: Shared core library for YouTube downloading.
 
-from ytdlp_core.core.models import (
-    DownloadOptions,
-    DownloadProgress,
-    DownloadResult,
-    DownloadStatus,
-    MediaType,
-    VideoFormat,
-    VideoInfo,
-)
-from ytdlp_core.domain.exceptions import (
-    CancellationError,
-    ConfigurationError,
-    DomainError,
-    DownloadError,
-    ExtractionError,
-    FFmpegNotFoundError,
-    ValidationError,
-)
-from ytdlp_core.domain.ports import (
-    ICacheStore,
-    IConfigStore,
-    IDownloader,
-    IFFmpegLocator,
-    IPlatformService,
-    IVideoInfoExtractor,
-)
-from ytdlp_core.application.use_cases import (
-    DownloadVideoUseCase,
-    GetDefaultOptionsUseCase,
-    GetVideoInfoUseCase,
-    SaveDefaultOptionsUseCase,
-)
+Exports are resolved lazily (PEP 562) so importing the package does not pull
+in every layer, and yt-dlp is only imported on first extraction/download.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ytdlp_core.application.disk_space import DiskSpaceLedger
+    from ytdlp_core.application.job_queue import DownloadJob, JobQueue
+    from ytdlp_core.application.profiles import DownloadProfileProvider
+    from ytdlp_core.application.retry import HostCircuitBreaker, RetryPolicy
+    from ytdlp_core.application.use_cases import (
+        DownloadVideoUseCase,
+        GetDefaultOptionsUseCase,
+        GetVideoInfoUseCase,
+        SaveDefaultOptionsUseCase,
+        WarmUpEngineUseCase,
+    )
+    from ytdlp_core.core.format_index import FormatFallbackPlanner, FormatIndex, FormatRung, FormatSelector
+    from ytdlp_core.core.models import (
+        DownloadOptions,
+        DownloadProfile,
+        DownloadProgress,
+        DownloadResult,
+        DownloadStatus,
+        MediaType,
+        VideoFormat,
+        VideoInfo,
+    )
+    from ytdlp_core.domain.exceptions import (
+        CancellationError,
+        ConfigurationError,
+        DomainError,
+        DownloadError,
+        ExtractionError,
+        FFmpegNotFoundError,
+        InsufficientSpaceError,
+        SerializationError,
+        ValidationError,
+    )
+    from ytdlp_core.domain.ports import (
+        ICacheStore,
+        IConfigStore,
+        IDownloader,
+        IFFmpegLocator,
+        IFFmpegService,
+        IMetricsSink,
+        IPlatformService,
+        IThumbnailStore,
+        IVideoInfoExtractor,
+        NullMetricsSink,
+    )
 
 __version__ = "1.0.0"
 
-__all__ = [
+_EXPORTS = {
     # Core models
-    "VideoInfo",
-    "VideoFormat",
-    "DownloadOptions",
-    "DownloadProgress",
-    "DownloadResult",
-    "DownloadStatus",
-    "MediaType",
+    "VideoInfo": "ytdlp_core.core.models",
+    "VideoFormat": "ytdlp_core.core.models",
+    "DownloadOptions": "ytdlp_core.core.models",
+    "DownloadProfile": "ytdlp_core.core.models",
+    "DownloadProgress": "ytdlp_core.core.models",
+    "DownloadResult": "ytdlp_core.core.models",
+    "DownloadStatus": "ytdlp_core.core.models",
+    "MediaType": "ytdlp_core.core.models",
+    "FormatIndex": "ytdlp_core.core.format_index",
+    "FormatSelector": "ytdlp_core.core.format_index",
+    "FormatFallbackPlanner": "ytdlp_core.core.format_index",
+    "FormatRung": "ytdlp_core.core.format_index",
     # Exceptions
-    "DomainError",
-    "ValidationError",
-    "ExtractionError",
-    "DownloadError",
-    "FFmpegNotFoundError",
-    "CancellationError",
-    "ConfigurationError",
+    "DomainError": "ytdlp_core.domain.exceptions",
+    "ValidationError": "ytdlp_core.domain.exceptions",
+    "ExtractionError": "ytdlp_core.domain.exceptions",
+    "DownloadError": "ytdlp_core.domain.exceptions",
+    "FFmpegNotFoundError": "ytdlp_core.domain.exceptions",
+    "InsufficientSpaceError": "ytdlp_core.domain.exceptions",
+    "CancellationError": "ytdlp_core.domain.exceptions",
+    "ConfigurationError": "ytdlp_core.domain.exceptions",
+    "SerializationError": "ytdlp_core.domain.exceptions",
     # Ports
-    "IVideoInfoExtractor",
-    "IDownloader",
-    "IFFmpegLocator",
-    "IConfigStore",
-    "ICacheStore",
-    "IPlatformService",
+    "IVideoInfoExtractor": "ytdlp_core.domain.ports",
+    "IDownloader": "ytdlp_core.domain.ports",
+    "IFFmpegLocator": "ytdlp_core.domain.ports",
+    "IConfigStore": "ytdlp_core.domain.ports",
+    "ICacheStore": "ytdlp_core.domain.ports",
+    "IPlatformService": "ytdlp_core.domain.ports",
+    "IThumbnailStore": "ytdlp_core.domain.ports",
+    "IFFmpegService": "ytdlp_core.domain.ports",
+    "IMetricsSink": "ytdlp_core.domain.ports",
+    "NullMetricsSink": "ytdlp_core.domain.ports",
     # Use cases
-    "GetVideoInfoUseCase",
-    "DownloadVideoUseCase",
-    "GetDefaultOptionsUseCase",
-    "SaveDefaultOptionsUseCase",
-]
\ No newline at end of file
+    "GetVideoInfoUseCase": "ytdlp_core.application.use_cases",
+    "DownloadVideoUseCase": "ytdlp_core.application.use_cases",
+    "GetDefaultOptionsUseCase": "ytdlp_core.application.use_cases",
+    "SaveDefaultOptionsUseCase": "ytdlp_core.application.use_cases",
+    "WarmUpEngineUseCase": "ytdlp_core.application.use_cases",
+    "DownloadProfileProvider": "ytdlp_core.application.profiles",
+    "DownloadJob": "ytdlp_core.application.job_queue",
+    "JobQueue": "ytdlp_core.application.job_queue",
+    "DiskSpaceLedger": "ytdlp_core.application.disk_space",
+    "RetryPolicy": "ytdlp_core.application.retry",
+    "HostCircuitBreaker": "ytdlp_core.application.retry",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
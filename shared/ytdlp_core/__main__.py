@@ -0,0 +1,8 @@
+"""Entry point for ``python -m ytdlp_core``."""
+
+import sys
+
+from ytdlp_core.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,15 @@
 """Application layer - use cases."""
 
+from ytdlp_core.application.disk_space import DiskSpaceLedger
+from ytdlp_core.application.job_queue import DownloadJob, JobQueue
+from ytdlp_core.application.profiles import DownloadProfileProvider
+from ytdlp_core.application.retry import HostCircuitBreaker, RetryPolicy
 from ytdlp_core.application.use_cases import (
     DownloadVideoUseCase,
     GetDefaultOptionsUseCase,
     GetVideoInfoUseCase,
     SaveDefaultOptionsUseCase,
+    WarmUpEngineUseCase,
 )
 
 __all__ = [
@@ -12,4 +17,11 @@ __all__ = [
     "DownloadVideoUseCase",
     "GetDefaultOptionsUseCase",
     "SaveDefaultOptionsUseCase",
+    "DownloadProfileProvider",
+    "WarmUpEngineUseCase",
+    "DownloadJob",
+    "JobQueue",
+    "DiskSpaceLedger",
+    "RetryPolicy",
+    "HostCircuitBreaker",
 ]
\ No newline at end of file
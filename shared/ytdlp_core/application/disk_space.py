@@ -0,0 +1,148 @@
+"""Application layer - disk space estimates and reservations for downloads."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Optional
+
+from ytdlp_core.core.models import MediaType, VideoInfo
+from ytdlp_core.domain.exceptions import InsufficientSpaceError
+
+_MB = 1024 * 1024
+
+# Bitrate the mp3 transcode targets (see DownloadOptions.to_ydl_opts)
+MP3_KBPS = 192
+
+# Unmeasured extras: container overhead, thumbnail, subtitles, .part slack
+ESTIMATE_SLACK = 1.05
+
+
+def estimate_peak_bytes(
+    info: VideoInfo,
+    format_spec: str,
+    media_type: MediaType,
+    audio_format: str = "mp3",
+    ffmpeg: bool = True,
+) -> Optional[int]:
+    """Most disk space the job occupies at once, or None if sizes are unknown.
+
+    Post-processing keeps its inputs until the output is written: a merge
+    needs the components plus the merged file, a remux or transcode the
+    source plus the converted copy.
+    """
+    download = info.format_index.estimate_size(format_spec)
+    if download is None:
+        return None
+    peak = download
+    if ffmpeg:
+        if media_type == MediaType.AUDIO_ONLY and audio_format == "mp3":
+            peak += int(MP3_KBPS * 1000 / 8 * (info.duration or 0))
+        elif media_type == MediaType.AUDIO_ONLY and audio_format != "best":
+            peak += download
+        elif "+" in format_spec.split("/", 1)[0]:
+            peak += download
+    return int(peak * ESTIMATE_SLACK)
+
+
+class SpaceReservation:
+    """Bytes a job expects to write on a volume, held until `release`.
+
+    `written` reports transfer progress; what is already on disk shows up
+    in the volume's free space, so only the outstanding part stays held.
+    """
+
+    def __init__(self, ledger: Optional[DiskSpaceLedger], volume: int, size: int):
+        self._ledger = ledger
+        self.volume = volume
+        self.size = size
+        self._written: dict[str, int] = {}
+        self._written_total = 0  # read by other threads without the per-file dict
+
+    @property
+    def outstanding(self) -> int:
+        return max(0, self.size - self._written_total)
+
+    def written(self, filename: Optional[str], nbytes: int) -> None:
+        """`filename` (one download stream) now has `nbytes` on disk."""
+        self._written[filename or ""] = nbytes
+        self._written_total = sum(self._written.values())
+
+    def release(self) -> None:
+        ledger, self._ledger = self._ledger, None
+        if ledger is not None:
+            ledger._release(self)
+
+    def __enter__(self) -> SpaceReservation:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
+
+
+class DiskSpaceLedger:
+    """Space promised to running downloads, per volume.
+
+    Free space reported by the OS does not know about downloads that have
+    started but not yet written their bytes; a job is admitted only if the
+    free space minus what running jobs still expect to write covers its
+    estimate plus `headroom`. One ledger is shared by every use case in the
+    process (see `shared`).
+    """
+
+    _shared: Optional[DiskSpaceLedger] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, headroom: int = 100 * _MB):
+        self.headroom = headroom
+        self._reservations: dict[int, list[SpaceReservation]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls) -> DiskSpaceLedger:
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def volume_of(path: Path) -> int:
+        return os.stat(path).st_dev
+
+    def outstanding(self, path: Path) -> int:
+        """Bytes running jobs on `path`'s volume have yet to write."""
+        volume = self.volume_of(path)
+        with self._lock:
+            return sum(r.outstanding for r in self._reservations.get(volume, ()))
+
+    def reserve(self, path: Path, size: int, free: Optional[int]) -> SpaceReservation:
+        """Hold `size` bytes on `path`'s volume, given `free` bytes there now.
+
+        Raises InsufficientSpaceError if they don't fit. With `free` unknown
+        (None) the bytes are still counted against later jobs.
+        """
+        volume = self.volume_of(path)
+        with self._lock:
+            running = self._reservations.setdefault(volume, [])
+            held = sum(r.outstanding for r in running)
+            if free is not None and free - held < size + self.headroom:
+                raise InsufficientSpaceError(
+                    f"Not enough disk space in {path}: this download needs about "
+                    f"{size / _MB:.0f} MB (plus {self.headroom / _MB:.0f} MB kept free), "
+                    f"{free / _MB:.0f} MB are free and running downloads still need "
+                    f"{held / _MB:.0f} MB",
+                    required=size + held + self.headroom,
+                    available=free,
+                )
+            reservation = SpaceReservation(self, volume, size)
+            running.append(reservation)
+        return reservation
+
+    def _release(self, reservation: SpaceReservation) -> None:
+        with self._lock:
+            running = self._reservations.get(reservation.volume, [])
+            if reservation in running:
+                running.remove(reservation)
+            if not running:
+                self._reservations.pop(reservation.volume, None)
@@ -0,0 +1,410 @@
+"""Application layer - prioritized download job queue."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from ytdlp_core.application.retry import (
+    AimdLimiter,
+    ErrorKind,
+    HostCircuitBreaker,
+    RetryPolicy,
+    classify_error,
+    host_key,
+)
+from ytdlp_core.application.use_cases import DownloadVideoUseCase, GetVideoInfoUseCase, format_spec
+from ytdlp_core.core.models import DownloadProgress, DownloadStatus, MediaType
+from ytdlp_core.domain.exceptions import CancellationError, ValidationError, YtdlpCoreError
+
+logger = logging.getLogger(__name__)
+
+JobListener = Callable[[str, Dict[str, Any]], None]
+
+_FINAL = frozenset({DownloadStatus.COMPLETED, DownloadStatus.FAILED, DownloadStatus.CANCELLED})
+
+
+@dataclass
+class DownloadJob:
+    """A queued or running download and its latest state."""
+
+    url: str
+    format_id: str = "best"
+    media_type: MediaType = MediaType.VIDEO
+    audio_format: str = "mp3"  # output for AUDIO_ONLY jobs, see DownloadVideoUseCase.execute
+    profile: Optional[str] = None
+    selector: Optional[str] = None
+    output_dir: Optional[Path] = None
+    filename_template: str = "%(title)s.%(ext)s"
+    priority: int = 0  # higher runs first
+    id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    status: DownloadStatus = DownloadStatus.PENDING
+    progress: Optional[DownloadProgress] = None
+    output_path: Optional[Path] = None
+    downloaded_bytes: int = 0  # set when the job finishes
+    format_used: Optional[str] = None  # spec that succeeded, after any fallback
+    fallbacks: int = 0  # format rungs that failed before it
+    sidecar_seconds_saved: float = 0.0
+    error: Optional[str] = None  # while a retry is pending: the last attempt's error
+    attempts: int = 0
+    retry_at: Optional[float] = None  # epoch seconds of the next attempt, while waiting
+    timings: dict[str, float] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # Set by JobQueue.cancel; honoured at any point of a run, even before the transfer
+    cancel_event: threading.Event = field(default_factory=threading.Event, init=False, repr=False, compare=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in _FINAL
+
+    def to_dict(self) -> dict[str, Any]:
+        progress = self.progress
+        return {
+            "id": self.id,
+            "url": self.url,
+            "format_id": self.format_id,
+            "media_type": self.media_type.value,
+            "audio_format": self.audio_format,
+            "profile": self.profile,
+            "selector": self.selector,
+            "priority": self.priority,
+            "status": self.status.value,
+            "percent": round(progress.percent, 1) if progress else 0.0,
+            "downloaded_bytes": self.downloaded_bytes or (progress.downloaded_bytes if progress else 0),
+            "total_bytes": progress.total_bytes if progress else None,
+            "speed": progress.speed if progress else None,
+            "eta": progress.eta if progress else None,
+            "output_path": str(self.output_path) if self.output_path else None,
+            "format_used": self.format_used,
+            "fallbacks": self.fallbacks,
+            "sidecar_seconds_saved": self.sidecar_seconds_saved,
+            "error": self.error,
+            "attempts": self.attempts,
+            "retry_at": self.retry_at,
+            "timings": self.timings,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Run download jobs on a fixed set of workers, highest priority first.
+
+    Each worker owns one DownloadVideoUseCase from `download_factory` (a
+    downloader tracks a single active job); whatever the factory shares
+    between them - session pool, profiles, metrics - is shared by every job.
+    Listeners get ``(event, job_dict)`` for ``queued``, ``started``,
+    ``progress`` (at most every `progress_interval` seconds per job),
+    ``priority``, ``retrying``, ``completed``, ``failed`` and ``cancelled``.
+
+    Failed attempts are classified (see `classify_error`): transient and
+    throttling errors go back to the queue after a `RetryPolicy` backoff,
+    without holding a worker. Throttling also opens the host's circuit
+    breaker, which parks every queued job for that host until it closes,
+    and halves the number of jobs allowed to run at once; successes raise
+    it again one step at a time (`AimdLimiter`).
+    """
+
+    def __init__(
+        self,
+        download_factory: Callable[[], DownloadVideoUseCase],
+        info: Optional[GetVideoInfoUseCase] = None,
+        workers: int = 2,
+        merge_audio: bool = True,
+        progress_interval: float = 0.5,
+        max_finished: int = 500,
+        retry: Optional[RetryPolicy] = None,
+        breaker: Optional[HostCircuitBreaker] = None,
+    ):
+        self.download_factory = download_factory
+        self.info = info
+        self.workers = max(1, workers)
+        self.merge_audio = merge_audio
+        self.progress_interval = progress_interval
+        self.max_finished = max_finished
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or HostCircuitBreaker()
+        self.limiter = AimdLimiter(self.workers)
+
+        self._jobs: dict[str, DownloadJob] = {}
+        # (-priority, seq, job id); reprioritizing pushes a new entry and
+        # stale ones are skipped on pop
+        self._heap: list[tuple[int, int, str]] = []
+        self._entry: dict[str, int] = {}
+        # job id -> monotonic time a waiting job goes back on the heap
+        self._delayed: dict[str, float] = {}
+        self._seq = itertools.count()
+        self._running: dict[str, DownloadVideoUseCase] = {}
+        self._cond = threading.Condition()
+        self._listeners: list[JobListener] = []
+        self._threads: list[threading.Thread] = []
+        self._closed = False
+
+    def start(self) -> None:
+        with self._cond:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def close(self, cancel_running: bool = True) -> None:
+        """Stop accepting jobs, cancel queued ones and wait for the workers."""
+        with self._cond:
+            self._closed = True
+            queued = [job for job in self._jobs.values() if job.status == DownloadStatus.PENDING]
+            for job in queued:
+                self._mark_finished(job, DownloadStatus.CANCELLED, error="Service shutting down")
+            self._heap.clear()
+            self._delayed.clear()
+            if cancel_running:
+                for job_id, use_case in self._running.items():
+                    self._jobs[job_id].cancel_event.set()
+                    use_case.cancel()
+            self._cond.notify_all()
+        for job in queued:
+            self._emit(job.status.value, job)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def subscribe(self, listener: JobListener) -> Callable[[], None]:
+        """Call `listener(event, job_dict)` on every job change; returns an unsubscribe function."""
+        with self._cond:
+            self._listeners.append(listener)
+        return lambda: self._unsubscribe(listener)
+
+    def _unsubscribe(self, listener: JobListener) -> None:
+        with self._cond:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _emit(self, event: str, job: DownloadJob) -> None:
+        data = job.to_dict()
+        for listener in list(self._listeners):
+            try:
+                listener(event, data)
+            except Exception:
+                logger.exception("Job listener failed")
+
+    def submit(self, job: DownloadJob) -> DownloadJob:
+        if self._closed:
+            raise ValidationError("Job queue is closed")
+        with self._cond:
+            self._jobs[job.id] = job
+            self._push(job)
+            self._prune()
+            self._cond.notify()
+        self._emit("queued", job)
+        return job
+
+    def _push(self, job: DownloadJob) -> None:
+        seq = next(self._seq)
+        self._entry[job.id] = seq
+        heapq.heappush(self._heap, (-job.priority, seq, job.id))
+
+    def _prune(self) -> None:
+        finished = [job for job in self._jobs.values() if job.done]
+        for job in sorted(finished, key=lambda j: j.finished_at or 0)[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str) -> Optional[DownloadJob]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list[DownloadJob]:
+        """All known jobs: running, then queued by priority, then finished."""
+        with self._cond:
+            jobs = list(self._jobs.values())
+        order = {DownloadStatus.DOWNLOADING: 0, DownloadStatus.PENDING: 1}
+        return sorted(jobs, key=lambda j: (order.get(j.status, 2), -j.priority, j.created_at))
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; False if unknown or already finished."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return False
+            if job.status == DownloadStatus.PENDING:
+                self._entry.pop(job_id, None)
+                self._delayed.pop(job_id, None)
+                self._mark_finished(job, DownloadStatus.CANCELLED, error="Cancelled before start")
+                queued, use_case = True, None
+            else:
+                job.cancel_event.set()
+                queued, use_case = False, self._running.get(job_id)
+        if queued:
+            self._emit(DownloadStatus.CANCELLED.value, job)
+        elif use_case is not None:
+            use_case.cancel()
+        return True
+
+    def prioritize(self, job_id: str, priority: int) -> bool:
+        """Change a queued job's priority; False if it already started."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != DownloadStatus.PENDING:
+                return False
+            job.priority = priority
+            if job_id not in self._delayed:
+                self._push(job)
+        self._emit("priority", job)
+        return True
+
+    def _next(self, use_case: DownloadVideoUseCase) -> Optional[DownloadJob]:
+        """Wait for a runnable job and register it as run by `use_case`."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                self._release_delayed(now)
+                while self._heap and len(self._running) < self.limiter.limit:
+                    _, seq, job_id = heapq.heappop(self._heap)
+                    if self._entry.get(job_id) != seq:
+                        continue
+                    del self._entry[job_id]
+                    job = self._jobs[job_id]
+                    cooldown = self.breaker.remaining(host_key(job.url))
+                    if cooldown > 0:
+                        self._delayed[job_id] = now + cooldown
+                        continue
+                    job.status = DownloadStatus.DOWNLOADING
+                    job.started_at = time.time()
+                    job.retry_at = None
+                    job.attempts += 1
+                    self._running[job.id] = use_case
+                    return job
+                if self._closed:
+                    return None
+                # Woken early by submit, a finished job or a cancel
+                wake = min(self._delayed.values(), default=None)
+                self._cond.wait(None if wake is None else max(0.0, wake - now))
+
+    def _release_delayed(self, now: float) -> None:
+        for job_id, ready in list(self._delayed.items()):
+            if ready <= now:
+                del self._delayed[job_id]
+                job = self._jobs.get(job_id)
+                if job is not None and job.status == DownloadStatus.PENDING:
+                    self._push(job)
+
+    def _worker(self) -> None:
+        use_case = self.download_factory()
+        while True:
+            job = self._next(use_case)
+            if job is None:
+                return
+            self._emit("started", job)
+            try:
+                self._run(use_case, job)
+            finally:
+                with self._cond:
+                    # A retried job may already be running on another worker
+                    if self._running.get(job.id) is use_case:
+                        del self._running[job.id]
+                    # A slot freed up, or the concurrency limit changed
+                    self._cond.notify_all()
+
+    def _run(self, use_case: DownloadVideoUseCase, job: DownloadJob) -> None:
+        last_emit = 0.0
+
+        def on_progress(progress: DownloadProgress) -> None:
+            nonlocal last_emit
+            job.progress = progress
+            now = time.monotonic()
+            if progress.status == DownloadStatus.DOWNLOADING and now - last_emit < self.progress_interval:
+                return
+            last_emit = now
+            self._emit("progress", job)
+
+        try:
+            if job.cancel_event.is_set():
+                raise CancellationError("Download cancelled by user")
+            format_id = job.format_id
+            info = None
+            if job.selector:
+                if self.info is None:
+                    raise ValidationError("Format rules need a video info use case")
+                info = self.info.execute(job.url)
+                fmt = info.select_format(job.selector)
+                if fmt is None:
+                    raise ValidationError(f"No format matches {job.selector!r}")
+                format_id = format_spec(fmt, job.media_type, self.merge_audio)
+            result = use_case.execute(
+                job.url,
+                format_id,
+                job.media_type,
+                output_dir=job.output_dir,
+                filename_template=job.filename_template,
+                progress_callback=on_progress,
+                profile=job.profile,
+                audio_format=job.audio_format,
+                video_info=info,
+                cancel_event=job.cancel_event,
+            )
+        except CancellationError as e:
+            self._finish(job, DownloadStatus.CANCELLED, error=str(e))
+        except Exception as e:
+            if job.cancel_event.is_set():
+                # Cancelled while extracting or preparing: whatever failed, don't retry
+                self._finish(job, DownloadStatus.CANCELLED, error="Download cancelled by user")
+                return
+            if not isinstance(e, YtdlpCoreError):
+                logger.exception("Job %s failed unexpectedly", job.id)
+            if not self._retry_later(job, e):
+                self._finish(job, DownloadStatus.FAILED, error=f"{type(e).__name__}: {e}")
+        else:
+            self.breaker.record_success(host_key(job.url))
+            self.limiter.on_success()
+            job.output_path = result.output_path
+            job.format_used = result.format_used
+            job.fallbacks = result.fallbacks
+            job.sidecar_seconds_saved = result.sidecar_seconds_saved
+            job.downloaded_bytes = result.downloaded_bytes
+            job.timings = dict(result.timings)
+            self._finish(job, DownloadStatus.COMPLETED if result.success else DownloadStatus.FAILED, error=result.error)
+
+    def _retry_later(self, job: DownloadJob, error: Exception) -> bool:
+        """Put a failed job back in the queue after a backoff; False if it should fail."""
+        kind = classify_error(error)
+        if self._closed or not self.retry.should_retry(kind, job.attempts):
+            return False
+        host = host_key(job.url)
+        if kind == ErrorKind.THROTTLED and self.breaker.trip(host):
+            limit = self.limiter.on_throttle()
+            logger.warning(
+                "%s is throttling; pausing it for %.0fs and running at most %d jobs",
+                host, self.breaker.remaining(host), limit,
+            )
+        delay = max(self.retry.backoff(job.attempts), self.breaker.remaining(host))
+        with self._cond:
+            job.status = DownloadStatus.PENDING
+            job.progress = None
+            job.error = f"{type(error).__name__}: {error}"
+            job.retry_at = time.time() + delay
+            self._delayed[job.id] = time.monotonic() + delay
+            self._cond.notify_all()
+        logger.info("Job %s failed (%s, attempt %d), retrying in %.1fs", job.id, kind.value, job.attempts, delay)
+        self._emit("retrying", job)
+        return True
+
+    def _finish(self, job: DownloadJob, status: DownloadStatus, error: Optional[str] = None) -> None:
+        """Record the outcome and notify listeners; never call with `_cond` held."""
+        self._mark_finished(job, status, error)
+        self._emit(status.value, job)
+
+    def _mark_finished(self, job: DownloadJob, status: DownloadStatus, error: Optional[str] = None) -> None:
+        """Record the outcome only; callers holding `_cond` emit once they release it."""
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
@@ -0,0 +1,146 @@
+"""Application layer - compiled download profiles."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Optional
+
+from ytdlp_core.core.models import DownloadProfile, parse_rate_limit
+from ytdlp_core.domain.exceptions import ConfigurationError
+from ytdlp_core.domain.ports import IConfigStore
+
+DEFAULT_PROFILE = "default"
+
+# Config keys that feed a profile; a change to any of them invalidates the cache
+PROFILE_KEYS = frozenset({
+    "proxy",
+    "rate_limit",
+    "retries",
+    "download_retries",
+    "timeout",
+    "download_timeout",
+    "write_thumbnail",
+    "write_subtitles",
+    "subtitle_langs",
+    "embed_subtitles",
+    "embed_thumbnail",
+    "post_processors",
+    "profiles",
+})
+
+
+def compile_profile(settings: dict[str, Any], name: str = DEFAULT_PROFILE) -> DownloadProfile:
+    """Validate raw config values and build a DownloadProfile."""
+
+    def _first(*keys: str, default: Any = None) -> Any:
+        for key in keys:
+            if settings.get(key) not in (None, ""):
+                return settings[key]
+        return default
+
+    try:
+        rate_limit = _first("rate_limit")
+        ratelimit = parse_rate_limit(str(rate_limit)) if rate_limit else None
+    except ValueError as e:
+        raise ConfigurationError(f"Invalid rate_limit {rate_limit!r} in profile {name!r}", original=e)
+
+    try:
+        retries = int(_first("download_retries", "retries", default=3))
+        timeout = int(_first("download_timeout", "timeout", default=30))
+    except (TypeError, ValueError) as e:
+        raise ConfigurationError(f"Invalid retries/timeout in profile {name!r}", original=e)
+    if retries < 0:
+        raise ConfigurationError(f"retries must be >= 0 in profile {name!r}")
+    if timeout <= 0:
+        raise ConfigurationError(f"timeout must be > 0 in profile {name!r}")
+
+    langs = _first("subtitle_langs", default=[])
+    if isinstance(langs, str):
+        langs = [lang.strip() for lang in langs.split(",") if lang.strip()]
+
+    post_processors = _first("post_processors", default=[])
+    if not all(isinstance(pp, dict) and "key" in pp for pp in post_processors):
+        raise ConfigurationError(f"post_processors must be dicts with a 'key' in profile {name!r}")
+
+    return DownloadProfile(
+        name=name,
+        proxy=_first("proxy"),
+        rate_limit=ratelimit,
+        retries=retries,
+        timeout=timeout,
+        write_thumbnail=bool(settings.get("write_thumbnail", False)),
+        write_subtitles=bool(settings.get("write_subtitles", False)),
+        subtitle_langs=tuple(langs),
+        embed_subtitles=bool(settings.get("embed_subtitles", False)),
+        embed_thumbnail=bool(settings.get("embed_thumbnail", False)),
+        post_processors=tuple(dict(pp) for pp in post_processors),
+    )
+
+
+class DownloadProfileProvider:
+    """Compile profiles from config once and share them between jobs.
+
+    Named profiles live under the ``profiles`` config key as a mapping of
+    name -> overrides on top of the base settings. Cached profiles are
+    dropped whenever the config store reports a change to a relevant key.
+    """
+
+    def __init__(self, config: IConfigStore):
+        self.config = config
+        self._profiles: dict[str, DownloadProfile] = {}
+        self._generation = 0  # bumped by invalidate
+        self._lock = threading.Lock()
+        self._unsubscribe: Callable[[], None] = config.subscribe(self._on_config_change)
+
+    def get(self, name: Optional[str] = None) -> DownloadProfile:
+        """Return the compiled profile `name` (default profile if None)."""
+        name = name or DEFAULT_PROFILE
+        profile = self._profiles.get(name)
+        if profile is not None:
+            return profile
+
+        # Compile without the lock: reading the config takes the store's lock,
+        # and the store calls invalidate() on changes
+        generation = self._generation
+        profile = compile_profile(self._settings_for(name), name)
+        with self._lock:
+            cached = self._profiles.get(name)
+            if cached is not None:
+                return cached
+            if generation == self._generation:
+                # Otherwise the config changed meanwhile; don't cache a stale profile
+                self._profiles[name] = profile
+            return profile
+
+    def names(self) -> list[str]:
+        """List available profile names."""
+        named = self.config.get("profiles") or {}
+        return [DEFAULT_PROFILE] + sorted(n for n in named if n != DEFAULT_PROFILE)
+
+    def invalidate(self) -> None:
+        """Drop all compiled profiles."""
+        with self._lock:
+            self._profiles = {}
+            self._generation += 1
+
+    def close(self) -> None:
+        """Stop listening for config changes."""
+        self._unsubscribe()
+
+    def _settings_for(self, name: str) -> dict[str, Any]:
+        settings = {key: self.config.get(key) for key in PROFILE_KEYS if key != "profiles"}
+        if name == DEFAULT_PROFILE:
+            return settings
+
+        named = self.config.get("profiles") or {}
+        if name not in named:
+            raise ConfigurationError(f"Unknown download profile: {name}")
+        overrides = named[name]
+        if not isinstance(overrides, dict):
+            raise ConfigurationError(f"Profile {name!r} must be a mapping")
+        settings.update(overrides)
+        return settings
+
+    def _on_config_change(self, key: str, _value: Any) -> None:
+        if key in PROFILE_KEYS:
+            self.invalidate()
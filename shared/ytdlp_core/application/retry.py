@@ -0,0 +1,165 @@
+"""Application layer - job retries, per-host circuit breaking and adaptive concurrency."""
+
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from urllib.parse import urlsplit
+
+from ytdlp_core.domain.exceptions import (
+    CancellationError,
+    ConfigurationError,
+    FFmpegError,
+    InsufficientSpaceError,
+    ValidationError,
+)
+
+# The site is pushing back: slow everyone down, not just this job
+_THROTTLED = re.compile(
+    r"HTTP Error 429|Too Many Requests|rate[- ]?limit|confirm you.re not a bot",
+    re.IGNORECASE,
+)
+
+# Network hiccups and server-side failures that a later attempt may not hit.
+# yt-dlp's "Got error: ..." wrapper is not one by itself (it also wraps 403/404/410);
+# the cause it carries is matched on its own.
+_TRANSIENT = re.compile(
+    r"timed? ?out|Connection (?:reset|refused|aborted)|Remote end closed|IncompleteRead"
+    r"|Temporary failure in name resolution|Name or service not known|Network is unreachable"
+    r"|HTTP Error 5\d\d|EOF occurred",
+    re.IGNORECASE,
+)
+
+# Errors that are about the job or this machine, never the network
+_NEVER_RETRY = (CancellationError, ValidationError, InsufficientSpaceError, FFmpegError, ConfigurationError)
+
+
+class ErrorKind(Enum):
+    TRANSIENT = "transient"
+    THROTTLED = "throttled"
+    PERMANENT = "permanent"
+
+
+def classify_error(error: BaseException) -> ErrorKind:
+    """Whether a failed job is worth retrying, judged from the (yt-dlp) error text.
+
+    Unknown errors count as permanent: retrying a private or removed video
+    only adds load.
+    """
+    if isinstance(error, _NEVER_RETRY):
+        return ErrorKind.PERMANENT
+    text = f"{error} {getattr(error, 'original', None) or ''}"
+    if _THROTTLED.search(text):
+        return ErrorKind.THROTTLED
+    if _TRANSIENT.search(text):
+        return ErrorKind.TRANSIENT
+    return ErrorKind.PERMANENT
+
+
+def host_key(url: str) -> str:
+    """The host a URL loads from, with YouTube's aliases folded together."""
+    host = (urlsplit(url).hostname or "").lower()
+    for prefix in ("www.", "m.", "music."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    return "youtube.com" if host == "youtu.be" else host
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How often and how far apart a failed job is retried.
+
+    `backoff` uses "full jitter": a random delay up to the exponential
+    bound, so jobs that failed together do not come back together.
+    """
+
+    max_attempts: int = 4
+    base_delay: float = 2.0
+    max_delay: float = 300.0
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after the `attempt`-th failed try (1-based)."""
+        bound = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, bound)
+
+    def should_retry(self, kind: ErrorKind, attempt: int) -> bool:
+        return kind != ErrorKind.PERMANENT and attempt < self.max_attempts
+
+
+class HostCircuitBreaker:
+    """Per-host pause after throttling.
+
+    `trip` opens the breaker for `cooldown` seconds, doubling (up to
+    `max_cooldown`) each time the host throttles again before a success.
+    While open, no new attempt should start against the host.
+    """
+
+    def __init__(self, cooldown: float = 30.0, max_cooldown: float = 600.0):
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._open_until: dict[str, float] = {}
+        self._trips: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def trip(self, host: str) -> bool:
+        """Record throttling from `host`; True if this opened the breaker."""
+        now = time.monotonic()
+        with self._lock:
+            if self._open_until.get(host, 0.0) > now:
+                return False
+            trips = self._trips.get(host, 0)
+            self._trips[host] = trips + 1
+            self._open_until[host] = now + min(self.max_cooldown, self.cooldown * 2 ** trips)
+            return True
+
+    def remaining(self, host: str) -> float:
+        """Seconds until `host` may be tried again (0 when closed)."""
+        with self._lock:
+            return max(0.0, self._open_until.get(host, 0.0) - time.monotonic())
+
+    def record_success(self, host: str) -> None:
+        """Forget past trips, unless the breaker is open (the job started before it tripped)."""
+        with self._lock:
+            if self._open_until.get(host, 0.0) <= time.monotonic():
+                self._trips.pop(host, None)
+                self._open_until.pop(host, None)
+
+
+class AimdLimiter:
+    """Additive-increase/multiplicative-decrease cap on concurrent jobs.
+
+    Halved whenever a breaker opens; after that every `increase_every`
+    successful jobs raise it by one, back up to `maximum`.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1, increase_every: int = 3):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.increase_every = max(1, increase_every)
+        self._limit = self.maximum
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def on_throttle(self) -> int:
+        with self._lock:
+            self._limit = max(self.minimum, self._limit // 2)
+            self._successes = 0
+            return self._limit
+
+    def on_success(self) -> int:
+        with self._lock:
+            if self._limit < self.maximum:
+                self._successes += 1
+                if self._successes >= self.increase_every:
+                    self._limit += 1
+                    self._successes = 0
+            return self._limit
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, Callable, Optional
 
+from ytdlp_core.application.disk_space import DiskSpaceLedger, SpaceReservation, estimate_peak_bytes
+from ytdlp_core.application.profiles import DownloadProfileProvider
 from ytdlp_core.core.models import (
+    AUDIO_FORMATS,
     DownloadOptions,
     DownloadProgress,
     DownloadResult,
@@ -19,8 +25,10 @@ from ytdlp_core.domain.ports import (
     IConfigStore,
     IDownloader,
     IFFmpegLocator,
+    IMetricsSink,
     IVideoInfoExtractor,
     IPlatformService,
+    NullMetricsSink,
 )
 from ytdlp_core.domain.exceptions import (
     CancellationError,
@@ -30,6 +38,19 @@ from ytdlp_core.domain.exceptions import (
     ValidationError,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def format_spec(fmt: VideoFormat, media_type: MediaType, merge_audio: bool) -> str:
+    """yt-dlp format spec for a selected format.
+
+    A video-only pick is paired with the best audio track when ffmpeg is
+    available to merge them.
+    """
+    if media_type == MediaType.VIDEO and not fmt.is_audio and merge_audio:
+        return f"{fmt.format_id}+bestaudio/{fmt.format_id}"
+    return fmt.format_id
+
 
 @dataclass
 class GetVideoInfoUseCase:
@@ -37,22 +58,43 @@ class GetVideoInfoUseCase:
 
     extractor: IVideoInfoExtractor
     cache: ICacheStore
+    metrics: IMetricsSink = field(default_factory=NullMetricsSink)
 
     def execute(self, url: str, use_cache: bool = True) -> VideoInfo:
         """Get video info, using cache if available."""
-        if not self.extractor.validate_url(url):
+        with self.metrics.span("validate_url"):
+            valid = self.extractor.validate_url(url)
+        if not valid:
             raise ValidationError(f"Invalid YouTube URL: {url}")
 
         if use_cache:
-            cached = self.cache.get(url)
+            with self.metrics.span("cache_lookup"):
+                cached = self.cache.get(url)
             if cached:
+                self.metrics.increment("cache_hits")
                 return cached
+            self.metrics.increment("cache_misses")
 
-        info = self.extractor.extract_info(url)
+        with self.metrics.span("extract"):
+            info = self.extractor.extract_info(url)
         self.cache.set(url, info)
         return info
 
 
+@dataclass
+class WarmUpEngineUseCase:
+    """Prime the extraction engine so the first user request is fast."""
+
+    extractor: IVideoInfoExtractor
+
+    def execute(self, probe_url: Optional[str] = None) -> None:
+        """Warm up the extractor; failures are ignored since this is best-effort."""
+        try:
+            self.extractor.warm_up(probe_url)
+        except Exception:
+            logger.warning("Engine warm-up failed", exc_info=True)
+
+
 @dataclass
 class DownloadVideoUseCase:
     """Use case for downloading video/audio."""
@@ -61,6 +103,15 @@ class DownloadVideoUseCase:
     ffmpeg_locator: IFFmpegLocator
     config: IConfigStore
     platform: IPlatformService
+    profiles: Optional[DownloadProfileProvider] = None
+    metrics: IMetricsSink = field(default_factory=NullMetricsSink)
+    # VideoInfo for the disk space preflight; looked up only, never extracted
+    cache: Optional[ICacheStore] = None
+    space: DiskSpaceLedger = field(default_factory=DiskSpaceLedger.shared)
+
+    def __post_init__(self) -> None:
+        if self.profiles is None:
+            self.profiles = DownloadProfileProvider(self.config)
 
     def execute(
         self,
@@ -70,42 +121,101 @@ class DownloadVideoUseCase:
         output_dir: Optional[Path] = None,
         filename_template: str = "%(title)s.%(ext)s",
         progress_callback: Optional[Callable[[DownloadProgress], None]] = None,
+        profile: Optional[str] = None,
+        audio_format: str = "mp3",
+        video_info: Optional[VideoInfo] = None,
+        cancel_event: Optional[threading.Event] = None,
     ) -> DownloadResult:
-        """Download video or audio."""
-        if output_dir is None:
-            output_dir = self.platform.get_download_dir()
-
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        ffmpeg_path = self.ffmpeg_locator.find_ffmpeg()
-        if media_type == MediaType.AUDIO_ONLY and not ffmpeg_path:
-            raise FFmpegError("FFmpeg required for audio-only downloads")
-
-        options = DownloadOptions(
-            url=url,
-            format_id=format_id,
-            media_type=media_type,
-            output_path=output_dir,
-            filename_template=filename_template,
-            ffmpeg_path=ffmpeg_path,
-            proxy=self.config.get("proxy"),
-            rate_limit=self.config.get("rate_limit"),
-            retries=self.config.get("download_retries", 3),
-            timeout=self.config.get("download_timeout", 30),
-            write_thumbnail=self.config.get("write_thumbnail", False),
-            write_subtitles=self.config.get("write_subtitles", False),
-            subtitle_langs=tuple(self.config.get("subtitle_langs", [])),
-            embed_subtitles=self.config.get("embed_subtitles", False),
-            embed_thumbnail=self.config.get("embed_thumbnail", False),
-            post_processors=tuple(self.config.get("post_processors", [])),
-        )
-
-        return self.downloader.download(options, progress_callback)
+        """Download video or audio using the named (or default) profile.
+
+        For audio-only jobs `audio_format` picks the output: "mp3" transcodes
+        (needs FFmpeg), while "m4a", "opus" and "best" fetch a matching audio
+        stream and at most remux it.
+
+        When the video's info is known (`video_info`, or the cache), the
+        job's peak disk usage is estimated and reserved on the target volume
+        first; InsufficientSpaceError is raised before any transfer if free
+        space, minus what running jobs have yet to write, is too small.
+
+        Setting `cancel_event` cancels this job (CancellationError) at any
+        point, including before the download starts; `cancel` only reaches
+        a download that is already running.
+
+        The result's `timings` hold per-phase seconds: ``prepare`` plus the
+        downloader's phases (``first_byte``, ``transfer``, ``merge``, ...)
+        and ``total``.
+        """
+        started = time.perf_counter()
+        with self.metrics.span("prepare"):
+            if output_dir is None:
+                output_dir = self.platform.get_download_dir()
+
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+            if audio_format not in AUDIO_FORMATS:
+                raise ValidationError(f"Unsupported audio format: {audio_format}")
+            ffmpeg_path = self.ffmpeg_locator.find_ffmpeg()
+            if media_type == MediaType.AUDIO_ONLY and audio_format == "mp3" and not ffmpeg_path:
+                raise FFmpegError("FFmpeg required for MP3 downloads")
+
+            options = self.profiles.get(profile).to_options(
+                url=url,
+                output_path=output_dir,
+                format_id=format_id,
+                media_type=media_type,
+                filename_template=filename_template,
+                ffmpeg_path=ffmpeg_path,
+                audio_format=audio_format,
+            )
+            if cancel_event is not None and cancel_event.is_set():
+                raise CancellationError("Download cancelled by user")
+            reservation = self._reserve_space(options, video_info)
+        prepare = time.perf_counter() - started
+
+        def on_progress(progress: DownloadProgress) -> None:
+            reservation.written(progress.filename, progress.downloaded_bytes)
+            if progress_callback:
+                progress_callback(progress)
+
+        try:
+            result = self.downloader.download(
+                options, progress_callback if reservation is None else on_progress, cancel_event=cancel_event
+            )
+        except CancellationError:
+            self.metrics.increment("jobs", labels={"status": "cancelled"})
+            raise
+        except Exception:
+            self.metrics.increment("jobs", labels={"status": "failed"})
+            raise
+        finally:
+            if reservation is not None:
+                reservation.release()
+
+        total = time.perf_counter() - started
+        self.metrics.increment("jobs", labels={"status": "completed" if result.success else "failed"})
+        self.metrics.observe("job_seconds", total)
+        return replace(result, timings={"prepare": prepare, **result.timings, "total": total})
 
     def cancel(self) -> None:
         """Cancel ongoing download."""
         self.downloader.cancel()
 
+    def _reserve_space(self, options: DownloadOptions, info: Optional[VideoInfo]) -> Optional[SpaceReservation]:
+        if info is None and self.cache is not None:
+            info = self.cache.get(options.url)
+        if info is None:
+            return None
+        spec = options.to_ydl_opts()["format"]
+        estimate = estimate_peak_bytes(
+            info, spec, options.media_type, options.audio_format, ffmpeg=bool(options.ffmpeg_path)
+        )
+        if estimate is None:
+            return None
+        free = self.platform.get_free_space(options.output_path)
+        reservation = self.space.reserve(options.output_path, estimate, free)
+        logger.debug("Reserved %d bytes for %s (%s bytes free)", estimate, options.url, free)
+        return reservation
+
 
 @dataclass
 class GetDefaultOptionsUseCase:
@@ -0,0 +1,395 @@
+"""Headless batch downloader.
+
+Reads URLs (one per line, ``#`` comments allowed) from a file or stdin and
+downloads them with the shared use cases, printing one JSON object per line
+to stdout::
+
+    python -m ytdlp_core urls.txt --workers 4 --rate-limit 2M -o /data
+    cat urls.txt | python -m ytdlp_core - --profile archive --select "<=1080p, prefer mp4"
+
+Events are ``start``, ``progress``, ``retry``, ``done``, ``error`` and a
+final ``summary``. Jobs that fail on network errors or throttling are
+retried with backoff (``--max-attempts``). Logs go to stderr so stdout stays machine-readable.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import signal
+import sys
+import threading
+import time
+from enum import IntEnum
+from pathlib import Path
+from typing import IO, Any, Iterable, Optional
+
+from ytdlp_core.application.job_queue import DownloadJob, JobQueue
+from ytdlp_core.application.profiles import DownloadProfileProvider
+from ytdlp_core.application.retry import RetryPolicy
+from ytdlp_core.application.use_cases import DownloadVideoUseCase, GetVideoInfoUseCase
+from ytdlp_core.core.models import MediaType, parse_rate_limit
+from ytdlp_core.domain.exceptions import ConfigurationError
+from ytdlp_core.domain.ports import IConfigStore
+
+logger = logging.getLogger(__name__)
+
+
+class ExitCode(IntEnum):
+    """Process exit status of a batch run."""
+
+    OK = 0
+    PARTIAL_FAILURE = 1  # some jobs failed
+    USAGE = 2  # bad arguments (argparse's own code)
+    ALL_FAILED = 3
+    NO_INPUT = 4  # URL list missing, unreadable or empty
+    CONFIG = 5  # invalid config file, profile or rate limit
+    INTERRUPTED = 130  # SIGINT/SIGTERM
+
+
+class JsonLinesWriter:
+    """Thread-safe writer of one compact JSON object per line."""
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        line = json.dumps({"event": event, "ts": round(time.time(), 3), **fields}, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def read_urls(lines: Iterable[str]) -> list[str]:
+    """Non-empty, non-comment lines with surrounding whitespace removed."""
+    urls = []
+    for line in lines:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            urls.append(line)
+    return urls
+
+
+def build_config(config_path: Optional[Path], rate_limit: Optional[str]) -> IConfigStore:
+    """Load settings into memory and apply command-line overrides.
+
+    The CLI never writes back to the config file. ``--rate-limit`` wins over
+    any per-profile value.
+    """
+    from ytdlp_core.infrastructure.platform import MemoryConfigStore
+
+    settings: dict[str, Any] = {}
+    if config_path is not None:
+        try:
+            with open(config_path, "r", encoding="utf-8") as f:
+                settings = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ConfigurationError(f"Cannot read config {config_path}: {e}", original=e)
+        if not isinstance(settings, dict):
+            raise ConfigurationError(f"Config {config_path} must contain a JSON object")
+
+    if rate_limit:
+        try:
+            parse_rate_limit(rate_limit)
+        except ValueError as e:
+            raise ConfigurationError(f"Invalid --rate-limit {rate_limit!r}", original=e)
+        settings["rate_limit"] = rate_limit
+        profiles = settings.get("profiles")
+        if isinstance(profiles, dict):
+            settings["profiles"] = {
+                name: {**overrides, "rate_limit": rate_limit} if isinstance(overrides, dict) else overrides
+                for name, overrides in profiles.items()
+            }
+    return MemoryConfigStore(settings)
+
+
+class BatchRunner:
+    """Run download jobs on a JobQueue sharing one session pool and profile cache.
+
+    Going through the queue gives batch runs the same retry policy, per-host
+    circuit breaker and adaptive concurrency as the server and the apps.
+    """
+
+    def __init__(
+        self,
+        config: IConfigStore,
+        output_dir: Path,
+        writer: JsonLinesWriter,
+        workers: int = 2,
+        format_id: str = "best",
+        media_type: MediaType = MediaType.VIDEO,
+        profile: Optional[str] = None,
+        selector: Optional[str] = None,
+        filename_template: str = "%(title)s.%(ext)s",
+        progress_interval: float = 1.0,
+        retry: Optional[RetryPolicy] = None,
+    ):
+        # deferred: the infrastructure modules pull in yt-dlp
+        from ytdlp_core.infrastructure.extractor import YtDlpVideoInfoExtractor
+        from ytdlp_core.infrastructure.metrics import MetricsRegistry
+        from ytdlp_core.infrastructure.platform import DesktopPlatformService, FFmpegLocator, MemoryCacheStore
+        from ytdlp_core.infrastructure.proxy_pool import ProxyPool
+        from ytdlp_core.infrastructure.session_pool import YoutubeDLSessionPool
+
+        self.config = config
+        self.output_dir = output_dir
+        self.writer = writer
+        self.workers = max(1, workers)
+        self.format_id = format_id
+        self.media_type = media_type
+        self.profile = profile
+        self.selector = selector
+        self.filename_template = filename_template
+
+        self.metrics = MetricsRegistry()
+        self.session_pool = YoutubeDLSessionPool(max_idle_per_key=self.workers)
+        self.proxy_pool = ProxyPool.from_config(
+            config.get("proxies"), config.get("proxy_strategy"), metrics=self.metrics
+        )
+        self.profiles = DownloadProfileProvider(config)
+        self.ffmpeg = FFmpegLocator()
+        self.platform = DesktopPlatformService()
+        self.extractor = YtDlpVideoInfoExtractor(
+            timeout=int(config.get("timeout", 30)),
+            proxy=config.get("proxy") or None,
+            session_pool=self.session_pool,
+            proxy_pool=self.proxy_pool,
+        )
+        self.info = GetVideoInfoUseCase(extractor=self.extractor, cache=MemoryCacheStore(), metrics=self.metrics)
+        self.queue = JobQueue(
+            self._download_use_case,
+            info=self.info,
+            workers=self.workers,
+            merge_audio=self.ffmpeg.find_ffmpeg() is not None,
+            progress_interval=progress_interval,
+            max_finished=0,
+            retry=retry,
+        )
+
+        self.counts = {"completed": 0, "failed": 0, "cancelled": 0}
+        self._numbers: dict[str, int] = {}  # job id -> position in the URL list
+        self._started: dict[str, float] = {}
+        self._finished = threading.Condition()
+
+    def validate(self) -> None:
+        """Fail fast on an unknown or invalid profile before any job starts."""
+        self.profiles.get(self.profile)
+
+    def _download_use_case(self) -> DownloadVideoUseCase:
+        # Called once per queue worker: a downloader tracks one active job
+        from ytdlp_core.infrastructure.downloader import YtDlpDownloader
+
+        return DownloadVideoUseCase(
+            downloader=YtDlpDownloader(
+                session_pool=self.session_pool, metrics=self.metrics, proxy_pool=self.proxy_pool
+            ),
+            ffmpeg_locator=self.ffmpeg,
+            config=self.config,
+            platform=self.platform,
+            profiles=self.profiles,
+            metrics=self.metrics,
+            cache=self.info.cache,
+        )
+
+    def _on_job(self, event: str, data: dict[str, Any]) -> None:
+        number = self._numbers[data["id"]]
+        url = data["url"]
+        if event == "started":
+            self._started.setdefault(data["id"], time.perf_counter())
+            if data["attempts"] == 1:
+                self.writer.emit("start", job=number, url=url)
+        elif event == "progress":
+            self.writer.emit(
+                "progress",
+                job=number,
+                status=data["status"],
+                percent=data["percent"],
+                downloaded_bytes=data["downloaded_bytes"],
+                total_bytes=data["total_bytes"],
+                speed=data["speed"],
+                eta=data["eta"],
+            )
+        elif event == "retrying":
+            self.writer.emit(
+                "retry",
+                job=number,
+                url=url,
+                attempt=data["attempts"],
+                retry_in=round(max(0.0, data["retry_at"] - time.time()), 1),
+                message=data["error"],
+            )
+        elif event in ("completed", "failed", "cancelled"):
+            self._report(number, event, data)
+            with self._finished:
+                self.counts[event] += 1
+                self._finished.notify_all()
+
+    def _report(self, number: int, status: str, data: dict[str, Any]) -> None:
+        url = data["url"]
+        if status != "completed":
+            # The queue records failures as "<ExceptionType>: <message>"
+            error = data["error"] or ""
+            error_type, sep, message = error.partition(": ")
+            if status == "cancelled" or not sep:
+                error_type, message = "CancellationError" if status == "cancelled" else "DownloadError", error
+            self.writer.emit("error", job=number, url=url, status=status, error_type=error_type, message=message)
+            return
+        output = Path(data["output_path"]) if data["output_path"] else None
+        self.writer.emit(
+            "done",
+            job=number,
+            url=url,
+            status="completed",
+            output=str(output) if output else None,
+            bytes=output.stat().st_size if output and output.exists() else None,
+            format=data["format_used"],
+            fallbacks=data["fallbacks"],
+            attempts=data["attempts"],
+            sidecars_saved=round(data["sidecar_seconds_saved"], 3),
+            seconds=round(time.perf_counter() - self._started.get(data["id"], time.perf_counter()), 3),
+            timings={phase: round(s, 4) for phase, s in data["timings"].items()},
+        )
+
+    def run(self, urls: list[str]) -> dict[str, int]:
+        """Run every URL; on KeyboardInterrupt cancel in-flight jobs and skip the rest."""
+        if self.proxy_pool is not None:
+            self.proxy_pool.start()
+        self.queue.subscribe(self._on_job)
+        self.queue.start()
+        try:
+            for number, url in enumerate(urls):
+                if not self.extractor.validate_url(url):
+                    self.writer.emit(
+                        "error", job=number, url=url, status="failed",
+                        error_type="ValidationError", message=f"Invalid YouTube URL: {url}",
+                    )
+                    with self._finished:
+                        self.counts["failed"] += 1
+                    continue
+                job = DownloadJob(
+                    url,
+                    format_id=self.format_id,
+                    media_type=self.media_type,
+                    profile=self.profile,
+                    selector=self.selector,
+                    output_dir=self.output_dir,
+                    filename_template=self.filename_template,
+                )
+                self._numbers[job.id] = number
+                self.queue.submit(job)
+            with self._finished:
+                while sum(self.counts.values()) < len(urls):
+                    # Short waits keep the main thread responsive to Ctrl+C
+                    self._finished.wait(0.5)
+        except KeyboardInterrupt:
+            self.stop()
+            raise
+        finally:
+            self.queue.close()
+            if self.proxy_pool is not None:
+                self.proxy_pool.close()
+            self.session_pool.close()
+            self.profiles.close()
+        return self.counts
+
+    def stop(self) -> None:
+        """Cancel running downloads and skip jobs that have not started."""
+        self.queue.close(cancel_running=True)
+
+
+def _raise_interrupt(_signum: int, _frame: Any) -> None:
+    raise KeyboardInterrupt
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m ytdlp_core",
+        description="Batch-download URLs and report progress as JSON lines.",
+    )
+    parser.add_argument("urls", nargs="?", default="-", help="file with one URL per line, or - for stdin (default)")
+    parser.add_argument("-o", "--output-dir", type=Path, default=Path.cwd(), help="download directory (default: cwd)")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="parallel downloads (default: 2)")
+    parser.add_argument("-r", "--rate-limit", help="per-download rate limit, e.g. 500K or 2M")
+    parser.add_argument("-p", "--profile", help="named download profile from the config")
+    parser.add_argument("-c", "--config", type=Path, help="JSON config with settings and profiles")
+    parser.add_argument("-f", "--format", default="best", help="yt-dlp format id/spec (default: best)")
+    parser.add_argument("-s", "--select", help='format rules, e.g. "<=1080p, prefer avc1, max 500MB"')
+    parser.add_argument("--audio", action="store_true", help="download audio only (needs ffmpeg)")
+    parser.add_argument("-t", "--template", default="%(title)s.%(ext)s", help="output filename template")
+    parser.add_argument(
+        "--max-attempts", type=int, default=RetryPolicy.max_attempts,
+        help=f"tries per URL on network errors or throttling (default: {RetryPolicy.max_attempts})",
+    )
+    parser.add_argument("--progress-interval", type=float, default=1.0, help="seconds between progress events per job")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log to stderr at INFO level")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+    writer = JsonLinesWriter(sys.stdout)
+
+    try:
+        if args.urls == "-":
+            urls = read_urls(sys.stdin)
+        else:
+            with open(args.urls, "r", encoding="utf-8") as f:
+                urls = read_urls(f)
+    except OSError as e:
+        writer.emit("fatal", error_type=type(e).__name__, message=str(e))
+        return ExitCode.NO_INPUT
+    if not urls:
+        writer.emit("fatal", error_type="NoInput", message="No URLs given")
+        return ExitCode.NO_INPUT
+
+    try:
+        config = build_config(args.config, args.rate_limit)
+        if args.select:
+            from ytdlp_core.core.format_index import FormatSelector
+
+            FormatSelector.parse(args.select)
+        runner = BatchRunner(
+            config,
+            output_dir=args.output_dir,
+            writer=writer,
+            workers=args.workers,
+            format_id=args.format,
+            media_type=MediaType.AUDIO_ONLY if args.audio else MediaType.VIDEO,
+            profile=args.profile,
+            selector=args.select,
+            filename_template=args.template,
+            progress_interval=args.progress_interval,
+            retry=RetryPolicy(max_attempts=max(1, args.max_attempts)),
+        )
+        runner.validate()
+    except (ConfigurationError, ValueError) as e:
+        writer.emit("fatal", error_type=type(e).__name__, message=str(e))
+        return ExitCode.CONFIG
+
+    # Containers stop with SIGTERM; treat it like Ctrl+C
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, _raise_interrupt)
+
+    started = time.perf_counter()
+    interrupted = False
+    try:
+        counts = runner.run(urls)
+    except KeyboardInterrupt:
+        interrupted = True
+        counts = runner.counts
+    writer.emit("summary", total=len(urls), **counts, interrupted=interrupted, seconds=round(time.perf_counter() - started, 3))
+
+    if interrupted:
+        return ExitCode.INTERRUPTED
+    if counts["completed"] == len(urls):
+        return ExitCode.OK
+    if counts["completed"] == 0:
+        return ExitCode.ALL_FAILED
+    return ExitCode.PARTIAL_FAILURE
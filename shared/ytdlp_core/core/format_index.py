@@ -0,0 +1,448 @@
+"""Precomputed format index and rule-based format selection."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from ytdlp_core.core.models import VideoFormat
+
+# Codec string prefix -> family name
+_CODEC_FAMILIES = (
+    ("avc", "avc1"),
+    ("h264", "avc1"),
+    ("hev", "hevc"),
+    ("hvc", "hevc"),
+    ("h265", "hevc"),
+    ("vp09", "vp9"),
+    ("vp9", "vp9"),
+    ("vp8", "vp8"),
+    ("av01", "av1"),
+    ("av1", "av1"),
+    ("mp4a", "aac"),
+    ("aac", "aac"),
+    ("opus", "opus"),
+    ("vorbis", "vorbis"),
+    ("mp3", "mp3"),
+    ("ac-3", "ac3"),
+    ("ec-3", "eac3"),
+    ("flac", "flac"),
+)
+
+_RESOLUTION_RE = re.compile(r"^(?:(\d+)x(\d+)|(\d+)p)")
+# yt-dlp filters bounding the height from above: [height<=720], [res<?1080], [height=480]
+_HEIGHT_CAP_RE = re.compile(r"\[\s*(?:height|res)\s*(<=|<|==?)\s*\??\s*(\d+)\s*\]")
+_SIZE_UNITS = {"": 1, "B": 1, "K": 1024, "KB": 1024, "M": 1024**2, "MB": 1024**2, "G": 1024**3, "GB": 1024**3}
+
+
+def parse_height(resolution: Optional[str]) -> Optional[int]:
+    """Height in pixels from "1920x1080" or "1080p" style strings."""
+    if not resolution:
+        return None
+    match = _RESOLUTION_RE.match(resolution)
+    if not match:
+        return None
+    return int(match.group(2) or match.group(3))
+
+
+def height_cap(spec: str) -> Optional[int]:
+    """Largest height the first alternative of a yt-dlp spec allows, or None if unbounded.
+
+    Only ``height``/``res`` filters count; several caps combine to the
+    lowest. ``bestvideo[height<=720]+bestaudio/best`` gives 720.
+    """
+    caps = []
+    for op, value in _HEIGHT_CAP_RE.findall(spec.split("/", 1)[0]):
+        caps.append(int(value) - 1 if op == "<" else int(value))
+    return min(caps) if caps else None
+
+
+def codec_family(codec: Optional[str]) -> Optional[str]:
+    """Normalize a codec string (e.g. "avc1.640028") to its family ("avc1")."""
+    if not codec or codec == "none":
+        return None
+    lowered = codec.lower()
+    for prefix, family in _CODEC_FAMILIES:
+        if lowered.startswith(prefix):
+            return family
+    return lowered.split(".", 1)[0]
+
+
+class IndexedFormat(NamedTuple):
+    """A format with its sort/filter keys precomputed."""
+
+    format: VideoFormat
+    height: int
+    fps: float
+    bitrate: float
+    vcodec: Optional[str]
+    acodec: Optional[str]
+    est_size: Optional[int]
+
+
+class FormatIndex:
+    """Per-VideoInfo index of formats, built once and read many times."""
+
+    __slots__ = (
+        "entries",
+        "video",
+        "audio",
+        "combined",
+        "video_by_quality",
+        "audio_by_quality",
+        "_by_id",
+        "_by_label",
+        "_size_by_id",
+    )
+
+    def __init__(self, formats: Iterable[VideoFormat], duration: Optional[int] = None):
+        entries = []
+        for f in formats:
+            bitrate = f.bitrate or ((f.video_bitrate or 0) + (f.audio_bitrate or 0)) or 0.0
+            est_size = f.filesize
+            if est_size is None and bitrate and duration:
+                est_size = int(bitrate * 1000 / 8 * duration)
+            entries.append(
+                IndexedFormat(
+                    format=f,
+                    height=parse_height(f.resolution) or 0,
+                    fps=f.fps or 0.0,
+                    bitrate=float(bitrate),
+                    vcodec=codec_family(f.vcodec),
+                    acodec=codec_family(f.acodec),
+                    est_size=est_size,
+                )
+            )
+        self.entries: tuple[IndexedFormat, ...] = tuple(entries)
+
+        # Views in yt-dlp order (worst to best), matching the VideoInfo properties
+        self.video = tuple(e for e in self.entries if e.format.is_video)
+        self.audio = tuple(e for e in self.entries if e.format.is_audio_only)
+        self.combined = tuple(e for e in self.video if e.format.is_audio)
+
+        # Best-first views
+        self.video_by_quality = tuple(
+            sorted(self.video, key=lambda e: (e.height, e.fps, e.bitrate), reverse=True)
+        )
+        self.audio_by_quality = tuple(
+            sorted(
+                self.audio,
+                key=lambda e: (e.format.audio_bitrate or e.bitrate, e.bitrate),
+                reverse=True,
+            )
+        )
+
+        self._by_id = {e.format.format_id: e.format for e in self.entries}
+        self._size_by_id = {e.format.format_id: e.est_size for e in self.entries}
+        self._by_label: Optional[dict[str, VideoFormat]] = None
+
+    def get(self, format_id: str) -> Optional[VideoFormat]:
+        return self._by_id.get(format_id)
+
+    def find_by_label(self, label: str) -> Optional[VideoFormat]:
+        """Look up a format by its `display_name`."""
+        if self._by_label is None:
+            # Built on first use: labels are long strings only the UI needs
+            by_label: dict[str, VideoFormat] = {}
+            for e in self.entries:
+                by_label.setdefault(e.format.display_name, e.format)
+            self._by_label = by_label
+        return self._by_label.get(label)
+
+    def best_video(self, ext: Optional[str] = None) -> Optional[VideoFormat]:
+        for e in self.video_by_quality:
+            if ext is None or e.format.ext == ext:
+                return e.format
+        return None
+
+    def best_audio(self) -> Optional[VideoFormat]:
+        return self.audio_by_quality[0].format if self.audio_by_quality else None
+
+    def select(self, selector: FormatSelector) -> Optional[VideoFormat]:
+        return selector.select(self)
+
+    def estimate_size(self, spec: str) -> Optional[int]:
+        """Expected bytes for a yt-dlp spec's first alternative, or None if unknown.
+
+        Understands explicit ids and the best/bestvideo/bestaudio selectors,
+        joined with "+"; of their filters only height caps are applied.
+        Anything fancier is not estimated.
+        """
+        total = 0
+        for part in spec.split("/", 1)[0].split("+"):
+            if part in self._size_by_id:
+                size = self._size_by_id[part]
+            else:
+                # "bestaudio[ext=m4a]": estimated as the unfiltered pick
+                entry = self._best_for(part.split("[", 1)[0], height_cap(part))
+                size = entry.est_size if entry is not None else None
+            if size is None:
+                return None
+            total += size
+        return total
+
+    def expected_height(self, spec: str) -> Optional[int]:
+        """Height of the video yt-dlp is expected to pick for `spec`, or None if unknown."""
+        heights = []
+        for part in spec.split("/", 1)[0].split("+"):
+            entry = self.get(part)
+            if entry is not None:
+                if entry.is_video:
+                    heights.append(parse_height(entry.resolution) or 0)
+                continue
+            found = self._best_for(part.split("[", 1)[0], height_cap(part))
+            if found is not None and found.format.is_video:
+                heights.append(found.height)
+        return max(heights) if heights else None
+
+    def _best_for(self, selector: str, max_height: Optional[int] = None) -> Optional[IndexedFormat]:
+        if selector in ("bestvideo", "bv"):
+            views = self.video_by_quality
+        elif selector in ("bestaudio", "ba"):
+            views = self.audio_by_quality
+        elif selector in ("best", "b"):
+            views = tuple(e for e in self.video_by_quality if e.format.is_audio)
+        else:
+            return None
+        if max_height is not None:
+            views = tuple(e for e in views if e.height <= max_height)
+        return views[0] if views else None
+
+
+@dataclass(frozen=True)
+class FormatSelector:
+    """Small rule set evaluated against a FormatIndex.
+
+    Hard limits (height, size) filter candidates; preferences (codec, ext)
+    rank the survivors before quality does. Parse from text with `parse`,
+    e.g. ``"<=1080p, prefer avc1, prefer mp4, max 500MB"``.
+    """
+
+    max_height: Optional[int] = None
+    min_height: Optional[int] = None
+    max_filesize: Optional[int] = None
+    prefer_codecs: tuple[str, ...] = ()
+    prefer_exts: tuple[str, ...] = ()
+    audio_only: bool = False
+
+    @classmethod
+    def parse(cls, spec: str) -> FormatSelector:
+        """Parse comma-separated rules; raises ValueError on unknown ones."""
+        max_height = min_height = max_filesize = None
+        codecs: list[str] = []
+        exts: list[str] = []
+        audio_only = False
+        for raw in spec.split(","):
+            rule = raw.strip().lower().replace("≤", "<=").replace("≥", ">=")
+            if not rule:
+                continue
+            if rule in ("audio", "audio only", "audio_only"):
+                audio_only = True
+            elif rule.startswith("<="):
+                max_height = parse_height(rule[2:].strip())
+            elif rule.startswith(">="):
+                min_height = parse_height(rule[2:].strip())
+            elif rule.startswith("prefer "):
+                value = rule[len("prefer "):].strip()
+                if value in ("mp4", "webm", "mkv", "m4a", "mp3", "ogg", "opus", "mov", "flv", "3gp"):
+                    exts.append(value)
+                else:
+                    codecs.append(codec_family(value) or value)
+            elif rule.startswith("max "):
+                max_filesize = parse_size(rule[len("max "):])
+            else:
+                raise ValueError(f"Unknown format rule: {raw.strip()!r}")
+            if rule.startswith(("<=", ">=")) and (max_height or min_height) is None:
+                raise ValueError(f"Invalid height in rule: {raw.strip()!r}")
+        return cls(
+            max_height=max_height,
+            min_height=min_height,
+            max_filesize=max_filesize,
+            prefer_codecs=tuple(codecs),
+            prefer_exts=tuple(exts),
+            audio_only=audio_only,
+        )
+
+    def matches(self, entry: IndexedFormat) -> bool:
+        if self.max_height is not None and entry.height > self.max_height:
+            return False
+        if self.min_height is not None and entry.height < self.min_height:
+            return False
+        if (
+            self.max_filesize is not None
+            and entry.est_size is not None
+            and entry.est_size > self.max_filesize
+        ):
+            return False
+        return True
+
+    def _rank(self, entry: IndexedFormat) -> tuple:
+        codec = entry.acodec if self.audio_only else entry.vcodec
+        codec_rank = (
+            len(self.prefer_codecs) - self.prefer_codecs.index(codec)
+            if codec in self.prefer_codecs
+            else 0
+        )
+        ext = entry.format.ext
+        ext_rank = len(self.prefer_exts) - self.prefer_exts.index(ext) if ext in self.prefer_exts else 0
+        return (codec_rank, ext_rank, entry.height, entry.fps, entry.bitrate)
+
+    def rank(self, index: FormatIndex) -> list[VideoFormat]:
+        """All matching formats, best first."""
+        pool = index.audio_by_quality if self.audio_only else index.video_by_quality
+        candidates = [e for e in pool if self.matches(e)]
+        candidates.sort(key=self._rank, reverse=True)
+        return [e.format for e in candidates]
+
+    def select(self, index: FormatIndex) -> Optional[VideoFormat]:
+        """Best matching format, or None."""
+        pool = index.audio_by_quality if self.audio_only else index.video_by_quality
+        best = None
+        best_rank = None
+        for e in pool:
+            if not self.matches(e):
+                continue
+            rank = self._rank(e)
+            if best_rank is None or rank > best_rank:
+                best, best_rank = e, rank
+        return best.format if best is not None else None
+
+
+class FormatRung(NamedTuple):
+    """One step of a fallback ladder: a yt-dlp format spec and the format ids it fetches.
+
+    `format_ids` is empty when the spec is an expression (e.g. "best") that
+    only yt-dlp can resolve.
+    """
+
+    spec: str
+    format_ids: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class FormatFallbackPlanner:
+    """Build an ordered ladder of acceptable formats for one download.
+
+    The first rung is the requested spec as given; later rungs step through
+    the same height with other codecs/protocols, then lower heights, and end
+    with a catch-all (`final_spec`). Later rungs use explicit format ids so
+    one audio track stays pinned across video rungs: a component that already
+    finished (`completed`) is preferred and yt-dlp finds its file on disk
+    instead of fetching it again. Rungs touching a format in `failed` are left
+    out, so re-planning after each failure walks down the ladder.
+
+    No rung goes above the requested height: that of the resolved format,
+    or for expressions the ``height<=`` cap in the spec, else the height
+    yt-dlp is expected to pick. The catch-all gets the same cap.
+    """
+
+    merge_audio: bool = True
+    max_rungs: int = 5
+    final_spec: Optional[str] = "best"
+    final_audio_spec: Optional[str] = "bestaudio/best"
+
+    def plan(
+        self,
+        index: FormatIndex,
+        requested: str,
+        audio_only: bool = False,
+        completed: Iterable[str] = (),
+        failed: Iterable[str] = (),
+    ) -> list[FormatRung]:
+        completed = frozenset(completed)
+        failed = frozenset(failed)
+        rungs: list[FormatRung] = []
+
+        def add(spec: str, ids: tuple[str, ...] = ()) -> None:
+            if len(rungs) < self.max_rungs and not failed.intersection(ids) and all(r.spec != spec for r in rungs):
+                rungs.append(FormatRung(spec, ids))
+
+        resolved = self._resolve(index, requested)
+        add(requested, resolved or ())
+        if audio_only:
+            primary = resolved[0] if resolved else None
+            primary_ext = index.get(primary).ext if primary else None
+            pool = [e for e in index.audio_by_quality if e.format.format_id not in failed]
+            # Stable sort: the pick, then its container (so the output keeps
+            # its extension), each best-first
+            pool.sort(key=lambda e: (e.format.format_id != primary, e.format.ext != primary_ext))
+            for e in pool:
+                add(e.format.format_id, (e.format.format_id,))
+            final = self.final_audio_spec
+        else:
+            video_id = next((i for i in resolved or () if index.get(i).is_video), None)
+            audio_id = next((i for i in resolved or () if not index.get(i).is_video), None)
+            partner = self._audio_partner(index, audio_id, completed, failed)
+            primary = index.get(video_id) if video_id else None
+            if primary is not None:
+                primary_height = parse_height(primary.resolution) or 0
+            else:
+                primary_height = height_cap(requested) or index.expected_height(requested) or 0
+            pool = [
+                e
+                for e in index.video_by_quality
+                if e.format.format_id not in failed
+                and (e.format.is_audio or self.merge_audio or e.format.format_id == video_id)
+                and (not primary_height or e.height <= primary_height)
+            ]
+            pool.sort(
+                key=lambda e: (
+                    e.format.format_id == video_id,
+                    e.format.format_id in completed,
+                    e.height,
+                    primary is not None and e.format.ext == primary.ext,
+                    e.fps,
+                    e.bitrate,
+                ),
+                reverse=True,
+            )
+            for e in pool:
+                fid = e.format.format_id
+                if e.format.is_audio or partner is None or not self.merge_audio:
+                    add(fid, (fid,))
+                else:
+                    add(f"{fid}+{partner}", (fid, partner))
+            final = self.final_spec
+            if final and primary_height:
+                final = "/".join(f"{alt}[height<=?{primary_height}]" for alt in final.split("/"))
+
+        if final and all(r.spec != final for r in rungs):
+            if len(rungs) >= self.max_rungs:
+                rungs.pop()
+            rungs.append(FormatRung(final))
+        return rungs
+
+    @staticmethod
+    def _resolve(index: FormatIndex, spec: str) -> Optional[tuple[str, ...]]:
+        """Explicit format ids of the spec's first alternative, or None if it has expressions.
+
+        "bestaudio" paired with a known video id resolves to nothing, so the
+        planner picks (and pins) the partner itself.
+        """
+        parts = spec.split("/", 1)[0].split("+")
+        ids = []
+        for part in parts:
+            if index.get(part) is not None:
+                ids.append(part)
+            elif not (part in ("bestaudio", "ba") and len(parts) == 2):
+                return None
+        return tuple(ids) or None
+
+    @staticmethod
+    def _audio_partner(
+        index: FormatIndex, requested: Optional[str], completed: frozenset, failed: frozenset
+    ) -> Optional[str]:
+        if requested and requested not in failed:
+            return requested
+        usable = [e.format.format_id for e in index.audio_by_quality if e.format.format_id not in failed]
+        return next((fid for fid in usable if fid in completed), usable[0] if usable else None)
+
+
+def parse_size(text: str) -> int:
+    """Parse "500MB", "1.5G", "200k" to bytes."""
+    match = re.match(r"^\s*([\d.]+)\s*([kmg]?b?)\s*$", text, re.IGNORECASE)
+    if not match:
+        raise ValueError(f"Invalid size: {text!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2).upper()])
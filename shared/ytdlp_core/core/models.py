@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import zlib
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple, Optional
+
+from ytdlp_core.core.format_index import FormatIndex, FormatSelector
 
 
 class MediaType(Enum):
@@ -27,9 +31,12 @@ class DownloadStatus(Enum):
     CANCELLED = "cancelled"
 
 
-@dataclass(frozen=True)
-class VideoFormat:
-    """Video/audio format info."""
+class VideoFormat(NamedTuple):
+    """Video/audio format info.
+
+    Tuple-backed: a video carries dozens of these, and a NamedTuple has no
+    per-instance ``__dict__``.
+    """
 
     format_id: str
     ext: str
@@ -80,13 +87,77 @@ class VideoFormat:
         return " | ".join(parts) if parts else self.format_id
 
 
+class CompressedText:
+    """Dataclass field descriptor storing long text zlib-compressed.
+
+    The text is decompressed on every read, so a cached VideoInfo only
+    pays for the full description while something is looking at it.
+    """
+
+    threshold = 256
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.attr = "_" + name
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Optional[str]:
+        if obj is None:
+            return None  # dataclass field default
+        value = obj.__dict__.get(self.attr)
+        if isinstance(value, bytes):
+            return zlib.decompress(value).decode("utf-8")
+        return value
+
+    def __set__(self, obj: Any, value: Optional[str]) -> None:
+        if value is not None and len(value) > self.threshold:
+            value = zlib.compress(value.encode("utf-8"))
+        obj.__dict__[self.attr] = value
+
+
+class CompactThumbnails:
+    """Dataclass field descriptor storing yt-dlp thumbnail dicts as tuples.
+
+    Rows are ``(url, width, height, id, preference, extra)`` where `extra`
+    holds any other keys; the dicts are rebuilt on read, with `resolution`
+    derived from width and height.
+    """
+
+    _KEYS = ("url", "width", "height", "id", "preference")
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.attr = "_" + name
+
+    def __get__(self, obj: Any, owner: Optional[type] = None) -> Optional[list[dict]]:
+        if obj is None:
+            return None  # dataclass field default
+        thumbnails = []
+        for row in obj.__dict__.get(self.attr, ()):
+            thumb = {k: v for k, v in zip(self._KEYS, row) if v is not None}
+            if row[1] and row[2]:
+                thumb["resolution"] = f"{row[1]}x{row[2]}"
+            if row[-1]:
+                thumb.update(row[-1])
+            thumbnails.append(thumb)
+        return thumbnails
+
+    def __set__(self, obj: Any, value: Optional[list[dict]]) -> None:
+        rows = []
+        for thumb in value or ():
+            extra = {k: v for k, v in thumb.items() if k not in self._KEYS and k != "resolution"}
+            rows.append((*(thumb.get(k) for k in self._KEYS), extra or None))
+        obj.__dict__[self.attr] = tuple(rows)
+
+
 @dataclass(frozen=True)
 class VideoInfo:
-    """Video metadata."""
+    """Video metadata.
+
+    `description` and `thumbnails` are held in compact form and expanded
+    on access; see CompressedText and CompactThumbnails.
+    """
 
     id: str
     title: str
-    description: Optional[str] = None
+    description: Optional[str] = CompressedText()  # type: ignore[assignment]
     uploader: Optional[str] = None
     uploader_id: Optional[str] = None
     upload_date: Optional[str] = None
@@ -94,7 +165,7 @@ class VideoInfo:
     view_count: Optional[int] = None
     like_count: Optional[int] = None
     thumbnail: Optional[str] = None
-    thumbnails: list[dict] = field(default_factory=list)
+    thumbnails: list[dict] = CompactThumbnails()  # type: ignore[assignment]
     formats: list[VideoFormat] = field(default_factory=list)
     webpage_url: Optional[str] = None
     original_url: Optional[str] = None
@@ -104,32 +175,187 @@ class VideoInfo:
     categories: list[str] = field(default_factory=list)
     tags: list[str] = field(default_factory=list)
 
+    _format_index: Optional[FormatIndex] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def format_index(self) -> FormatIndex:
+        """Index over `formats`, built on first access."""
+        index = self._format_index
+        if index is None:
+            index = FormatIndex(self.formats, self.duration)
+            object.__setattr__(self, "_format_index", index)
+        return index
+
     @property
     def video_formats(self) -> list[VideoFormat]:
-        return [f for f in self.formats if f.is_video]
+        return [e.format for e in self.format_index.video]
 
     @property
     def audio_formats(self) -> list[VideoFormat]:
-        return [f for f in self.formats if f.is_audio_only]
+        return [e.format for e in self.format_index.audio]
 
     @property
     def combined_formats(self) -> list[VideoFormat]:
-        return [f for f in self.formats if f.is_video and f.is_audio]
+        return [e.format for e in self.format_index.combined]
 
     def get_best_video(self, prefer_mp4: bool = True) -> Optional[VideoFormat]:
         """Get highest quality video format."""
-        candidates = self.video_formats
+        index = self.format_index
         if prefer_mp4:
-            candidates = [f for f in candidates if f.ext == "mp4"]
-        if not candidates:
-            return None
-        return max(candidates, key=lambda f: int(f.resolution.replace("p", "")) if f.resolution and f.resolution.endswith("p") else 0)
+            return index.best_video(ext="mp4") or index.best_video()
+        return index.best_video()
 
     def get_best_audio(self) -> Optional[VideoFormat]:
         """Get highest quality audio format."""
-        if not self.audio_formats:
-            return None
-        return max(self.audio_formats, key=lambda f: f.audio_bitrate or 0)
+        return self.format_index.best_audio()
+
+    def select_format(self, selector: FormatSelector | str) -> Optional[VideoFormat]:
+        """Pick a format with a FormatSelector or a rule string like "<=1080p, prefer mp4"."""
+        if isinstance(selector, str):
+            selector = FormatSelector.parse(selector)
+        return selector.select(self.format_index)
+
+
+def parse_rate_limit(limit: str) -> int:
+    """Parse rate limit string (e.g. "500K", "2M") to bytes/s."""
+    limit = limit.strip().upper()
+    if limit.endswith("K"):
+        return int(float(limit[:-1]) * 1024)
+    elif limit.endswith("M"):
+        return int(float(limit[:-1]) * 1024 * 1024)
+    elif limit.endswith("G"):
+        return int(float(limit[:-1]) * 1024 * 1024 * 1024)
+    return int(limit)
+
+
+# Audio-only targets: "mp3" transcodes; the others keep the source codec and
+# only remux (stream copy) when ffmpeg is available
+AUDIO_FORMATS = ("mp3", "m4a", "opus", "best")
+
+_AUDIO_FORMAT_SPECS = {
+    "m4a": "bestaudio[ext=m4a]/bestaudio/best",
+    "opus": "bestaudio[acodec=opus]/bestaudio/best",
+}
+
+
+def audio_format_spec(audio_format: str) -> str:
+    """yt-dlp format spec that fetches only an audio stream, preferring one
+    that already matches `audio_format` so no transcode is needed."""
+    return _AUDIO_FORMAT_SPECS.get(audio_format, "bestaudio/best")
+
+
+def _base_ydl_opts(
+    proxy: Optional[str],
+    ratelimit: Optional[int],
+    retries: int,
+    timeout: int,
+    write_thumbnail: bool,
+    write_subtitles: bool,
+    subtitle_langs: tuple[str, ...],
+    embed_subtitles: bool,
+    embed_thumbnail: bool,
+    post_processors: tuple[dict[str, Any], ...],
+) -> dict[str, Any]:
+    """Build the job-independent part of the yt-dlp options."""
+    opts: dict[str, Any] = {
+        "noplaylist": True,
+        "retries": retries,
+        "socket_timeout": timeout,
+    }
+
+    if proxy:
+        opts["proxy"] = proxy
+
+    if ratelimit:
+        opts["ratelimit"] = ratelimit
+
+    if write_thumbnail or embed_thumbnail:
+        opts["writethumbnail"] = True
+
+    if write_subtitles or embed_subtitles:
+        opts["writesubtitles"] = True
+        opts["subtitleslangs"] = tuple(subtitle_langs)
+
+    pps: list[dict[str, Any]] = []
+    if embed_subtitles:
+        pps.append({"key": "FFmpegEmbedSubtitle", "already_have_subtitle": write_subtitles})
+    if embed_thumbnail:
+        pps.append({"key": "EmbedThumbnail", "already_have_thumbnail": write_thumbnail})
+    pps.extend(dict(pp) for pp in post_processors)
+    opts["postprocessors"] = tuple(pps)
+
+    return opts
+
+
+@dataclass(frozen=True)
+class DownloadProfile:
+    """Validated, immutable download settings shared by many jobs.
+
+    `ydl_opts` is compiled once on construction; jobs copy it instead of
+    re-reading the config store.
+    """
+
+    name: str = "default"
+    proxy: Optional[str] = None
+    rate_limit: Optional[int] = None  # bytes/s
+    retries: int = 3
+    timeout: int = 30
+    write_thumbnail: bool = False
+    write_subtitles: bool = False
+    subtitle_langs: tuple[str, ...] = ()
+    embed_subtitles: bool = False
+    embed_thumbnail: bool = False
+    post_processors: tuple[dict[str, Any], ...] = ()
+    ydl_opts: Mapping[str, Any] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        opts = _base_ydl_opts(
+            proxy=self.proxy,
+            ratelimit=self.rate_limit,
+            retries=self.retries,
+            timeout=self.timeout,
+            write_thumbnail=self.write_thumbnail,
+            write_subtitles=self.write_subtitles,
+            subtitle_langs=self.subtitle_langs,
+            embed_subtitles=self.embed_subtitles,
+            embed_thumbnail=self.embed_thumbnail,
+            post_processors=self.post_processors,
+        )
+        object.__setattr__(self, "ydl_opts", MappingProxyType(opts))
+
+    def to_options(
+        self,
+        url: str,
+        output_path: Path,
+        format_id: str,
+        media_type: MediaType = MediaType.VIDEO,
+        filename_template: str = "%(title)s.%(ext)s",
+        ffmpeg_path: Optional[str] = None,
+        audio_format: str = "mp3",
+    ) -> DownloadOptions:
+        """Create per-job options backed by this profile."""
+        return DownloadOptions(
+            url=url,
+            output_path=output_path,
+            format_id=format_id,
+            media_type=media_type,
+            filename_template=filename_template,
+            ffmpeg_path=ffmpeg_path,
+            audio_format=audio_format,
+            proxy=self.proxy,
+            rate_limit=str(self.rate_limit) if self.rate_limit else None,
+            retries=self.retries,
+            timeout=self.timeout,
+            write_thumbnail=self.write_thumbnail,
+            write_subtitles=self.write_subtitles,
+            subtitle_langs=list(self.subtitle_langs),
+            embed_subtitles=self.embed_subtitles,
+            embed_thumbnail=self.embed_thumbnail,
+            post_processors=self.post_processors,
+            profile=self,
+        )
 
 
 @dataclass(frozen=True)
@@ -142,6 +368,7 @@ class DownloadOptions:
     media_type: MediaType = MediaType.VIDEO
     filename_template: str = "%(title)s.%(ext)s"
     ffmpeg_path: Optional[str] = None
+    audio_format: str = "mp3"  # one of AUDIO_FORMATS; used for AUDIO_ONLY
     proxy: Optional[str] = None
     rate_limit: Optional[str] = None
     retries: int = 3
@@ -149,52 +376,64 @@ class DownloadOptions:
     write_thumbnail: bool = False
     write_subtitles: bool = False
     subtitle_langs: list[str] = field(default_factory=list)
+    embed_subtitles: bool = False
+    embed_thumbnail: bool = False
+    post_processors: tuple[dict[str, Any], ...] = ()
+    format_fallback: bool = True  # walk a FormatFallbackPlanner ladder when the format fails
+    profile: Optional[DownloadProfile] = field(default=None, repr=False, compare=False)
 
     def to_ydl_opts(self) -> dict[str, Any]:
         """Convert to yt-dlp options dict."""
-        opts = {
-            "format": self.format_id,
-            "outtmpl": str(self.output_path / self.filename_template),
-            "noplaylist": True,
-            "retries": self.retries,
-            "socket_timeout": self.timeout,
-        }
-
-        if self.proxy:
-            opts["proxy"] = self.proxy
-
-        if self.rate_limit:
-            opts["ratelimit"] = self._parse_rate_limit(self.rate_limit)
+        if self.profile is not None:
+            opts = dict(self.profile.ydl_opts)
+        else:
+            opts = _base_ydl_opts(
+                proxy=self.proxy,
+                ratelimit=parse_rate_limit(self.rate_limit) if self.rate_limit else None,
+                retries=self.retries,
+                timeout=self.timeout,
+                write_thumbnail=self.write_thumbnail,
+                write_subtitles=self.write_subtitles,
+                subtitle_langs=tuple(self.subtitle_langs),
+                embed_subtitles=self.embed_subtitles,
+                embed_thumbnail=self.embed_thumbnail,
+                post_processors=self.post_processors,
+            )
+
+        opts["format"] = self.format_id
+        opts["outtmpl"] = str(self.output_path / self.filename_template)
 
         if self.ffmpeg_path:
             opts["ffmpeg_location"] = self.ffmpeg_path
 
+        # Copy nested values so yt-dlp never mutates the shared profile
+        pps = [dict(pp) for pp in opts.get("postprocessors", ())]
         if self.media_type == MediaType.AUDIO_ONLY:
-            opts["postprocessors"] = [{
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": "192",
-            }]
-
-        if self.write_thumbnail:
-            opts["writethumbnail"] = True
-
-        if self.write_subtitles:
-            opts["writesubtitles"] = True
-            opts["subtitleslangs"] = self.subtitle_langs
+            if self.format_id in ("best", "bestaudio"):
+                # Never fetch a video stream just to throw it away
+                opts["format"] = audio_format_spec(self.audio_format)
+            if self.audio_format == "mp3":
+                pps.insert(0, {
+                    "key": "FFmpegExtractAudio",
+                    "preferredcodec": "mp3",
+                    "preferredquality": "192",
+                })
+            elif self.ffmpeg_path:
+                # Same codec in and out: yt-dlp stream-copies into the container
+                pps.insert(0, {"key": "FFmpegExtractAudio", "preferredcodec": self.audio_format})
+        if pps:
+            opts["postprocessors"] = pps
+        else:
+            opts.pop("postprocessors", None)
+
+        if "subtitleslangs" in opts:
+            opts["subtitleslangs"] = list(opts["subtitleslangs"])
 
         return opts
 
     def _parse_rate_limit(self, limit: str) -> int:
         """Parse rate limit string to bytes/s."""
-        limit = limit.upper()
-        if limit.endswith("K"):
-            return int(float(limit[:-1]) * 1024)
-        elif limit.endswith("M"):
-            return int(float(limit[:-1]) * 1024 * 1024)
-        elif limit.endswith("G"):
-            return int(float(limit[:-1]) * 1024 * 1024 * 1024)
-        return int(limit)
+        return parse_rate_limit(limit)
 
 
 @dataclass(frozen=True)
@@ -218,4 +457,9 @@ class DownloadResult:
     success: bool
     output_path: Optional[Path] = None
     video_info: Optional[VideoInfo] = None
-    error: Optional[str] = None
\ No newline at end of file
+    error: Optional[str] = None
+    timings: dict[str, float] = field(default_factory=dict)  # phase -> seconds
+    downloaded_bytes: int = 0
+    format_used: Optional[str] = None  # yt-dlp format spec that succeeded
+    fallbacks: int = 0  # ladder rungs that failed before it
+    sidecar_seconds_saved: float = 0.0  # subtitle/thumbnail fetching overlapped with the transfer
@@ -7,6 +7,7 @@ from ytdlp_core.domain.exceptions import (
     DownloadError,
     ExtractionError,
     FFmpegNotFoundError,
+    InsufficientSpaceError,
     ValidationError,
 )
 from ytdlp_core.domain.ports import (
@@ -15,6 +16,7 @@ from ytdlp_core.domain.ports import (
     IDownloader,
     IFFmpegLocator,
     IPlatformService,
+    IThumbnailStore,
     IVideoInfoExtractor,
 )
 
@@ -24,6 +26,7 @@ __all__ = [
     "ExtractionError",
     "DownloadError",
     "FFmpegNotFoundError",
+    "InsufficientSpaceError",
     "CancellationError",
     "ConfigurationError",
     "IVideoInfoExtractor",
@@ -32,4 +35,5 @@ __all__ = [
     "IConfigStore",
     "ICacheStore",
     "IPlatformService",
+    "IThumbnailStore",
 ]
\ No newline at end of file
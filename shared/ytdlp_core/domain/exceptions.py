@@ -13,6 +13,10 @@ class YtdlpCoreError(Exception):
         self.original = original
 
 
+# Alias kept for the public API name used by the package exports
+DomainError = YtdlpCoreError
+
+
 class ExtractionError(YtdlpCoreError):
     """Video info extraction failed."""
 
@@ -27,6 +31,15 @@ class DownloadError(YtdlpCoreError):
     pass
 
 
+class InsufficientSpaceError(DownloadError):
+    """Not enough free disk space for the expected output."""
+
+    def __init__(self, message: str, required: int = 0, available: int = 0):
+        super().__init__(message)
+        self.required = required
+        self.available = available
+
+
 class CancellationError(YtdlpCoreError):
     """Operation was cancelled."""
 
@@ -39,6 +52,12 @@ class FFmpegError(YtdlpCoreError):
     pass
 
 
+class FFmpegNotFoundError(FFmpegError):
+    """FFmpeg executable could not be located."""
+
+    pass
+
+
 class ValidationError(YtdlpCoreError):
     """Input validation failed."""
 
@@ -48,4 +67,10 @@ class ValidationError(YtdlpCoreError):
 class ConfigurationError(YtdlpCoreError):
     """Configuration error."""
 
-    pass
\ No newline at end of file
+    pass
+
+
+class SerializationError(YtdlpCoreError):
+    """Encoding or decoding a record failed."""
+
+    pass
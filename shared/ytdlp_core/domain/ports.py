@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import shutil
+import threading
+import time
 from abc import ABC, abstractmethod
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
-from typing import Any, Callable, Optional, Protocol
+from typing import Any, Callable, ContextManager, Iterator, Mapping, Optional, Protocol, Sequence
 
 from ytdlp_core.core.models import (
     DownloadOptions,
@@ -29,6 +33,10 @@ class IVideoInfoExtractor(ABC):
         """Check if URL is supported."""
         ...
 
+    def warm_up(self, probe_url: Optional[str] = None) -> None:
+        """Pay one-time initialization costs before the first real call."""
+        pass
+
 
 class IDownloader(ABC):
     """Port for downloading media."""
@@ -38,8 +46,13 @@ class IDownloader(ABC):
         self,
         options: DownloadOptions,
         progress_callback: Optional[Callable[[DownloadProgress], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
     ) -> DownloadResult:
-        """Download media with progress updates."""
+        """Download media with progress updates.
+
+        Setting `cancel_event` (also before the call) cancels this job with
+        CancellationError; without one, each call gets a fresh event.
+        """
         ...
 
     @abstractmethod
@@ -57,8 +70,81 @@ class IFFmpegLocator(ABC):
         ...
 
 
+class IFFmpegService(ABC):
+    """Port for ffmpeg processing."""
+
+    @property
+    @abstractmethod
+    def ffmpeg_path(self) -> str:
+        ...
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        ...
+
+    @abstractmethod
+    def convert_to_mp3(self, input_path: Path, output_path: Path, bitrate: int = 192) -> Path:
+        ...
+
+    @abstractmethod
+    def merge_video_audio(self, video_path: Path, audio_path: Path, output_path: Path) -> Path:
+        ...
+
+    @abstractmethod
+    def extract_audio(
+        self, input_path: Path, output_path: Path, format: str = "mp3", bitrate: int = 192
+    ) -> Path:
+        ...
+
+
+class IMetricsSink(ABC):
+    """Port for counters and timings.
+
+    Names are unprefixed and snake_case (e.g. ``phase_seconds``); exporters
+    add their own prefix and suffixes.
+    """
+
+    @abstractmethod
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Mapping[str, str]] = None) -> None:
+        """Add `value` to a counter."""
+        ...
+
+    @abstractmethod
+    def observe(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+        """Record one sample of a distribution (usually seconds)."""
+        ...
+
+    @contextmanager
+    def span(self, phase: str, labels: Optional[Mapping[str, str]] = None) -> Iterator[None]:
+        """Time the block as ``phase_seconds{phase=...}``, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("phase_seconds", time.perf_counter() - start, {"phase": phase, **(labels or {})})
+
+
+class NullMetricsSink(IMetricsSink):
+    """Discards everything; the default when no sink is configured."""
+
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Mapping[str, str]] = None) -> None:
+        pass
+
+    def observe(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+        pass
+
+
 class IConfigStore(ABC):
-    """Port for persistent config."""
+    """Port for persistent config.
+
+    Implementations call ``super().__init__()`` and `_notify` after every
+    change, without holding their own lock: listeners may read the store
+    or take locks of their own.
+    """
+
+    def __init__(self) -> None:
+        self._listeners: list[Callable[[str, Any], None]] = []
+        self._listeners_lock = threading.Lock()
 
     @abstractmethod
     def get(self, key: str, default: Any = None) -> Any:
@@ -72,6 +158,31 @@ class IConfigStore(ABC):
     def get_all(self) -> dict[str, Any]:
         ...
 
+    def batch(self) -> ContextManager[None]:
+        """Group several `set` calls into a single write."""
+        return nullcontext()
+
+    def flush(self) -> None:
+        """Persist pending changes immediately."""
+        pass
+
+    def subscribe(self, listener: Callable[[str, Any], None]) -> Callable[[], None]:
+        """Call `listener(key, value)` after each change; returns an unsubscribe function."""
+        with self._listeners_lock:
+            self._listeners.append(listener)
+        return lambda: self._unsubscribe(listener)
+
+    def _unsubscribe(self, listener: Callable[[str, Any], None]) -> None:
+        with self._listeners_lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self, key: str, value: Any) -> None:
+        with self._listeners_lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(key, value)
+
 
 class ICacheStore(ABC):
     """Port for caching video info."""
@@ -89,6 +200,15 @@ class ICacheStore(ABC):
         ...
 
 
+class IThumbnailStore(ABC):
+    """Port for thumbnail images, fetched once and cached."""
+
+    @abstractmethod
+    def fetch(self, urls: Sequence[str]) -> Optional[tuple[str, bytes]]:
+        """(url, bytes) of the first of `urls` (best first) that loads; None if none do."""
+        ...
+
+
 class IPlatformService(ABC):
     """Port for platform-specific operations."""
 
@@ -106,4 +226,11 @@ class IPlatformService(ABC):
 
     @abstractmethod
     def show_notification(self, title: str, message: str) -> None:
-        ...
\ No newline at end of file
+        ...
+
+    def get_free_space(self, path: Path) -> Optional[int]:
+        """Free bytes on the volume holding `path`, or None if it can't be told."""
+        try:
+            return shutil.disk_usage(path).free
+        except OSError:
+            return None
\ No newline at end of file
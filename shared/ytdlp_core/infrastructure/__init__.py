@@ -1,18 +1,64 @@
-"""Infrastructure layer implementations."""
-
-from ytdlp_core.infrastructure.yt_dlp_impl import YtDlpDownloader, YtDlpVideoInfoExtractor
-from ytdlp_core.infrastructure.platform import (
-    FFmpegLocator,
-    JsonConfigStore,
-    MemoryCacheStore,
-    DesktopPlatformService,
-)
-
-__all__ = [
-    "YtDlpDownloader",
-    "YtDlpVideoInfoExtractor",
-    "FFmpegLocator",
-    "JsonConfigStore",
-    "MemoryCacheStore",
-    "DesktopPlatformService",
-]
\ No newline at end of file
+"""Infrastructure layer implementations.
+
+Exports are resolved lazily so that importing e.g. the config store does not
+import yt-dlp.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ytdlp_core.infrastructure.ffmpeg_service import FFmpegService
+    from ytdlp_core.infrastructure.metrics import (
+        CompositeMetricsSink,
+        JsonlMetricsSink,
+        MetricsRegistry,
+        PrometheusExporter,
+    )
+    from ytdlp_core.infrastructure.platform import (
+        DesktopPlatformService,
+        FFmpegLocator,
+        JsonConfigStore,
+        MemoryCacheStore,
+        MemoryConfigStore,
+    )
+    from ytdlp_core.infrastructure.proxy_pool import ProxyPool
+    from ytdlp_core.infrastructure.session_pool import YoutubeDLSessionPool
+    from ytdlp_core.infrastructure.thumbnails import ThumbnailDiskCache, ThumbnailService
+    from ytdlp_core.infrastructure.yt_dlp_impl import YtDlpDownloader, YtDlpVideoInfoExtractor
+
+_EXPORTS = {
+    "YtDlpDownloader": "ytdlp_core.infrastructure.yt_dlp_impl",
+    "YtDlpVideoInfoExtractor": "ytdlp_core.infrastructure.yt_dlp_impl",
+    "YoutubeDLSessionPool": "ytdlp_core.infrastructure.session_pool",
+    "ProxyPool": "ytdlp_core.infrastructure.proxy_pool",
+    "FFmpegLocator": "ytdlp_core.infrastructure.platform",
+    "JsonConfigStore": "ytdlp_core.infrastructure.platform",
+    "MemoryCacheStore": "ytdlp_core.infrastructure.platform",
+    "MemoryConfigStore": "ytdlp_core.infrastructure.platform",
+    "DesktopPlatformService": "ytdlp_core.infrastructure.platform",
+    "FFmpegService": "ytdlp_core.infrastructure.ffmpeg_service",
+    "MetricsRegistry": "ytdlp_core.infrastructure.metrics",
+    "CompositeMetricsSink": "ytdlp_core.infrastructure.metrics",
+    "JsonlMetricsSink": "ytdlp_core.infrastructure.metrics",
+    "PrometheusExporter": "ytdlp_core.infrastructure.metrics",
+    "ThumbnailDiskCache": "ytdlp_core.infrastructure.thumbnails",
+    "ThumbnailService": "ytdlp_core.infrastructure.thumbnails",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + __all__)
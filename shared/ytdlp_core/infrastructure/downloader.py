@@ -2,21 +2,171 @@
 
 from __future__ import annotations
 
+import contextlib
+import copy
+import logging
+import re
 import threading
+import time
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Optional
 
-import yt_dlp
+from ytdlp_core.core.format_index import FormatFallbackPlanner, FormatIndex, FormatRung
+from ytdlp_core.core.models import (
+    DownloadOptions,
+    DownloadProgress,
+    DownloadResult,
+    DownloadStatus,
+    MediaType,
+    VideoFormat,
+)
+from ytdlp_core.domain.ports import IDownloader, IMetricsSink, IThumbnailStore, NullMetricsSink
+from ytdlp_core.domain.exceptions import CancellationError, DownloadError, InsufficientSpaceError
+from ytdlp_core.infrastructure.extractor import parse_formats
+from ytdlp_core.infrastructure.preallocate import preallocate
+from ytdlp_core.infrastructure.proxy_pool import ProxyPool, video_key
+from ytdlp_core.infrastructure.session_pool import YoutubeDLSessionPool
+from ytdlp_core.infrastructure.sidecars import SidecarStage, thumbnail_entry
+from ytdlp_core.infrastructure.thumbnails import thumbnail_candidates
 
-from ytdlp_core.core.models import DownloadOptions, DownloadProgress, DownloadResult, DownloadStatus
-from ytdlp_core.domain.ports import IDownloader
-from ytdlp_core.domain.exceptions import CancellationError, DownloadError
+if TYPE_CHECKING:
+    import yt_dlp
+
+logger = logging.getLogger(__name__)
+
+# yt-dlp postprocessor name -> job phase
+_PP_PHASES = {
+    "Merger": "merge",
+    "ExtractAudio": "audio_extraction",
+    "MoveFiles": "finalize",
+}
+
+# yt-dlp errors that are specific to one format: the stream is gone,
+# forbidden or broken, so another format may still work. Network and
+# site-wide errors are not in here - a different format wouldn't help.
+_FORMAT_ERRORS = re.compile(
+    r"HTTP Error (?:403|404|410|416)"
+    r"|Requested format is not available"
+    r"|fragment \d+ not found"
+    r"|The downloaded file is empty"
+    r"|Did not get any data blocks"
+    r"|content too short",
+    re.IGNORECASE,
+)
+
+# Smaller transfers are not worth a fallocate call
+_PREALLOCATE_MIN_BYTES = 8 * 1024 * 1024
+
+
+class _JobRecorder:
+    """Collect phase timings, bytes and retries for one download.
+
+    Also passed to yt-dlp as its ``logger`` so retry messages can be counted.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.timings: dict[str, float] = {}
+        self.bytes = 0
+        self.retries = 0
+        self.filepath: Optional[str] = None  # final file as reported by yt-dlp
+        self.current_format: Optional[str] = None  # format id being transferred
+        self.rung_formats: set[str] = set()  # format ids the current rung touched
+        self.completed: dict[str, str] = {}  # format id -> finished file
+        self.files: dict[str, set[str]] = {}  # format id -> files it wrote, .part included
+        self.sidecar_saved = 0.0
+        self._first_byte: Optional[float] = None
+        self._transfer_end: Optional[float] = None
+        self._pp_started: dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def on_progress(self, d: dict[str, Any]) -> None:
+        now = time.perf_counter()
+        format_id = (d.get("info_dict") or {}).get("format_id")
+        if format_id:
+            self.current_format = format_id
+            self.rung_formats.add(format_id)
+            self.files.setdefault(format_id, set()).update(
+                name for name in (d.get("filename"), d.get("tmpfilename")) if name
+            )
+        if d.get("status") == "downloading" and self._first_byte is None and d.get("downloaded_bytes"):
+            self._first_byte = now
+            self.timings["first_byte"] = now - self.started
+        elif d.get("status") == "finished":
+            self._transfer_end = now
+            if format_id not in self.completed:
+                # A component reused from an earlier rung is reported again
+                self.bytes += d.get("total_bytes") or d.get("downloaded_bytes") or 0
+            if format_id:
+                self.completed[format_id] = d.get("filename") or ""
+            self.filepath = d.get("filename") or self.filepath
+
+    def start_rung(self) -> None:
+        self.current_format = None
+        self.rung_formats = set()
+
+    def failed_formats(self, rung: FormatRung) -> set[str]:
+        """Format ids to blame after `rung` failed: the unfinished transfer, else its unfetched parts."""
+        if self.current_format and self.current_format not in self.completed:
+            return {self.current_format}
+        return {fid for fid in rung.format_ids if fid not in self.completed}
+
+    def on_postprocess(self, d: dict[str, Any]) -> None:
+        name = d.get("postprocessor", "")
+        if d.get("status") == "started":
+            self._pp_started[name] = time.perf_counter()
+        elif d.get("status") == "finished":
+            self.filepath = (d.get("info_dict") or {}).get("filepath") or self.filepath
+            if name in self._pp_started:
+                self.add(_PP_PHASES.get(name, "postprocess"), time.perf_counter() - self._pp_started.pop(name))
+
+    def finish(self) -> dict[str, float]:
+        if "download" in self.timings:
+            return self.timings
+        if self._first_byte is not None and self._transfer_end is not None:
+            self.timings["transfer"] = self._transfer_end - self._first_byte
+        self.timings["download"] = time.perf_counter() - self.started
+        return self.timings
+
+    # yt-dlp logger interface
+    def _count_retry(self, msg: str) -> None:
+        if "Retrying" in msg:
+            self.retries += 1
+
+    def debug(self, msg: str) -> None:
+        self._count_retry(msg)
+
+    def info(self, msg: str) -> None:
+        pass
+
+    def warning(self, msg: str) -> None:
+        self._count_retry(msg)
+        logger.debug("yt-dlp: %s", msg)
+
+    def error(self, msg: str) -> None:
+        logger.debug("yt-dlp: %s", msg)
 
 
 class YtDlpDownloader(IDownloader):
     """Video downloader using yt-dlp."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        session_pool: Optional[YoutubeDLSessionPool] = None,
+        metrics: Optional[IMetricsSink] = None,
+        thumbnails: Optional[IThumbnailStore] = None,
+        preallocate_files: bool = True,
+        proxy_pool: Optional[ProxyPool] = None,
+        parallel_sidecars: bool = True,
+    ):
+        self.session_pool = session_pool or YoutubeDLSessionPool()
+        self.metrics = metrics or NullMetricsSink()
+        self.thumbnails = thumbnails
+        self.preallocate_files = preallocate_files
+        self.proxy_pool = proxy_pool  # used unless the options name a proxy
+        self.parallel_sidecars = parallel_sidecars
         self._cancel_event = threading.Event()
         self._current_ydl: Optional[yt_dlp.YoutubeDL] = None
 
@@ -24,44 +174,213 @@ class YtDlpDownloader(IDownloader):
         self,
         options: DownloadOptions,
         progress_callback: Optional[Callable[[DownloadProgress], None]] = None,
+        cancel_event: Optional[threading.Event] = None,
     ) -> DownloadResult:
-        """Download video using yt-dlp."""
-        self._cancel_event.clear()
+        """Download video using a pooled yt-dlp session."""
+        import yt_dlp  # deferred: importing yt-dlp is slow
+
+        # Never cleared: a cancel that arrives before the transfer starts still counts
+        self._cancel_event = cancel_event or threading.Event()
+        if self._cancel_event.is_set():
+            raise CancellationError("Download cancelled by user")
+        recorder = _JobRecorder()
+        preallocated: set[str] = set()
 
         def progress_hook(d: dict[str, Any]) -> None:
             if self._cancel_event.is_set():
                 raise CancellationError("Download cancelled by user")
 
+            recorder.on_progress(d)
+            if self.preallocate_files:
+                self._preallocate(d, preallocated)
             if progress_callback:
                 progress = self._parse_progress(d)
                 progress_callback(progress)
 
         ydl_opts = options.to_ydl_opts()
+        # Progress goes to the callback; keep yt-dlp off the console
+        ydl_opts.update(quiet=True, no_warnings=True, noprogress=True, logger=recorder)
         ydl_opts["progress_hooks"] = [progress_hook]
+        ydl_opts["postprocessor_hooks"] = [recorder.on_postprocess]
 
         try:
-            self._current_ydl = yt_dlp.YoutubeDL(ydl_opts)
-            self._current_ydl.download([options.url])
+            with self._proxy(options) as proxy:
+                if proxy:
+                    ydl_opts["proxy"] = proxy
+                with self.session_pool.session(ydl_opts) as session:
+                    with session.configured(ydl_opts) as ydl:
+                        self._current_ydl = ydl
+                        if options.format_fallback:
+                            rung, fallbacks = self._download_ladder(ydl, options, recorder)
+                        else:
+                            ydl.download([options.url])
+                            rung, fallbacks = FormatRung(ydl_opts["format"]), 0
 
             # Find downloaded file
-            output_path = self._find_downloaded_file(options)
+            finalize_start = time.perf_counter()
+            if fallbacks:
+                self._remove_leftovers(recorder)
+            output_path = self._find_downloaded_file(options, recorder.filepath)
+            recorder.add("finalize", time.perf_counter() - finalize_start)
 
             return DownloadResult(
                 success=True,
                 output_path=output_path,
                 video_info=None,  # Could extract info again if needed
+                timings=recorder.finish(),
+                downloaded_bytes=recorder.bytes,
+                format_used=rung.spec,
+                fallbacks=fallbacks,
+                sidecar_seconds_saved=recorder.sidecar_saved,
             )
 
         except yt_dlp.DownloadError as e:
             if "cancelled" in str(e).lower():
                 raise CancellationError("Download cancelled")
             raise DownloadError(str(e), original=e)
-        except CancellationError:
+        except (CancellationError, InsufficientSpaceError):
             raise
         except Exception as e:
             raise DownloadError(f"Download failed: {e}", original=e)
         finally:
             self._current_ydl = None
+            self._record(recorder)
+
+    def _proxy(self, options: DownloadOptions) -> ContextManager[Optional[str]]:
+        """The pool's sticky proxy for this video, so it matches the extraction's."""
+        if self.proxy_pool is None or options.proxy:
+            return contextlib.nullcontext(None)
+        return self.proxy_pool.lease(video_key(options.url))
+
+    def _download_ladder(
+        self, ydl: yt_dlp.YoutubeDL, options: DownloadOptions, recorder: _JobRecorder
+    ) -> tuple[FormatRung, int]:
+        """Extract once, then try format rungs until one downloads; returns (rung, failed rungs).
+
+        Only errors matching _FORMAT_ERRORS move down the ladder; finished
+        component files stay on disk so a later rung that shares them skips
+        the transfer. Subtitles and thumbnails are fetched by a SidecarStage
+        while the rungs run.
+        """
+        requested = ydl.params["format"]
+        ie_result = ydl.extract_info(options.url, download=False, process=False)
+        formats = parse_formats(ie_result.get("formats") or []) if ie_result else []
+        if not formats:
+            # Playlists and redirects: no format list to plan with
+            if ie_result and ydl.params.get("writethumbnail"):
+                self._use_cached_thumbnail(ie_result)
+            ydl.process_ie_result(ie_result, download=True)
+            return FormatRung(requested), 0
+
+        sidecars = SidecarStage.start(ydl, ie_result, self.thumbnails) if self.parallel_sidecars else None
+        if sidecars is None and ydl.params.get("writethumbnail"):
+            self._use_cached_thumbnail(ie_result)
+        try:
+            return self._run_ladder(ydl, options, recorder, ie_result, formats, requested)
+        finally:
+            if sidecars is not None:
+                sidecars.close()
+                if sidecars.joined:
+                    recorder.add("sidecars", sidecars.waited)
+                    recorder.sidecar_saved = sidecars.saved
+
+    def _run_ladder(
+        self,
+        ydl: yt_dlp.YoutubeDL,
+        options: DownloadOptions,
+        recorder: _JobRecorder,
+        ie_result: dict[str, Any],
+        formats: list[VideoFormat],
+        requested: str,
+    ) -> tuple[FormatRung, int]:
+        import yt_dlp  # deferred: importing yt-dlp is slow
+
+        index = FormatIndex(formats, ie_result.get("duration"))
+        planner = FormatFallbackPlanner(merge_audio=bool(options.ffmpeg_path))
+        audio_only = options.media_type == MediaType.AUDIO_ONLY
+        tried: list[str] = []
+        failed: set[str] = set()
+        error: Optional[Exception] = None
+        while True:
+            ladder = planner.plan(index, requested, audio_only, recorder.completed, failed)
+            rung = next((r for r in ladder if r.spec not in tried), None)
+            if rung is None:
+                raise error
+            tried.append(rung.spec)
+            recorder.start_rung()
+            ydl.params["format"] = rung.spec
+            ydl.format_selector = ydl.build_format_selector(rung.spec)
+            try:
+                # process_ie_result mutates the dict; each rung gets a fresh copy
+                ydl.process_ie_result(copy.deepcopy(ie_result), download=True)
+                return rung, len(tried) - 1
+            except (yt_dlp.DownloadError, yt_dlp.utils.ExtractorError) as e:
+                if self._cancel_event.is_set() or not _FORMAT_ERRORS.search(str(e)):
+                    raise
+                error = e
+                failed |= recorder.failed_formats(rung)
+                self.metrics.increment("format_fallbacks")
+                logger.info("Format %s failed for %s, trying the next one: %s", rung.spec, options.url, e)
+
+    def _preallocate(self, d: dict[str, Any], done: set[str]) -> None:
+        """Allocate a stream's blocks once its exact size is known (direct HTTP transfers)."""
+        path = d.get("tmpfilename")
+        total = d.get("total_bytes")
+        if d.get("status") != "downloading" or not path or not total or path in done:
+            return
+        done.add(path)
+        if total - (d.get("downloaded_bytes") or 0) < _PREALLOCATE_MIN_BYTES:
+            return
+        try:
+            if preallocate(path, total):
+                self.metrics.increment("preallocated_bytes", total)
+        except OSError as e:
+            raise InsufficientSpaceError(
+                f"Not enough disk space for {Path(path).name}: {e.strerror}", required=total
+            ) from e
+
+    def _use_cached_thumbnail(self, ie_result: dict[str, Any]) -> None:
+        """Point yt-dlp's thumbnail at the store's bytes so writing/embedding skips the fetch.
+
+        The image travels as a data: URI, which yt-dlp opens like any other
+        URL. If the store has nothing, yt-dlp fetches the thumbnail itself.
+        """
+        if self.thumbnails is None:
+            return
+        urls = thumbnail_candidates(ie_result.get("thumbnails") or (), ie_result.get("thumbnail"))
+        found = self.thumbnails.fetch(urls) if urls else None
+        if found is None:
+            return
+        url, data = found
+        ie_result["thumbnails"] = [thumbnail_entry(data)]
+        ie_result.pop("thumbnail", None)
+        logger.debug("Using cached thumbnail %s", url)
+
+    def _remove_leftovers(self, recorder: _JobRecorder) -> None:
+        """Delete component files of failed rungs that the successful one didn't use."""
+        keep = {recorder.filepath}
+        for format_id, paths in recorder.files.items():
+            if format_id in recorder.rung_formats:
+                continue
+            for path in paths - keep:
+                for candidate in (Path(path), Path(path + ".part")):
+                    try:
+                        candidate.unlink()
+                    except FileNotFoundError:
+                        pass
+                    except OSError:
+                        logger.debug("Could not remove %s", candidate, exc_info=True)
+
+    def _record(self, recorder: _JobRecorder) -> None:
+        timings = recorder.finish()
+        for phase, seconds in timings.items():
+            self.metrics.observe("phase_seconds", seconds, {"phase": phase})
+        if recorder.bytes:
+            self.metrics.increment("downloaded_bytes", recorder.bytes)
+        if recorder.retries:
+            self.metrics.increment("retries", recorder.retries)
+        if recorder.sidecar_saved:
+            self.metrics.observe("sidecar_seconds_saved", recorder.sidecar_saved)
 
     def cancel(self) -> None:
         """Cancel ongoing download."""
@@ -106,17 +425,22 @@ class YtDlpDownloader(IDownloader):
 
         elif status == "error":
             return DownloadProgress(
-                status=DownloadStatus.ERROR,
+                status=DownloadStatus.FAILED,
                 error=d.get("error", "Unknown error"),
                 percent=0.0,
             )
 
         return DownloadProgress(status=DownloadStatus.PENDING)
 
-    def _find_downloaded_file(self, options: DownloadOptions) -> Optional[Path]:
+    def _find_downloaded_file(self, options: DownloadOptions, reported: Optional[str] = None) -> Optional[Path]:
         """Find the downloaded file based on output template."""
         import glob
 
+        # Prefer the path yt-dlp reported: with concurrent jobs sharing a
+        # directory the newest file may belong to another job
+        if reported and Path(reported).exists():
+            return Path(reported)
+
         # The template might have %(title)s etc, so we glob the directory
         pattern = str(options.output_path / "*")
         files = glob.glob(pattern)
@@ -124,6 +448,6 @@ class YtDlpDownloader(IDownloader):
         # Filter by modification time (recent files)
         if files:
             # Return the most recently modified file
-            return max(files, key=lambda f: Path(f).stat().st_mtime)
+            return Path(max(files, key=lambda f: Path(f).stat().st_mtime))
 
         return None
\ No newline at end of file
@@ -2,13 +2,57 @@
 
 from __future__ import annotations
 
-from typing import Any, Optional
-
-import yt_dlp
+import contextlib
+import sys
+from typing import Any, ContextManager, Optional
 
 from ytdlp_core.core.models import VideoFormat, VideoInfo
 from ytdlp_core.domain.ports import IVideoInfoExtractor
 from ytdlp_core.domain.exceptions import ExtractionError, ValidationError
+from ytdlp_core.infrastructure.proxy_pool import ProxyPool, video_key
+from ytdlp_core.infrastructure.session_pool import YoutubeDLSessionPool
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Share repeated short strings (codecs, exts, protocols) across formats."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def parse_formats(raw_formats: list[dict[str, Any]]) -> list[VideoFormat]:
+    """Convert yt-dlp format dicts to VideoFormat, skipping storyboard-style entries."""
+    formats = []
+    for f in raw_formats:
+        if f.get("vcodec") == "none" and f.get("acodec") == "none":
+            continue
+
+        vcodec = f.get("vcodec", "none")
+        acodec = f.get("acodec", "none")
+        height = f.get("height")
+        width = f.get("width")
+
+        resolution = None
+        if height and width:
+            resolution = f"{width}x{height}"
+        elif height:
+            resolution = f"{height}p"
+
+        formats.append(
+            VideoFormat(
+                format_id=_intern(f.get("format_id", "")),
+                ext=_intern(f.get("ext", "unknown")),
+                resolution=_intern(resolution),
+                fps=f.get("fps"),
+                vcodec=_intern(vcodec) if vcodec != "none" else None,
+                acodec=_intern(acodec) if acodec != "none" else None,
+                bitrate=f.get("tbr"),  # total bitrate
+                audio_bitrate=f.get("abr"),
+                video_bitrate=f.get("vbr"),
+                filesize=f.get("filesize") or f.get("filesize_approx"),
+                protocol=_intern(f.get("protocol", "")),
+                format_note=_intern(f.get("format_note", "")),
+            )
+        )
+    return formats
 
 
 class YtDlpVideoInfoExtractor(IVideoInfoExtractor):
@@ -24,9 +68,17 @@ class YtDlpVideoInfoExtractor(IVideoInfoExtractor):
         r"^(https?://)?(www\.)?youtube\.com/@[\w-]+",
     ]
 
-    def __init__(self, timeout: int = 10, proxy: Optional[str] = None):
+    def __init__(
+        self,
+        timeout: int = 10,
+        proxy: Optional[str] = None,
+        session_pool: Optional[YoutubeDLSessionPool] = None,
+        proxy_pool: Optional[ProxyPool] = None,
+    ):
         self.timeout = timeout
         self.proxy = proxy
+        self.session_pool = session_pool or YoutubeDLSessionPool()
+        self.proxy_pool = proxy_pool  # takes precedence over `proxy`
 
     def validate_url(self, url: str) -> bool:
         """Validate if URL matches YouTube patterns."""
@@ -34,8 +86,13 @@ class YtDlpVideoInfoExtractor(IVideoInfoExtractor):
 
         return any(re.match(pattern, url) for pattern in self.YOUTUBE_PATTERNS)
 
-    def extract_info(self, url: str) -> VideoInfo:
-        """Extract video info using yt-dlp."""
+    def _proxy(self, url: Optional[str] = None) -> ContextManager[Optional[str]]:
+        """Proxy for a request about `url`; from the pool, the video's sticky one."""
+        if self.proxy_pool is None:
+            return contextlib.nullcontext(self.proxy)
+        return self.proxy_pool.lease(video_key(url) if url else None)
+
+    def _ydl_opts(self, proxy: Optional[str]) -> dict[str, Any]:
         ydl_opts = {
             "quiet": True,
             "no_warnings": True,
@@ -44,17 +101,42 @@ class YtDlpVideoInfoExtractor(IVideoInfoExtractor):
             "socket_timeout": self.timeout,
         }
 
-        if self.proxy:
-            ydl_opts["proxy"] = self.proxy
+        if proxy:
+            ydl_opts["proxy"] = proxy
 
-        try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
-                if not info:
-                    raise ExtractionError("No video info returned", url=url)
+        return ydl_opts
 
-                return self._parse_video_info(info, url)
+    def warm_up(self, probe_url: Optional[str] = None) -> None:
+        """Import yt-dlp and initialize the YouTube extractor in a pooled session.
 
+        With `probe_url`, also run a metadata-only extraction so the player
+        JS is fetched and yt-dlp's signature cache on disk is populated.
+        """
+        with self._proxy() as proxy:
+            ydl_opts = self._ydl_opts(proxy)
+            with self.session_pool.session(ydl_opts) as session:
+                with session.configured(ydl_opts) as ydl:
+                    ydl.get_info_extractor("Youtube").initialize()
+                    if probe_url:
+                        ydl.extract_info(probe_url, download=False, process=False)
+
+    def extract_info(self, url: str) -> VideoInfo:
+        """Extract video info using a pooled yt-dlp session."""
+        import yt_dlp  # deferred: importing yt-dlp is slow
+
+        try:
+            with self._proxy(url) as proxy:
+                ydl_opts = self._ydl_opts(proxy)
+                with self.session_pool.session(ydl_opts) as session:
+                    with session.configured(ydl_opts) as ydl:
+                        info = ydl.extract_info(url, download=False)
+            if not info:
+                raise ExtractionError("No video info returned", url=url)
+
+            return self._parse_video_info(info, url)
+
+        except ExtractionError:
+            raise
         except yt_dlp.DownloadError as e:
             raise ExtractionError(str(e), url=url, original=e)
         except Exception as e:
@@ -62,47 +144,7 @@ class YtDlpVideoInfoExtractor(IVideoInfoExtractor):
 
     def _parse_video_info(self, info: dict[str, Any], url: str) -> VideoInfo:
         """Parse yt-dlp info dict to VideoInfo model."""
-        formats = []
-        for f in info.get("formats", []):
-            if f.get("vcodec") == "none" and f.get("acodec") == "none":
-                continue
-
-            format_id = f.get("format_id", "")
-            ext = f.get("ext", "unknown")
-            vcodec = f.get("vcodec", "none")
-            acodec = f.get("acodec", "none")
-            height = f.get("height")
-            width = f.get("width")
-            fps = f.get("fps")
-            tbr = f.get("tbr")  # total bitrate
-            abr = f.get("abr")  # audio bitrate
-            vbr = f.get("vbr")  # video bitrate
-            filesize = f.get("filesize") or f.get("filesize_approx")
-            protocol = f.get("protocol", "")
-            format_note = f.get("format_note", "")
-
-            resolution = None
-            if height and width:
-                resolution = f"{width}x{height}"
-            elif height:
-                resolution = f"{height}p"
-
-            formats.append(
-                VideoFormat(
-                    format_id=format_id,
-                    ext=ext,
-                    resolution=resolution,
-                    fps=fps,
-                    vcodec=vcodec if vcodec != "none" else None,
-                    acodec=acodec if acodec != "none" else None,
-                    bitrate=tbr,
-                    audio_bitrate=abr,
-                    video_bitrate=vbr,
-                    filesize=filesize,
-                    protocol=protocol,
-                    format_note=format_note,
-                )
-            )
+        formats = parse_formats(info.get("formats") or [])
 
         return VideoInfo(
             id=info.get("id", ""),
@@ -122,6 +164,6 @@ class YtDlpVideoInfoExtractor(IVideoInfoExtractor):
             is_live=info.get("is_live", False),
             availability=info.get("availability"),
             age_limit=info.get("age_limit"),
-            categories=info.get("categories", []),
+            categories=[_intern(c) for c in info.get("categories") or []],
             tags=info.get("tags", []),
         )
\ No newline at end of file
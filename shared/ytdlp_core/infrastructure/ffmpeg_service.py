@@ -7,15 +7,25 @@ import subprocess
 from pathlib import Path
 from typing import Optional
 
-from ytdlp_core.domain.ports import IFFmpegService
+from ytdlp_core.domain.ports import IFFmpegService, IMetricsSink, NullMetricsSink
 from ytdlp_core.domain.exceptions import FFmpegError
 
 
 class FFmpegService(IFFmpegService):
     """FFmpeg service for audio/video processing."""
 
-    def __init__(self, ffmpeg_path: Optional[str] = None):
+    def __init__(self, ffmpeg_path: Optional[str] = None, metrics: Optional[IMetricsSink] = None):
         self._ffmpeg_path = ffmpeg_path or self._find_ffmpeg()
+        self.metrics = metrics or NullMetricsSink()
+
+    def _run(self, operation: str, cmd: list[str]) -> None:
+        """Run ffmpeg, timing it as phase ``ffmpeg_<operation>``."""
+        try:
+            with self.metrics.span(f"ffmpeg_{operation}"):
+                subprocess.run(cmd, check=True, capture_output=True, timeout=300)
+        except Exception:
+            self.metrics.increment("ffmpeg_failures", labels={"operation": operation})
+            raise
 
     def _find_ffmpeg(self) -> str:
         """Find ffmpeg executable."""
@@ -81,7 +91,7 @@ class FFmpegService(IFFmpegService):
         ]
 
         try:
-            subprocess.run(cmd, check=True, capture_output=True, timeout=300)
+            self._run("convert_to_mp3", cmd)
             return output_path
         except subprocess.CalledProcessError as e:
             raise FFmpegError(f"MP3 conversion failed: {e.stderr.decode()}", original=e)
@@ -108,7 +118,7 @@ class FFmpegService(IFFmpegService):
         ]
 
         try:
-            subprocess.run(cmd, check=True, capture_output=True, timeout=300)
+            self._run("merge", cmd)
             return output_path
         except subprocess.CalledProcessError as e:
             raise FFmpegError(f"Merge failed: {e.stderr.decode()}", original=e)
@@ -137,7 +147,7 @@ class FFmpegService(IFFmpegService):
             ]
             cmd = [c for c in cmd if c]  # remove empty strings
             try:
-                subprocess.run(cmd, check=True, capture_output=True, timeout=300)
+                self._run("extract_audio", cmd)
                 return output_path
             except subprocess.CalledProcessError as e:
                 raise FFmpegError(f"Audio extraction failed: {e.stderr.decode()}", original=e)
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""Infrastructure - metrics sinks and exporters."""
+
+from __future__ import annotations
+
+import bisect
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Mapping, Optional, Tuple, Union
+
+from ytdlp_core.domain.ports import IMetricsSink
+
+# Upper bounds in seconds; wide enough for both cache lookups and long transfers
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Mapping[str, str]]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items())) if labels else ()
+
+
+class _Distribution:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self, bounds: int):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = [0] * bounds
+
+
+class MetricsRegistry(IMetricsSink):
+    """Thread-safe in-process store of counters and histograms."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bucket_bounds = tuple(sorted(buckets))
+        self._counters: dict[str, dict[LabelKey, float]] = {}
+        self._distributions: dict[str, dict[LabelKey, _Distribution]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Mapping[str, str]] = None) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.bucket_bounds, value)
+        with self._lock:
+            series = self._distributions.setdefault(name, {})
+            dist = series.get(key)
+            if dist is None:
+                dist = series[key] = _Distribution(len(self.bucket_bounds))
+            dist.count += 1
+            dist.total += value
+            dist.min = min(dist.min, value)
+            dist.max = max(dist.max, value)
+            if index < len(dist.buckets):
+                dist.buckets[index] += 1
+
+    def counter(self, name: str, labels: Optional[Mapping[str, str]] = None) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0.0)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Plain-data copy of every series."""
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(key), "value": value} for key, value in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "distributions": {
+                    name: [
+                        {
+                            "labels": dict(key),
+                            "count": d.count,
+                            "sum": d.total,
+                            "min": d.min if d.count else None,
+                            "max": d.max if d.count else None,
+                            "buckets": dict(zip(self.bucket_bounds, d.buckets)),
+                        }
+                        for key, d in series.items()
+                    ]
+                    for name, series in self._distributions.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._distributions.clear()
+
+
+class CompositeMetricsSink(IMetricsSink):
+    """Forward every event to several sinks."""
+
+    def __init__(self, *sinks: IMetricsSink):
+        self.sinks = sinks
+
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Mapping[str, str]] = None) -> None:
+        for sink in self.sinks:
+            sink.increment(name, value, labels)
+
+    def observe(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+        for sink in self.sinks:
+            sink.observe(name, value, labels)
+
+
+class JsonlMetricsSink(IMetricsSink):
+    """Append each event as one JSON line to a file or stream."""
+
+    def __init__(self, target: Union[Path, str, IO[str]]):
+        if isinstance(target, (str, Path)):
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            self._stream: IO[str] = open(target, "a", encoding="utf-8", buffering=1)
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+        self._lock = threading.Lock()
+
+    def _write(self, kind: str, name: str, value: float, labels: Optional[Mapping[str, str]]) -> None:
+        line = json.dumps(
+            {"ts": round(time.time(), 6), "type": kind, "name": name, "value": value, "labels": dict(labels or {})},
+            separators=(",", ":"),
+        )
+        with self._lock:
+            self._stream.write(line + "\n")
+
+    def increment(self, name: str, value: float = 1.0, labels: Optional[Mapping[str, str]] = None) -> None:
+        self._write("counter", name, value, labels)
+
+    def observe(self, name: str, value: float, labels: Optional[Mapping[str, str]] = None) -> None:
+        self._write("observation", name, value, labels)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owns_stream:
+                self._stream.close()
+            else:
+                self._stream.flush()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Mapping[str, Any]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class PrometheusExporter:
+    """Render a MetricsRegistry in the Prometheus text exposition format."""
+
+    def __init__(self, registry: MetricsRegistry, prefix: str = "ytdlp_"):
+        self.registry = registry
+        self.prefix = prefix
+
+    def render(self) -> str:
+        snapshot = self.registry.snapshot()
+        lines: list[str] = []
+        for name, series in sorted(snapshot["counters"].items()):
+            metric = f"{self.prefix}{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for s in series:
+                lines.append(f"{metric}{_format_labels(s['labels'])} {_format_value(s['value'])}")
+        for name, series in sorted(snapshot["distributions"].items()):
+            metric = f"{self.prefix}{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for s in series:
+                cumulative = 0
+                for bound, count in s["buckets"].items():
+                    cumulative += count
+                    labels = {**s["labels"], "le": _format_value(bound)}
+                    lines.append(f"{metric}_bucket{_format_labels(labels)} {cumulative}")
+                labels = {**s["labels"], "le": "+Inf"}
+                lines.append(f"{metric}_bucket{_format_labels(labels)} {s['count']}")
+                lines.append(f"{metric}_sum{_format_labels(s['labels'])} {_format_value(s['sum'])}")
+                lines.append(f"{metric}_count{_format_labels(s['labels'])} {s['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """Atomically write the exposition, e.g. for node_exporter's textfile collector."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
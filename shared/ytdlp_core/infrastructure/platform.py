@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import atexit
+import contextlib
+import json
 import os
 import shutil
 import sys
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 
 from ytdlp_core.domain.ports import IConfigStore, IFFmpegLocator, IPlatformService
 
@@ -60,50 +68,263 @@ class FFmpegLocator(IFFmpegLocator):
 
 
 class JsonConfigStore(IConfigStore):
-    """JSON file-based config store."""
+    """JSON file-based config store.
 
-    def __init__(self, config_path: Path):
+    Writes are debounced: `set` marks the key dirty and pushes back a flush
+    deadline `flush_delay` seconds ahead. One flusher thread per burst of
+    sets waits for the deadline to stop moving, then writes. Before
+    writing, the file mtime is compared with the last one we saw so changes
+    made by another process are merged instead of overwritten.
+
+    `batch()` stages the calling thread's sets without taking the lock, so
+    other threads keep reading and writing while the block runs; on exit
+    they are applied in one step and one atomic write (temp file +
+    rename), or dropped on error. Only the batching thread sees its staged
+    values before then.
+
+    Change notifications are queued while the lock is held and delivered
+    once it is released, so listeners never run under the store's lock.
+    """
+
+    def __init__(self, config_path: Path, flush_delay: float = 0.5):
+        super().__init__()
         self.config_path = config_path
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_delay = flush_delay
         self._cache: dict[str, Any] = {}
+        self._dirty: dict[str, Any] = {}
+        self._mtime_ns: Optional[int] = None
+        self._lock = threading.RLock()
+        self._local = threading.local()  # .staged: the current thread's open batch, if any
+        self._pending: list[tuple[str, Any]] = []
+        self._flush_deadline: Optional[float] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._flush_cond = threading.Condition(self._lock)
         self._load()
+        _open_stores.add(self)
+
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return self.config_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _read_file(self) -> dict[str, Any]:
+        try:
+            with open(self.config_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
 
     def _load(self) -> None:
-        import json
-        if self.config_path.exists():
-            try:
-                with open(self.config_path, "r", encoding="utf-8") as f:
-                    self._cache = json.load(f)
-            except Exception:
-                self._cache = {}
+        self._mtime_ns = self._stat_mtime()
+        if self._mtime_ns is not None:
+            self._cache = self._read_file()
+
+    def _reload_if_changed(self) -> None:
+        """Pick up external edits, keeping our not-yet-written keys on top."""
+        mtime = self._stat_mtime()
+        if mtime is None or mtime == self._mtime_ns:
+            return
+        previous = self._cache
+        self._cache = self._read_file()
+        self._cache.update(self._dirty)
+        self._mtime_ns = mtime
+        for key, value in self._cache.items():
+            if key not in previous or previous[key] != value:
+                self._pending.append((key, value))
+
+    def _deliver(self) -> None:
+        """Send queued notifications."""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+        for key, value in pending:
+            self._notify(key, value)
 
     def _save(self) -> None:
-        import json
-        with open(self.config_path, "w", encoding="utf-8") as f:
-            json.dump(self._cache, f, indent=2, ensure_ascii=False)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{self.config_path.name}.", suffix=".tmp", dir=str(self.config_path.parent)
+        )
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(self._cache, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.config_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+        self._mtime_ns = self._stat_mtime()
+
+    def _schedule_flush(self) -> None:
+        if self.flush_delay <= 0:
+            self._flush_locked()
+            return
+        self._flush_deadline = time.monotonic() + self.flush_delay
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._run_flusher, name="config-flush", daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        with self._lock:
+            try:
+                while self._flush_deadline is not None:
+                    remaining = self._flush_deadline - time.monotonic()
+                    if remaining > 0:
+                        self._flush_cond.wait(remaining)
+                    else:
+                        self._flush_locked()
+            finally:
+                self._flusher = None
+        self._deliver()
 
     def get(self, key: str, default: Any = None) -> Any:
-        return self._cache.get(key, default)
+        staged = getattr(self._local, "staged", None)
+        if staged is not None and key in staged:
+            return staged[key]
+        with self._lock:
+            return self._cache.get(key, default)
 
     def set(self, key: str, value: Any) -> None:
+        staged = getattr(self._local, "staged", None)
+        if staged is not None:
+            staged[key] = value
+            return
+        with self._lock:
+            if self._apply_locked(key, value):
+                self._schedule_flush()
+        self._deliver()
+
+    def _apply_locked(self, key: str, value: Any) -> bool:
+        """Record one change; False if `value` is already stored."""
+        if key in self._cache and self._cache[key] == value and key not in self._dirty:
+            return False
         self._cache[key] = value
+        self._dirty[key] = value
+        self._pending.append((key, value))
+        return True
+
+    def get_all(self) -> dict[str, Any]:
+        with self._lock:
+            self._reload_if_changed()
+            data = self._cache.copy()
+        self._deliver()
+        data.update(getattr(self._local, "staged", None) or {})
+        return data
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Apply all sets inside the block as one write, or none on error.
+
+        A nested batch joins the outer one.
+        """
+        if getattr(self._local, "staged", None) is not None:
+            yield
+            return
+        staged: dict[str, Any] = {}
+        self._local.staged = staged
+        try:
+            yield
+        finally:
+            self._local.staged = None
+        with self._lock:
+            changed = [self._apply_locked(key, value) for key, value in staged.items()]
+            if any(changed):
+                self._flush_locked()
+        self._deliver()
+
+    def flush(self) -> None:
+        """Write pending changes now."""
+        with self._lock:
+            self._flush_locked()
+        self._deliver()
+
+    def _flush_locked(self) -> None:
+        if self._flush_deadline is not None:
+            self._flush_deadline = None
+            self._flush_cond.notify_all()
+        if not self._dirty:
+            return
+        self._reload_if_changed()
         self._save()
+        self._dirty.clear()
+
+    def _flush_at_exit(self) -> None:
+        # A daemon thread stopped at exit may still hold the lock: give up rather than hang
+        if not self._lock.acquire(timeout=_EXIT_FLUSH_TIMEOUT):
+            return
+        try:
+            self._flush_locked()
+        finally:
+            self._lock.release()
+
+
+# Stores with possibly unwritten changes, flushed once at interpreter exit
+_open_stores: weakref.WeakSet[JsonConfigStore] = weakref.WeakSet()
+_EXIT_FLUSH_TIMEOUT = 2.0
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    for store in list(_open_stores):
+        with contextlib.suppress(Exception):
+            store._flush_at_exit()
+
+
+class MemoryConfigStore(IConfigStore):
+    """Config held in memory only, e.g. for headless runs with per-invocation overrides."""
+
+    def __init__(self, initial: Optional[dict[str, Any]] = None):
+        super().__init__()
+        self._data: dict[str, Any] = dict(initial or {})
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            if key in self._data and self._data[key] == value:
+                return
+            self._data[key] = value
+        self._notify(key, value)
 
     def get_all(self) -> dict[str, Any]:
-        return self._cache.copy()
+        with self._lock:
+            return self._data.copy()
 
 
 class MemoryCacheStore:
-    """In-memory cache for video info."""
+    """In-memory cache for video info.
 
-    def __init__(self):
-        self._cache: dict[str, Any] = {}
+    With `max_entries` the least recently used entries are evicted, which
+    keeps long-running processes bounded.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
 
     def get(self, key: str):
-        return self._cache.get(key)
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None and self.max_entries:
+                self._cache.move_to_end(key)
+            return value
 
     def set(self, key: str, value: Any) -> None:
-        self._cache[key] = value
+        with self._lock:
+            self._cache[key] = value
+            if self.max_entries:
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
 
     def clear(self) -> None:
         self._cache.clear()
@@ -0,0 +1,67 @@
+"""Infrastructure - reserve disk blocks for a file that is about to be written."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import sys
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# linux/falloc.h: allocate blocks but leave the file size alone
+FALLOC_FL_KEEP_SIZE = 0x01
+
+_fallocate: Optional[Callable[[int, int, int, int], int]] = None
+_loaded = False
+
+
+def _load() -> Optional[Callable[[int, int, int, int], int]]:
+    global _fallocate, _loaded
+    if _loaded:
+        return _fallocate
+    _loaded = True
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        # fallocate64 takes 64-bit offsets on 32-bit builds too
+        func = getattr(libc, "fallocate64", None) or libc.fallocate
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+    func.restype = ctypes.c_int
+    _fallocate = func
+    return func
+
+
+def preallocate(path: str, size: int) -> bool:
+    """Reserve `size` bytes of contiguous-as-possible blocks for `path`.
+
+    Uses Linux ``fallocate(FALLOC_FL_KEEP_SIZE)``: the blocks are allocated
+    up front (less fragmentation, and ENOSPC now rather than mid-transfer)
+    while the file keeps its current length. That matters because yt-dlp
+    appends to ``.part`` files and resumes from their size. Returns False
+    where this isn't supported (other systems, filesystems without
+    fallocate); raises OSError(ENOSPC) if the volume can't hold `size`.
+    """
+    func = _load()
+    if func is None or size <= 0:
+        return False
+    try:
+        fd = os.open(path, os.O_WRONLY)
+    except OSError:
+        return False
+    try:
+        if func(fd, FALLOC_FL_KEEP_SIZE, 0, size) != 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, os.strerror(err), path)
+            logger.debug("fallocate(%s, %d) failed: %s", path, size, os.strerror(err))
+            return False
+        return True
+    finally:
+        os.close(fd)
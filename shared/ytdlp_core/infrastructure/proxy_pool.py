@@ -0,0 +1,312 @@
+"""Infrastructure - pool of egress proxies with health checks and per-video stickiness."""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator, Optional, Sequence, Union
+from urllib.parse import parse_qs, urlsplit
+
+from ytdlp_core.domain.exceptions import ConfigurationError
+from ytdlp_core.domain.ports import IMetricsSink, NullMetricsSink
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("least_loaded", "round_robin")
+
+# Tiny response, answered by the same front ends that serve the site
+DEFAULT_HEALTH_URL = "https://www.youtube.com/generate_204"
+
+# The site is refusing this egress address
+_BLOCKED = re.compile(
+    r"HTTP Error 429|Too Many Requests|confirm you.re not a bot|Sign in to confirm",
+    re.IGNORECASE,
+)
+
+# The proxy itself (or the path through it) is failing
+_PROXY_ERRORS = re.compile(
+    r"ProxyError|Tunnel connection failed|Cannot connect to proxy|Unable to connect to proxy"
+    r"|timed? ?out|Connection (?:reset|refused|aborted)|Remote end closed",
+    re.IGNORECASE,
+)
+
+_YOUTUBE_ID = re.compile(r"^/(?:shorts|embed|v|live)/([\w-]{11})")
+
+
+def video_key(url: str) -> str:
+    """Stable key for the video behind `url`, whatever link form was used.
+
+    The extractor and the downloader may see different spellings of the same
+    video (youtu.be vs watch?v=); both must land on the same proxy.
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host == "youtu.be":
+        return "youtube:" + parts.path.strip("/")[:11]
+    if host.endswith("youtube.com"):
+        ids = parse_qs(parts.query).get("v")
+        if ids:
+            return "youtube:" + ids[0]
+        match = _YOUTUBE_ID.match(parts.path)
+        if match:
+            return "youtube:" + match.group(1)
+    return url
+
+
+class ProxyEndpoint:
+    """One proxy and what the pool knows about it."""
+
+    def __init__(self, url: str, weight: int = 1):
+        self.url = url
+        self.weight = max(1, weight)
+        self.active = 0
+        self.leases = 0  # total, breaks least-loaded ties
+        self.failures = 0  # consecutive
+        self.ejections = 0  # consecutive, for the backoff
+        self.ejected_until = 0.0
+        self.rtt: Optional[float] = None  # smoothed health-check round trip, seconds
+        self.current_weight = 0  # smooth weighted round-robin state
+
+    def healthy(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+    def to_dict(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "url": self.url,
+            "weight": self.weight,
+            "active": self.active,
+            "leases": self.leases,
+            "healthy": self.healthy(now),
+            "ejected_for": max(0.0, self.ejected_until - now),
+            "failures": self.failures,
+            "rtt": self.rtt,
+        }
+
+
+class ProxyPool:
+    """Spread extraction and download traffic over several proxies.
+
+    Each `lease` picks a healthy proxy, by fewest active leases per unit of
+    weight (``least_loaded``) or smooth weighted round-robin
+    (``round_robin``). Leases with the same key (see `video_key`) keep the
+    proxy they got first, so a video's extraction and its download go out
+    the same address - stream URLs can be bound to the IP that fetched them.
+
+    A proxy is ejected for `eject_for` seconds (doubling on each
+    consecutive ejection, up to `max_eject_for`) when the site blocks it,
+    after `max_failures` consecutive connection failures, or when its
+    smoothed health-check round trip exceeds `slow_after`. An ejected
+    proxy is tried again once its time is up; with `start`, a background
+    thread probes every proxy each `check_interval` seconds, which also
+    catches proxies due for readmission that are still failing.
+    """
+
+    def __init__(
+        self,
+        proxies: Sequence[Union[str, ProxyEndpoint]],
+        strategy: str = "least_loaded",
+        health_url: str = DEFAULT_HEALTH_URL,
+        check_interval: float = 60.0,
+        timeout: float = 10.0,
+        slow_after: float = 5.0,
+        max_failures: int = 3,
+        eject_for: float = 60.0,
+        max_eject_for: float = 900.0,
+        max_sticky: int = 1024,
+        metrics: Optional[IMetricsSink] = None,
+    ):
+        if strategy not in STRATEGIES:
+            raise ConfigurationError(f"Unknown proxy strategy {strategy!r}, expected one of {STRATEGIES}")
+        self.endpoints = [p if isinstance(p, ProxyEndpoint) else ProxyEndpoint(p) for p in proxies]
+        if not self.endpoints:
+            raise ConfigurationError("A proxy pool needs at least one proxy")
+        self.strategy = strategy
+        self.health_url = health_url
+        self.check_interval = check_interval
+        self.timeout = timeout
+        self.slow_after = slow_after
+        self.max_failures = max(1, max_failures)
+        self.eject_for = eject_for
+        self.max_eject_for = max_eject_for
+        self.max_sticky = max_sticky
+        self.metrics = metrics or NullMetricsSink()
+        self._sticky: OrderedDict[str, ProxyEndpoint] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, value: Any, strategy: Optional[str] = None, **kwargs: Any) -> Optional[ProxyPool]:
+        """Pool for a ``proxies`` config value, or None if it lists no proxy.
+
+        Accepts a list of URLs or ``{"url": ..., "weight": ...}`` objects,
+        or a comma-separated string of URLs.
+        """
+        if isinstance(value, str):
+            value = [part.strip() for part in value.split(",")]
+        endpoints: list[ProxyEndpoint] = []
+        for entry in value or ():
+            if isinstance(entry, dict):
+                try:
+                    endpoints.append(ProxyEndpoint(str(entry["url"]), int(entry.get("weight", 1))))
+                except (KeyError, TypeError, ValueError) as e:
+                    raise ConfigurationError(f"Invalid proxy entry {entry!r}", original=e)
+            elif entry:
+                endpoints.append(ProxyEndpoint(str(entry)))
+        if not endpoints:
+            return None
+        return cls(endpoints, strategy=strategy or "least_loaded", **kwargs)
+
+    @contextlib.contextmanager
+    def lease(self, key: Optional[str] = None) -> Iterator[str]:
+        """Proxy URL to use for one request or job; the outcome is recorded on exit."""
+        endpoint = self._acquire(key)
+        try:
+            yield endpoint.url
+        except BaseException as e:
+            self._release(endpoint, e)
+            raise
+        self._release(endpoint, None)
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            return [endpoint.to_dict() for endpoint in self.endpoints]
+
+    def _acquire(self, key: Optional[str]) -> ProxyEndpoint:
+        now = time.monotonic()
+        with self._lock:
+            endpoint = self._sticky.get(key) if key is not None else None
+            if endpoint is not None and endpoint.healthy(now):
+                self._sticky.move_to_end(key)
+            else:
+                endpoint = self._choose(now)
+                if key is not None:
+                    self._sticky[key] = endpoint
+                    self._sticky.move_to_end(key)
+                    while len(self._sticky) > self.max_sticky:
+                        self._sticky.popitem(last=False)
+            endpoint.active += 1
+            endpoint.leases += 1
+            return endpoint
+
+    def _choose(self, now: float) -> ProxyEndpoint:
+        candidates = [e for e in self.endpoints if e.healthy(now)]
+        if not candidates:
+            # Everything is ejected: the one closest to readmission beats no proxy
+            return min(self.endpoints, key=lambda e: e.ejected_until)
+        if self.strategy == "round_robin":
+            # nginx's smooth weighted round-robin: proportional and interleaved
+            total = sum(e.weight for e in candidates)
+            for e in candidates:
+                e.current_weight += e.weight
+            chosen = max(candidates, key=lambda e: e.current_weight)
+            chosen.current_weight -= total
+            return chosen
+        return min(candidates, key=lambda e: (e.active / e.weight, e.leases / e.weight))
+
+    def _release(self, endpoint: ProxyEndpoint, error: Optional[BaseException]) -> None:
+        text = "" if error is None else f"{error} {getattr(error, 'original', None) or ''}"
+        with self._lock:
+            endpoint.active -= 1
+            if error is None:
+                endpoint.failures = 0
+                if endpoint.healthy(time.monotonic()):
+                    endpoint.ejections = 0
+            elif _BLOCKED.search(text):
+                self._eject(endpoint, "blocked")
+            elif _PROXY_ERRORS.search(text):
+                endpoint.failures += 1
+                if endpoint.failures >= self.max_failures:
+                    self._eject(endpoint, f"{endpoint.failures} failures in a row")
+            # Anything else (private video, bad format) says nothing about the proxy
+
+    def _eject(self, endpoint: ProxyEndpoint, reason: str) -> None:
+        """Take `endpoint` out of rotation; caller holds the lock."""
+        now = time.monotonic()
+        if not endpoint.healthy(now):
+            return
+        duration = min(self.max_eject_for, self.eject_for * 2 ** endpoint.ejections)
+        endpoint.ejections += 1
+        endpoint.failures = 0
+        endpoint.ejected_until = now + duration
+        self.metrics.increment("proxy_ejections")
+        logger.warning("Ejecting proxy %s for %.0fs: %s", endpoint.url, duration, reason)
+
+    # -- health checks --------------------------------------------------
+
+    def check(self, endpoint: ProxyEndpoint) -> bool:
+        """Probe `health_url` through `endpoint` and update its state."""
+        if not urlsplit(endpoint.url).scheme.startswith("http"):
+            return True  # urllib cannot speak SOCKS; rely on job outcomes
+        opener = urllib.request.build_opener(
+            urllib.request.ProxyHandler({"http": endpoint.url, "https": endpoint.url})
+        )
+        problem: Optional[str] = None
+        started = time.monotonic()
+        try:
+            with opener.open(self.health_url, timeout=self.timeout) as response:
+                response.read(1024)
+        except urllib.error.HTTPError as e:
+            # The request went through the proxy; only refusals count against it
+            if e.code == 429 or e.code >= 500:
+                problem = f"HTTP {e.code}"
+        except Exception as e:
+            problem = str(e) or type(e).__name__
+        rtt = time.monotonic() - started
+        self.metrics.observe("proxy_check_seconds", rtt)
+
+        with self._lock:
+            ejected = not endpoint.healthy(time.monotonic())
+            if problem is None:
+                endpoint.rtt = rtt if endpoint.rtt is None else 0.7 * endpoint.rtt + 0.3 * rtt
+                if endpoint.rtt > self.slow_after:
+                    problem = f"slow ({endpoint.rtt:.1f}s round trip)"
+            if problem is None:
+                if ejected:
+                    logger.info("Proxy %s is back in rotation", endpoint.url)
+                endpoint.ejected_until = 0.0
+                endpoint.failures = 0
+                return True
+            endpoint.failures += 1
+            if ejected or endpoint.failures >= self.max_failures:
+                # Still failing at the end of an ejection: eject again, for longer
+                endpoint.ejected_until = 0.0
+                self._eject(endpoint, f"health check: {problem}")
+            return False
+
+    def check_all(self) -> None:
+        """Probe every proxy that is in rotation or due for readmission."""
+        now = time.monotonic()
+        with self._lock:
+            # Ejected proxies wait out their time before being probed again
+            due = [e for e in self.endpoints if e.healthy(now) or e.ejected_until - now < self.check_interval]
+        if not due:
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(due)), thread_name_prefix="proxy-check") as executor:
+            list(executor.map(self.check, due))
+
+    def start(self) -> None:
+        """Run health checks in a background thread until `close`."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._check_loop, name="proxy-health", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self._stop.set()
+
+    def _check_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.check_all()
+            except Exception:
+                logger.exception("Proxy health check failed")
+            self._stop.wait(self.check_interval)
@@ -0,0 +1,211 @@
+"""Infrastructure - pool of reusable yt-dlp sessions."""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Iterator, Mapping
+
+if TYPE_CHECKING:
+    import yt_dlp
+
+# Options fixed when a YoutubeDL is built (HTTP handlers, cookie jar); they
+# form the pool key. Everything else is applied per call.
+SESSION_KEYS = (
+    "proxy",
+    "socket_timeout",
+    "source_address",
+    "cookiefile",
+    "cookiesfrombrowser",
+    "http_headers",
+    "nocheckcertificate",
+    "impersonate",
+)
+
+# Private YoutubeDL state touched when re-configuring a session between jobs
+_RECONFIGURABLE_ATTRS = (
+    "_pps",
+    "_progress_hooks",
+    "_postprocessor_hooks",
+    "_parse_outtmpl",
+    "format_selector",
+    "build_format_selector",
+)
+
+
+def session_key(opts: Mapping[str, Any]) -> tuple:
+    """Fingerprint of the connection-level options in `opts`."""
+    return tuple(repr(opts.get(key)) for key in SESSION_KEYS)
+
+
+class YoutubeDLSession:
+    """A pooled YoutubeDL that keeps its HTTP connections and extractors warm."""
+
+    def __init__(self, key: tuple, ydl: yt_dlp.YoutubeDL):
+        self.key = key
+        self.ydl = ydl
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.uses = 0
+
+    @contextlib.contextmanager
+    def configured(self, params: Mapping[str, Any]) -> Iterator[yt_dlp.YoutubeDL]:
+        """Apply per-job params (format, outtmpl, hooks, postprocessors), then restore."""
+        ydl = self.ydl
+        if not all(hasattr(ydl, attr) for attr in _RECONFIGURABLE_ATTRS):
+            # Unknown yt-dlp internals: fall back to a one-off instance
+            import yt_dlp  # deferred: importing yt-dlp is slow
+
+            with yt_dlp.YoutubeDL({**ydl.params, **params}) as fresh:
+                yield fresh
+            return
+
+        from yt_dlp.postprocessor import get_postprocessor
+
+        saved_params = dict(ydl.params)
+        saved_pps = {when: list(pps) for when, pps in ydl._pps.items()}
+        saved_hooks = list(ydl._progress_hooks)
+        saved_pp_hooks = list(ydl._postprocessor_hooks)
+        saved_selector = ydl.format_selector
+
+        job = dict(params)
+        postprocessors = job.pop("postprocessors", ())
+        progress_hooks = job.pop("progress_hooks", ())
+        postprocessor_hooks = job.pop("postprocessor_hooks", ())
+        try:
+            ydl.params.update(job)
+            if "outtmpl" in job:
+                ydl._parse_outtmpl()
+            fmt = ydl.params.get("format")
+            ydl.format_selector = (
+                fmt if fmt in (None, "-") or callable(fmt) else ydl.build_format_selector(fmt)
+            )
+            for hook in progress_hooks:
+                ydl.add_progress_hook(hook)
+            for hook in postprocessor_hooks:
+                ydl.add_postprocessor_hook(hook)
+            for pp_def_raw in postprocessors:
+                pp_def = dict(pp_def_raw)
+                when = pp_def.pop("when", "post_process")
+                ydl.add_post_processor(get_postprocessor(pp_def.pop("key"))(ydl, **pp_def), when=when)
+            ydl._download_retcode = 0
+            yield ydl
+        finally:
+            ydl.params.clear()
+            ydl.params.update(saved_params)
+            ydl._pps = saved_pps
+            ydl._progress_hooks = saved_hooks
+            ydl._postprocessor_hooks = saved_pp_hooks
+            ydl.format_selector = saved_selector
+
+    def close(self) -> None:
+        with contextlib.suppress(Exception):
+            self.ydl.close()
+
+
+class YoutubeDLSessionPool:
+    """Thread-safe pool of YoutubeDL sessions keyed by connection options.
+
+    A session is checked out exclusively for the duration of one call, so
+    concurrent jobs never share a YoutubeDL, but sequential jobs with the
+    same proxy/timeout/cookies reuse its keep-alive connections, cookie jar
+    and initialized extractors. Sessions idle for longer than `idle_timeout`
+    seconds are closed.
+    """
+
+    def __init__(self, max_idle_per_key: int = 4, idle_timeout: float = 300.0):
+        self.max_idle_per_key = max_idle_per_key
+        self.idle_timeout = idle_timeout
+        self._idle: dict[tuple, list[YoutubeDLSession]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self.created = 0
+        self.reused = 0
+
+    @contextlib.contextmanager
+    def session(self, opts: Mapping[str, Any]) -> Iterator[YoutubeDLSession]:
+        """Check out a session matching the connection options in `opts`."""
+        import yt_dlp  # deferred: importing yt-dlp is slow
+
+        session = self._acquire(opts)
+        keep = True
+        try:
+            yield session
+        except yt_dlp.DownloadError:
+            # Normal extraction/download failure; the session itself is fine
+            raise
+        except BaseException:
+            keep = False
+            raise
+        finally:
+            self._release(session, keep)
+
+    def _acquire(self, opts: Mapping[str, Any]) -> YoutubeDLSession:
+        key = session_key(opts)
+        with self._lock:
+            expired = self._collect_expired()
+            idle = self._idle.get(key)
+            session = idle.pop() if idle else None
+            if session is not None:
+                self.reused += 1
+        for stale in expired:
+            stale.close()
+        if session is not None:
+            return session
+
+        import yt_dlp  # deferred: importing yt-dlp is slow
+
+        base = {k: opts[k] for k in SESSION_KEYS if opts.get(k) is not None}
+        ydl = yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True, **base})
+        with self._lock:
+            self.created += 1
+        return YoutubeDLSession(key, ydl)
+
+    def _release(self, session: YoutubeDLSession, keep: bool) -> None:
+        session.uses += 1
+        session.last_used = time.monotonic()
+        with self._lock:
+            idle = self._idle.setdefault(session.key, [])
+            if keep and not self._closed and len(idle) < self.max_idle_per_key:
+                idle.append(session)
+                return
+        session.close()
+
+    def _collect_expired(self) -> list[YoutubeDLSession]:
+        """Remove idle sessions past their timeout; caller holds the lock."""
+        now = time.monotonic()
+        expired = []
+        for key, idle in list(self._idle.items()):
+            fresh = [s for s in idle if now - s.last_used < self.idle_timeout]
+            expired.extend(s for s in idle if now - s.last_used >= self.idle_timeout)
+            if fresh:
+                self._idle[key] = fresh
+            else:
+                del self._idle[key]
+        return expired
+
+    def evict_idle(self) -> int:
+        """Close sessions idle past the timeout; returns how many were closed."""
+        with self._lock:
+            expired = self._collect_expired()
+        for session in expired:
+            session.close()
+        return len(expired)
+
+    def close(self) -> None:
+        """Close every idle session; sessions in use are closed on release."""
+        with self._lock:
+            self._closed = True
+            sessions = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+        for session in sessions:
+            session.close()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "idle": sum(len(idle) for idle in self._idle.values()),
+            }
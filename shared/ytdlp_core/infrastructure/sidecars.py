@@ -0,0 +1,197 @@
+"""Infrastructure - subtitles and thumbnails fetched alongside the media transfer."""
+
+from __future__ import annotations
+
+import base64
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from typing import TYPE_CHECKING, Any, Optional
+
+from ytdlp_core.domain.ports import IThumbnailStore
+from ytdlp_core.infrastructure.thumbnails import image_ext, thumbnail_candidates
+
+if TYPE_CHECKING:
+    import yt_dlp
+
+logger = logging.getLogger(__name__)
+
+# yt-dlp options whose files are written before the media transfer starts
+_SIDECAR_PARAMS = ("writesubtitles", "writeautomaticsub", "writethumbnail")
+
+# YoutubeDL internals the stage relies on; without them yt-dlp fetches inline
+_REQUIRED_INTERNALS = ("process_subtitles", "_write_subtitles", "_write_thumbnails", "_pps", "urlopen")
+
+
+def thumbnail_entry(data: bytes, id: str = "cached") -> dict[str, Any]:
+    """A yt-dlp thumbnail entry carrying `data` as a data: URI, so writing it needs no request."""
+    ext = image_ext(data)
+    mime = "jpeg" if ext == "jpg" else ext
+    return {
+        "id": id,
+        "url": f"data:image/{mime};base64,{base64.b64encode(data).decode('ascii')}",
+        "ext": ext,
+    }
+
+
+class SidecarStage:
+    """Fetch a job's subtitles and thumbnail concurrently while the media downloads.
+
+    yt-dlp writes each subtitle language and the thumbnail one after another
+    before it starts the media transfer. `start` instead submits them all
+    to a small pool right after extraction and switches yt-dlp's own
+    writing off; the stage then runs as the first ``post_process``
+    postprocessor (after any merge, before the embed ones), waits for the
+    fetches and writes the files through yt-dlp with the data already in
+    hand. A sidecar that could not be fetched here is left to yt-dlp, which
+    fetches it as before.
+
+    `sequential` is the summed fetch time (what yt-dlp would have spent
+    inline), `waited` how long the job actually blocked on them, and
+    `saved` the difference.
+    """
+
+    def __init__(
+        self,
+        ydl: yt_dlp.YoutubeDL,
+        ie_result: dict[str, Any],
+        thumbnails: Optional[IThumbnailStore] = None,
+        workers: int = 4,
+    ):
+        self.ydl = ydl
+        self.ie_result = ie_result
+        self.thumbnails = thumbnails
+        self.waited = 0.0
+        self._durations: list[float] = []
+        self._params = {key: ydl.params.get(key) for key in _SIDECAR_PARAMS}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sidecar")
+        # lang -> (track, fetch); no fetch for tracks left to yt-dlp
+        self._subtitles: dict[str, tuple[dict[str, Any], Optional[Future]]] = {}
+        self._thumbnail: Optional[Future] = None
+        self.joined = False
+
+    @classmethod
+    def start(
+        cls, ydl: yt_dlp.YoutubeDL, ie_result: dict[str, Any], thumbnails: Optional[IThumbnailStore] = None
+    ) -> Optional[SidecarStage]:
+        """Begin fetching `ie_result`'s sidecars, or None when yt-dlp should keep doing it inline."""
+        params = ydl.params
+        if not any(params.get(key) for key in _SIDECAR_PARAMS):
+            return None
+        if params.get("write_all_thumbnails") or not all(hasattr(ydl, attr) for attr in _REQUIRED_INTERNALS):
+            return None
+        if ydl._pps.get("before_dl"):
+            return None  # they may expect the sidecar files on disk before the transfer
+        stage = cls(ydl, ie_result, thumbnails)
+        stage._submit()
+        if not any(future for _, future in stage._subtitles.values()) and stage._thumbnail is None:
+            stage.close()
+            return None
+        for key in _SIDECAR_PARAMS:
+            params[key] = False
+        ydl._pps["post_process"].insert(0, stage)
+        return stage
+
+    @property
+    def sequential(self) -> float:
+        return sum(self._durations)
+
+    @property
+    def saved(self) -> float:
+        return max(0.0, self.sequential - self.waited)
+
+    def _submit(self) -> None:
+        info = self.ie_result
+        requested = self.ydl.process_subtitles(info.get("id"), info.get("subtitles"), info.get("automatic_captions"))
+        for lang, sub in (requested or {}).items():
+            future = None
+            # Only plain HTTP tracks; live chat and HLS subtitles need yt-dlp's downloaders
+            plain = sub.get("protocol") in (None, "http", "https") and str(sub.get("url", "")).startswith("http")
+            if sub.get("data") is None and plain:
+                future = self._executor.submit(self._timed, self._fetch_subtitle, sub)
+            self._subtitles[lang] = (sub, future)
+        if self._params["writethumbnail"]:
+            urls = thumbnail_candidates(info.get("thumbnails") or (), info.get("thumbnail"))
+            if urls:
+                self._thumbnail = self._executor.submit(self._timed, self._fetch_thumbnail, urls)
+
+    def _timed(self, fetch: Any, *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return fetch(*args)
+        finally:
+            self._durations.append(time.perf_counter() - started)
+
+    def _fetch_subtitle(self, sub: dict[str, Any]) -> Optional[str]:
+        from yt_dlp.networking import Request  # deferred: importing yt-dlp is slow
+
+        headers = {**(self.ie_result.get("http_headers") or {}), **(sub.get("http_headers") or {})}
+        try:
+            with self.ydl.urlopen(Request(sub["url"], headers=headers)) as response:
+                return response.read().decode("utf-8")
+        except Exception as e:
+            logger.debug("Could not prefetch subtitles %s: %s", sub.get("url"), e)
+            return None
+
+    def _fetch_thumbnail(self, urls: list[str]) -> Optional[bytes]:
+        if self.thumbnails is not None:
+            found = self.thumbnails.fetch(urls)
+            return found[1] if found else None
+        from yt_dlp.networking import Request  # deferred: importing yt-dlp is slow
+
+        for url in urls:
+            try:
+                with self.ydl.urlopen(Request(url)) as response:
+                    return response.read()
+            except Exception as e:
+                logger.debug("Could not prefetch thumbnail %s: %s", url, e)
+        return None
+
+    # yt-dlp PostProcessor interface
+    def run(self, info: dict[str, Any]) -> tuple[list[str], dict[str, Any]]:
+        if self.joined:
+            return [], info
+        self.joined = True
+        started = time.perf_counter()
+        futures = [future for _, future in self._subtitles.values() if future is not None]
+        if self._thumbnail is not None:
+            futures.append(self._thumbnail)
+        wait_futures(futures)
+        self.waited = time.perf_counter() - started
+
+        if self._subtitles:
+            requested = {}
+            for lang, (sub, future) in self._subtitles.items():
+                data = future.result() if future is not None else None
+                requested[lang] = dict(sub) if data is None else dict(sub, data=data)
+            info["requested_subtitles"] = requested
+        if self._thumbnail is not None and self._thumbnail.result():
+            info["thumbnails"] = [thumbnail_entry(self._thumbnail.result())]
+            info.pop("thumbnail", None)
+
+        ydl = self.ydl
+        filepath = info["filepath"]
+        ydl.params.update(self._params)
+        try:
+            files = ydl._write_subtitles(info, filepath) or []
+            files += ydl._write_thumbnails("video", info, filepath, ydl.prepare_filename(info, "thumbnail")) or []
+        finally:
+            for key in _SIDECAR_PARAMS:
+                ydl.params[key] = False
+        info.setdefault("__files_to_move", {}).update(dict(files))
+        logger.debug(
+            "Sidecars: %.2fs of fetching, waited %.2fs after the transfer", self.sequential, self.waited
+        )
+        return [], info
+
+    def close(self) -> None:
+        """Stop pending fetches and hand sidecar writing back to yt-dlp."""
+        self.ydl.params.update(self._params)
+        pps = self.ydl._pps.get("post_process", [])
+        if self in pps:
+            pps.remove(self)
+        for future in [f for _, f in self._subtitles.values() if f is not None] + [self._thumbnail]:
+            if future is not None:
+                future.cancel()
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,236 @@
+"""Infrastructure - thumbnail fetching and the on-disk thumbnail cache."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Optional, Sequence
+
+from ytdlp_core.domain.ports import IMetricsSink, IThumbnailStore, NullMetricsSink
+
+logger = logging.getLogger(__name__)
+
+# Larger responses are not thumbnails; refuse them rather than cache them
+MAX_THUMBNAIL_BYTES = 4 * 1024 * 1024
+
+# How long a URL that failed to load is skipped before being tried again
+MISS_TTL = 10 * 60
+
+_SIGNATURES = (
+    (b"\xff\xd8\xff", "jpg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF8", "gif"),
+)
+
+
+def image_ext(data: bytes) -> str:
+    """File extension for image bytes, from their magic number ("jpg" if unknown)."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    for signature, ext in _SIGNATURES:
+        if data.startswith(signature):
+            return ext
+    return "jpg"
+
+
+def thumbnail_candidates(thumbnails: Iterable[Mapping[str, Any]], thumbnail: Optional[str] = None) -> list[str]:
+    """Thumbnail URLs best first, in the order yt-dlp tries them for writing/embedding."""
+
+    def rank(t: Mapping[str, Any]) -> tuple:
+        # yt-dlp's own thumbnail ordering, reversed below
+        return (
+            t.get("preference") if t.get("preference") is not None else -1,
+            t.get("width") if t.get("width") is not None else -1,
+            t.get("height") if t.get("height") is not None else -1,
+            t.get("id") or "",
+            t.get("url") or "",
+        )
+
+    urls = [t["url"] for t in sorted(thumbnails, key=rank, reverse=True) if t.get("url")]
+    if thumbnail:
+        urls.insert(0, thumbnail)
+    return list(dict.fromkeys(urls))
+
+
+class ThumbnailDiskCache:
+    """Content-addressed image store with least-recently-used eviction.
+
+    Image bytes live in ``blobs/<sha256 of the bytes>``, so URLs serving the
+    same image share one file; ``refs/<sha256 of the url>`` holds the digest
+    a URL resolved to. A read touches the blob's mtime, and once the blobs
+    exceed `max_bytes` the oldest are deleted. Refs left pointing at an
+    evicted blob count as a miss and are removed on read.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 64 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._blobs = self.directory / "blobs"
+        self._refs = self.directory / "refs"
+        self._blobs.mkdir(parents=True, exist_ok=True)
+        self._refs.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = sum(size for size, _ in self._scan().values())
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _scan(self) -> dict[Path, tuple[int, float]]:
+        """(size, mtime) of every blob."""
+        blobs = {}
+        for path in self._blobs.iterdir():
+            with contextlib.suppress(OSError):
+                st = path.stat()
+                blobs[path] = (st.st_size, st.st_mtime)
+        return blobs
+
+    def get(self, url: str) -> Optional[bytes]:
+        ref = self._refs / self._key(url)
+        try:
+            blob = self._blobs / ref.read_text(encoding="ascii").strip()
+            data = blob.read_bytes()
+        except OSError:
+            with contextlib.suppress(OSError):
+                ref.unlink()
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(blob)
+        return data
+
+    def put(self, url: str, data: bytes) -> str:
+        """Store `data` as `url`'s image; returns its digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        blob = self._blobs / digest
+        with self._lock:
+            if not blob.exists():
+                self._write(blob, data)
+                self._size += len(data)
+            self._write(self._refs / self._key(url), digest.encode("ascii"))
+            if self._size > self.max_bytes:
+                self._evict(keep=blob)
+        return digest
+
+    def clear(self) -> None:
+        with self._lock:
+            for directory in (self._blobs, self._refs):
+                for path in directory.iterdir():
+                    with contextlib.suppress(OSError):
+                        path.unlink()
+            self._size = 0
+
+    def _write(self, path: Path, data: bytes) -> None:
+        # Readers in other threads (or processes) never see a partial file
+        fd, tmp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=str(path.parent))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+            raise
+
+    def _evict(self, keep: Path) -> None:
+        # Rescan: another process sharing the directory may have added or evicted blobs
+        blobs = self._scan()
+        self._size = sum(size for size, _ in blobs.values())
+        for path in sorted(blobs, key=lambda p: blobs[p][1]):
+            if self._size <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            with contextlib.suppress(OSError):
+                path.unlink()
+                self._size -= blobs[path][0]
+
+
+class ThumbnailService(IThumbnailStore):
+    """Thumbnails from the disk cache, else fetched over HTTP and cached.
+
+    `fetch` is synchronous; `submit` runs it on a small shared pool so a
+    list of videos can have its thumbnails loaded in parallel. URLs that
+    failed are skipped for MISS_TTL seconds (YouTube's maxres image is
+    often missing, and each `fetch` would otherwise pay that 404 again).
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ThumbnailDiskCache] = None,
+        workers: int = 4,
+        timeout: float = 10.0,
+        proxy: Optional[str] = None,
+        metrics: Optional[IMetricsSink] = None,
+    ):
+        self.cache = cache
+        self.timeout = timeout
+        self.metrics = metrics or NullMetricsSink()
+        handlers = [urllib.request.ProxyHandler({"http": proxy, "https": proxy})] if proxy else []
+        self._opener = urllib.request.build_opener(*handlers)
+        self._opener.addheaders = [("User-Agent", "Mozilla/5.0")]
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="thumbnail")
+        self._misses: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, urls: Sequence[str]) -> Optional[tuple[str, bytes]]:
+        for url in urls:
+            data = self._load(url)
+            if data is not None:
+                return url, data
+        return None
+
+    def submit(self, urls: Sequence[str], transform: Optional[Callable[[str, bytes], Any]] = None) -> Future:
+        """`fetch(urls)` on the service's pool.
+
+        With `transform`, the future holds ``transform(url, data)`` instead,
+        so decoding happens on the same worker (None if nothing loaded).
+        """
+        urls = list(urls)
+        if transform is None:
+            return self._executor.submit(self.fetch, urls)
+
+        def fetch_and_transform() -> Any:
+            found = self.fetch(urls)
+            return transform(*found) if found is not None else None
+
+        return self._executor.submit(fetch_and_transform)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def _load(self, url: str) -> Optional[bytes]:
+        data = self.cache.get(url) if self.cache is not None else None
+        if data is not None:
+            self.metrics.increment("thumbnail_cache_hits")
+            return data
+        with self._lock:
+            missed = self._misses.get(url)
+        if missed is not None and time.monotonic() - missed < MISS_TTL:
+            return None
+        self.metrics.increment("thumbnail_cache_misses")
+        try:
+            with self.metrics.span("thumbnail_fetch"):
+                with self._opener.open(url, timeout=self.timeout) as response:
+                    data = response.read(MAX_THUMBNAIL_BYTES + 1)
+            if not data or len(data) > MAX_THUMBNAIL_BYTES:
+                raise ValueError(f"unexpected size: {len(data)} bytes")
+        except (OSError, ValueError) as e:
+            # urllib's URLError and HTTPError are OSErrors
+            logger.debug("Thumbnail %s unavailable: %s", url, e)
+            with self._lock:
+                self._misses[url] = time.monotonic()
+            return None
+        if self.cache is not None:
+            try:
+                self.cache.put(url, data)
+            except OSError as e:
+                logger.warning("Could not cache thumbnail %s: %s", url, e)
+        return data
@@ -0,0 +1,414 @@
+"""Local HTTP job service.
+
+One long-running process owns the session pool, info cache and compiled
+profiles; clients queue work over HTTP instead of each starting yt-dlp::
+
+    python -m ytdlp_core.server --port 8765 --workers 3 -o /data --token s3cret
+
+Endpoints (JSON unless noted):
+
+    GET    /health                 queue and worker status
+    GET    /jobs                   all jobs
+    POST   /jobs                   {"url" | "urls", "format_id", "media_type",
+                                    "audio_format", "profile", "select",
+                                    "priority"}
+    GET    /jobs/<id>              one job
+    DELETE /jobs/<id>              cancel (also POST /jobs/<id>/cancel)
+    POST   /jobs/<id>/priority     {"priority": int}; queued jobs only
+    GET    /info?url=...           cached VideoInfo as a versioned record
+    GET    /events[?job=<id>]      job events as Server-Sent Events
+    GET    /metrics                Prometheus text format
+
+With ``--token`` every request needs ``Authorization: Bearer <token>`` (or
+``?token=`` for EventSource clients, which cannot set headers).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hmac
+import json
+import logging
+import queue
+import signal
+import sys
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from ytdlp_core.application.job_queue import DownloadJob, JobQueue
+from ytdlp_core.application.profiles import DownloadProfileProvider
+from ytdlp_core.application.use_cases import DownloadVideoUseCase, GetVideoInfoUseCase
+from ytdlp_core.cli import ExitCode, build_config
+from ytdlp_core.core.format_index import FormatSelector
+from ytdlp_core.core.models import AUDIO_FORMATS, MediaType
+from ytdlp_core.domain.exceptions import (
+    ConfigurationError,
+    ExtractionError,
+    ValidationError,
+    YtdlpCoreError,
+)
+from ytdlp_core.domain.ports import IConfigStore
+
+logger = logging.getLogger(__name__)
+
+MAX_BODY = 1024 * 1024
+KEEPALIVE_SECONDS = 15.0
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class JobService:
+    """Shared engine state behind the HTTP API."""
+
+    def __init__(
+        self,
+        config: IConfigStore,
+        output_dir: Path,
+        workers: int = 2,
+        cache_size: int = 1000,
+    ):
+        # deferred: the infrastructure modules pull in yt-dlp
+        from ytdlp_core.infrastructure.downloader import YtDlpDownloader
+        from ytdlp_core.infrastructure.extractor import YtDlpVideoInfoExtractor
+        from ytdlp_core.infrastructure.metrics import MetricsRegistry, PrometheusExporter
+        from ytdlp_core.infrastructure.platform import DesktopPlatformService, FFmpegLocator, MemoryCacheStore
+        from ytdlp_core.infrastructure.proxy_pool import ProxyPool
+        from ytdlp_core.infrastructure.session_pool import YoutubeDLSessionPool
+
+        self.config = config
+        self.output_dir = output_dir
+        self.metrics = MetricsRegistry()
+        self.exporter = PrometheusExporter(self.metrics)
+        self.session_pool = YoutubeDLSessionPool(max_idle_per_key=max(1, workers))
+        self.proxy_pool = ProxyPool.from_config(
+            config.get("proxies"), config.get("proxy_strategy"), metrics=self.metrics
+        )
+        self.profiles = DownloadProfileProvider(config)
+        self.ffmpeg = FFmpegLocator()
+        platform = DesktopPlatformService()
+        self.extractor = YtDlpVideoInfoExtractor(
+            timeout=int(config.get("timeout", 30)),
+            proxy=config.get("proxy") or None,
+            session_pool=self.session_pool,
+            proxy_pool=self.proxy_pool,
+        )
+        self.info = GetVideoInfoUseCase(
+            extractor=self.extractor,
+            cache=MemoryCacheStore(max_entries=cache_size),
+            metrics=self.metrics,
+        )
+
+        def download_factory() -> DownloadVideoUseCase:
+            return DownloadVideoUseCase(
+                downloader=YtDlpDownloader(
+                    session_pool=self.session_pool, metrics=self.metrics, proxy_pool=self.proxy_pool
+                ),
+                ffmpeg_locator=self.ffmpeg,
+                config=config,
+                platform=platform,
+                profiles=self.profiles,
+                metrics=self.metrics,
+                cache=self.info.cache,
+            )
+
+        self.queue = JobQueue(
+            download_factory,
+            info=self.info,
+            workers=workers,
+            merge_audio=self.ffmpeg.find_ffmpeg() is not None,
+        )
+
+    def start(self) -> None:
+        self.queue.start()
+        if self.proxy_pool is not None:
+            self.proxy_pool.start()
+
+    def close(self) -> None:
+        self.queue.close()
+        if self.proxy_pool is not None:
+            self.proxy_pool.close()
+        self.session_pool.close()
+        self.profiles.close()
+
+    def make_job(self, url: Any, body: dict[str, Any]) -> DownloadJob:
+        """Validate one submission; raises ApiError(400) on bad input."""
+        if not isinstance(url, str) or not self.extractor.validate_url(url):
+            raise ApiError(HTTPStatus.BAD_REQUEST, f"Invalid YouTube URL: {url!r}")
+        try:
+            media_type = MediaType(body.get("media_type", MediaType.VIDEO.value))
+            priority = int(body.get("priority", 0))
+            audio_format = str(body.get("audio_format") or "mp3")
+            if audio_format not in AUDIO_FORMATS:
+                raise ValueError(f"Unsupported audio format: {audio_format}")
+            selector = body.get("select") or None
+            if selector:
+                FormatSelector.parse(selector)
+            profile = body.get("profile") or None
+            self.profiles.get(profile)
+        except (ValueError, TypeError, ConfigurationError) as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, str(e))
+        return DownloadJob(
+            url=url,
+            format_id=str(body.get("format_id") or "best"),
+            media_type=media_type,
+            audio_format=audio_format,
+            profile=profile,
+            selector=selector,
+            output_dir=self.output_dir,
+            priority=priority,
+        )
+
+
+class JobServiceServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: JobService, token: Optional[str] = None):
+        super().__init__(address, JobRequestHandler)
+        self.service = service
+        self.token = token
+        self.closing = threading.Event()
+
+    def shutdown(self) -> None:
+        self.closing.set()
+        super().shutdown()
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    server: JobServiceServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    # -- plumbing -----------------------------------------------------------
+
+    def _send_json(self, status: HTTPStatus, payload: Any) -> None:
+        body = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            raise ApiError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        if not length:
+            return {}
+        try:
+            body = json.loads(self.rfile.read(length))
+        except ValueError:
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+        if not isinstance(body, dict):
+            raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        return body
+
+    def _authorized(self, query: dict[str, list[str]]) -> bool:
+        token = self.server.token
+        if not token:
+            return True
+        header = self.headers.get("Authorization", "")
+        supplied = header[7:] if header.startswith("Bearer ") else (query.get("token") or [""])[0]
+        return hmac.compare_digest(supplied.encode(), token.encode())
+
+    def _dispatch(self, method: str) -> None:
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        segments = [s for s in parts.path.split("/") if s]
+        try:
+            if not self._authorized(query):
+                raise ApiError(HTTPStatus.UNAUTHORIZED, "Missing or invalid token")
+            self._route(method, segments, query)
+        except ApiError as e:
+            # The request body may be unread; don't reuse the connection
+            self.close_connection = True
+            self._send_json(e.status, {"error": str(e)})
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            logger.exception("Unhandled error for %s %s", method, self.path)
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"})
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    # -- routes -------------------------------------------------------------
+
+    def _route(self, method: str, segments: list[str], query: dict[str, list[str]]) -> None:
+        service = self.server.service
+        route = (method, *segments[:1], *(["*"] if len(segments) > 1 else []), *segments[2:])
+
+        if route == ("GET", "health"):
+            counts: dict[str, int] = {}
+            for job in service.queue.jobs():
+                counts[job.status.value] = counts.get(job.status.value, 0) + 1
+            self._send_json(HTTPStatus.OK, {"status": "ok", "workers": service.queue.workers, "jobs": counts})
+        elif route == ("GET", "jobs"):
+            self._send_json(HTTPStatus.OK, {"jobs": [job.to_dict() for job in service.queue.jobs()]})
+        elif route == ("POST", "jobs"):
+            body = self._read_json()
+            urls = body.get("urls") if "urls" in body else [body.get("url")]
+            if not isinstance(urls, list) or not urls:
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Give 'url' or a non-empty 'urls' list")
+            jobs = [service.make_job(url, body) for url in urls]
+            try:
+                submitted = [service.queue.submit(job).to_dict() for job in jobs]
+            except ValidationError as e:
+                raise ApiError(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+            self._send_json(HTTPStatus.CREATED, submitted[0] if "urls" not in body else {"jobs": submitted})
+        elif route == ("GET", "jobs", "*"):
+            self._send_json(HTTPStatus.OK, self._job(segments[1]).to_dict())
+        elif route in (("DELETE", "jobs", "*"), ("POST", "jobs", "*", "cancel")):
+            job = self._job(segments[1])
+            if not service.queue.cancel(job.id):
+                raise ApiError(HTTPStatus.CONFLICT, f"Job {job.id} already {job.status.value}")
+            self._send_json(HTTPStatus.ACCEPTED, job.to_dict())
+        elif route == ("POST", "jobs", "*", "priority"):
+            job = self._job(segments[1])
+            try:
+                priority = int(self._read_json()["priority"])
+            except (KeyError, TypeError, ValueError):
+                raise ApiError(HTTPStatus.BAD_REQUEST, "Body must be {\"priority\": int}")
+            if not service.queue.prioritize(job.id, priority):
+                raise ApiError(HTTPStatus.CONFLICT, f"Job {job.id} is {job.status.value}, not queued")
+            self._send_json(HTTPStatus.OK, job.to_dict())
+        elif route == ("GET", "info"):
+            self._info(query)
+        elif route == ("GET", "events"):
+            self._events((query.get("job") or [None])[0])
+        elif route == ("GET", "metrics"):
+            body = service.exporter.render().encode("utf-8")
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"No route for {method} {self.path}")
+
+    def _job(self, job_id: str) -> DownloadJob:
+        job = self.server.service.queue.get(job_id)
+        if job is None:
+            raise ApiError(HTTPStatus.NOT_FOUND, f"Unknown job {job_id}")
+        return job
+
+    def _info(self, query: dict[str, list[str]]) -> None:
+        from ytdlp_core.core.codec import to_record
+
+        url = (query.get("url") or [""])[0]
+        refresh = (query.get("refresh") or ["0"])[0] in ("1", "true")
+        try:
+            info = self.server.service.info.execute(url, use_cache=not refresh)
+        except ValidationError as e:
+            raise ApiError(HTTPStatus.BAD_REQUEST, str(e))
+        except ExtractionError as e:
+            raise ApiError(HTTPStatus.BAD_GATEWAY, str(e))
+        except YtdlpCoreError as e:
+            raise ApiError(HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+        self._send_json(HTTPStatus.OK, to_record(info))
+
+    def _events(self, job_id: Optional[str]) -> None:
+        if job_id is not None:
+            self._job(job_id)
+        events: queue.Queue = queue.Queue(maxsize=1000)
+
+        def listener(event: str, data: dict[str, Any]) -> None:
+            if job_id is not None and data["id"] != job_id:
+                return
+            try:
+                events.put_nowait((event, data))
+            except queue.Full:
+                pass  # slow client: drop rather than stall the workers
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        unsubscribe = self.server.service.queue.subscribe(listener)
+        try:
+            self.wfile.write(b"retry: 3000\n\n")
+            self.wfile.flush()
+            while not self.server.closing.is_set():
+                try:
+                    event, data = events.get(timeout=KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    payload = json.dumps(data, default=str)
+                    self.wfile.write(f"event: {event}\nid: {data['id']}\ndata: {payload}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            unsubscribe()
+
+
+def _raise_interrupt(_signum: int, _frame: Any) -> None:
+    raise KeyboardInterrupt
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ytdlp_core.server", description="Local download job service.")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("-w", "--workers", type=int, default=2, help="parallel downloads (default: 2)")
+    parser.add_argument("-o", "--output-dir", type=Path, default=Path.cwd(), help="download directory (default: cwd)")
+    parser.add_argument("-c", "--config", type=Path, help="JSON config with settings and profiles")
+    parser.add_argument("-r", "--rate-limit", help="per-download rate limit, e.g. 2M")
+    parser.add_argument("--cache-size", type=int, default=1000, help="VideoInfo entries kept in memory")
+    parser.add_argument("--token", help="require this bearer token on every request")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        stream=sys.stderr,
+    )
+    if args.host not in ("127.0.0.1", "localhost", "::1") and not args.token:
+        logger.warning("Listening on %s without --token: anyone who can reach it can queue downloads", args.host)
+
+    try:
+        config = build_config(args.config, args.rate_limit)
+        service = JobService(config, args.output_dir, workers=args.workers, cache_size=args.cache_size)
+    except ConfigurationError as e:
+        logger.error("%s", e)
+        return ExitCode.CONFIG
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    server = JobServiceServer((args.host, args.port), service, token=args.token)
+    service.start()
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    host, port = server.server_address[:2]
+    logger.info("Serving on http://%s:%s (%d workers, downloads to %s)", host, port, args.workers, args.output_dir)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down")
+    finally:
+        server.closing.set()
+        server.server_close()
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())